@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import argparse
+
+from benchmarks import *
+
+def bench_nint():
+    bench_nint_literals()
+    bench_nint_construction()
+    bench_nint_operators()
+    bench_nint_bytes()
+    bench_nint_workloads()
+
+def bench_nfloat():
+    bench_nfloat_decode()
+    bench_nfloat_construction()
+    bench_nfloat_operators()
+    bench_nfloat_bytes()
+    bench_reinterpret_cast()
+    bench_nfloat_workloads()
+
+def bench(pattern=None):
+    if pattern is None:
+        bench_nint()
+        bench_nfloat()
+        return
+    for name, func in sorted(globals().items()):
+        if name.startswith('bench_') and name not in ('bench_nint', 'bench_nfloat') \
+                and pattern in name:
+            func()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark nativetypes.')
+    parser.add_argument('-k', dest='pattern',
+        help='only run benchmarks whose name contains PATTERN, e.g. operators')
+    parser.add_argument('-r', '--repeat', type=int, default=settings['repeat'],
+        help='timing repetitions, the best one is reported')
+    parser.add_argument('-n', '--number', type=int,
+        help='calls per repetition, chosen automatically by default')
+    parser.add_argument('--json', metavar='PATH',
+        help='save results as JSON')
+    parser.add_argument('--compare', metavar='PATH',
+        help='compare results against a JSON file saved by a previous run')
+    args = parser.parse_args()
+    settings['repeat'] = args.repeat
+    settings['number'] = args.number
+    bench(args.pattern)
+    if args.json:
+        save_results(args.json)
+    if args.compare:
+        compare_results(args.compare)
+
+if __name__ == '__main__':
+    main()
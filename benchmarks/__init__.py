@@ -0,0 +1,9 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+# Imports
+from .bench_nint import *
+from .bench_nfloat import *
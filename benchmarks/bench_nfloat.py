@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import math
+import struct
+
+from nativetypes import *
+from .common import *
+
+# Reference per-bit decoder, as used before constant-time decoding
+def float_decode_reference(value, exponent, mantissa):
+    sign = (-1) ** (value >> (exponent + mantissa))
+    ve = (value >> mantissa) & ((1 << exponent) - 1)
+    vm = value & ((1 << mantissa) - 1)
+    if ve == (1 << exponent) - 1:
+        if vm == 0:
+            return float('inf') * sign
+        return float('nan')
+    denormalized = (ve == 0)
+    exp = -(2 ** (exponent - 1)) + 2
+    if not denormalized:
+        exp += ve - 1
+    fraction = 0.0 if denormalized else 1.0
+    for i in range(1, mantissa + 1):
+        fraction += ((vm >> (mantissa - i)) & 1) * (2 ** (-i))
+    return sign * (fraction * (2 ** exp))
+
+def bench_nfloat_decode():
+    report_header('nfloat decode')
+    formats = (
+        ('float8 (e4m3)', 4, 3),
+        ('float16', 5, 10),
+        ('bfloat16', 8, 7),
+        ('float32', 8, 23),
+        ('float64', 11, 52),
+    )
+    for name, exponent, mantissa in formats:
+        value = nfloat(math.pi, exponent, mantissa).get_bits()
+        assert float_decode(value, exponent, mantissa) == \
+            float_decode_reference(value, exponent, mantissa)
+        before = measure(lambda: float_decode_reference(value, exponent, mantissa))
+        after = measure(lambda: float_decode(value, exponent, mantissa))
+        report(name, before, after)
+
+# Suite
+# Baselines round through struct where it supports the format.
+NFLOAT_TYPES = (float16, float32, float64, nfloat_class(8, 7), nfloat_class(4, 3))
+
+def struct_format(cls):
+    return {(5, 10): '<e', (8, 23): '<f', (11, 52): '<d'}.get((cls.e, cls.m))
+
+def struct_round(cls):
+    fmt = struct_format(cls)
+    if fmt is None:
+        return None
+    packer = struct.Struct(fmt)
+    return lambda value: packer.unpack(packer.pack(value))[0]
+
+def bench_nfloat_construction():
+    report_ops_header('nfloat construction')
+    for cls in NFLOAT_TYPES:
+        rounding = struct_round(cls)
+        value = cls(math.pi)
+        bits = value.get_bits()
+        report_ops('%s(float)' % cls.__name__, lambda: cls(math.pi), None,
+            rounding and (lambda: rounding(math.pi)))
+        report_ops('%s float(x)' % cls.__name__, lambda: float(value))
+        report_ops('%s decode' % cls.__name__,
+            lambda: float_decode(bits, cls.e, cls.m))
+
+def bench_nfloat_operators():
+    report_ops_header('nfloat operators')
+    binary = (
+        ('+', lambda a, b: a + b),
+        ('-', lambda a, b: a - b),
+        ('*', lambda a, b: a * b),
+        ('/', lambda a, b: a / b),
+    )
+    for cls in (float16, float32, float64):
+        rounding = struct_round(cls)
+        a = cls(math.pi)
+        b = cls(-0.1)
+        x = float(a)
+        y = float(b)
+        for name, op in binary:
+            report_ops('%s %s' % (cls.__name__, name), lambda: op(a, b), None,
+                lambda: rounding(op(x, y)))
+        report_ops('%s -x' % cls.__name__, lambda: -a, None, lambda: rounding(-x))
+        report_ops('%s x * 0.5' % cls.__name__, lambda: a * 0.5, None,
+            lambda: rounding(x * 0.5))
+        report_ops('%s x < y' % cls.__name__, lambda: a < b, None, lambda: x < y)
+        def inplace(a=a, b=b):
+            a += b
+            a *= 0.5
+        def inplace_baseline(x=x, y=y):
+            x = rounding(x + y)
+            x = rounding(x * 0.5)
+        report_ops('%s +=, *=' % cls.__name__, inplace, None, inplace_baseline)
+
+def bench_nfloat_bytes():
+    report_ops_header('nfloat bytes conversion')
+    for cls in (float16, float32, float64):
+        fmt = struct_format(cls)
+        a = cls(math.pi)
+        data = a.to_bytes('little')
+        report_ops('%s to_bytes' % cls.__name__, lambda: a.to_bytes('little'),
+            None, lambda: struct.pack(fmt, math.pi))
+        report_ops('%s from_bytes' % cls.__name__,
+            lambda: nfloat.from_bytes(data, 'little', cls.e, cls.m),
+            None, lambda: struct.unpack(fmt, data)[0])
+
+def bench_reinterpret_cast():
+    report_ops_header('reinterpret_cast')
+    packer_f = struct.Struct('<f')
+    packer_i = struct.Struct('<i')
+    f = float32(math.pi)
+    i = reinterpret_cast(int32, f)
+    u = uint32(i)
+    report_ops('float32 -> int32', lambda: reinterpret_cast(int32, f), None,
+        lambda: packer_i.unpack(packer_f.pack(math.pi))[0])
+    report_ops('int32 -> float32', lambda: reinterpret_cast(float32, i), None,
+        lambda: packer_f.unpack(packer_i.pack(1078530011))[0])
+    report_ops('int32 -> uint32', lambda: reinterpret_cast(uint32, i), None,
+        lambda: 1078530011 & 0xFFFFFFFF)
+    report_ops('uint32 -> int32', lambda: reinterpret_cast(int32, u))
+    values = nfloat_array([math.pi] * 1024, 8, 23)
+    report_ops('float32[1024] -> uint32', lambda: reinterpret_cast(uint32, values))
+
+def rsqrt(number):
+    # README example
+    i = reinterpret_cast(int32, number)
+    i = 0x5F3759DF - (i >> 1)
+    y = reinterpret_cast(float32, i)
+    y *= (1.5 - (0.5 * number * y * y))
+    return y
+
+@native_jit
+def rsqrt_compiled(number: float32):
+    i = reinterpret_cast(int32, number)
+    i = 0x5F3759DF - (i >> 1)
+    y = reinterpret_cast(float32, i)
+    y *= (1.5 - (0.5 * number * y * y))
+    return y
+
+def rsqrt_baseline(number, packer_f=struct.Struct('<f'), packer_i=struct.Struct('<i')):
+    # Same algorithm, rounding every operation through struct
+    f32 = lambda value: packer_f.unpack(packer_f.pack(value))[0]
+    i = packer_i.unpack(packer_f.pack(number))[0]
+    i = ((0x5F3759DF - (i >> 1)) + 0x80000000 & 0xFFFFFFFF) - 0x80000000
+    y = packer_f.unpack(packer_i.pack(i))[0]
+    return f32(y * f32(1.5 - f32(f32(f32(0.5 * number) * y) * y)))
+
+def bench_nfloat_workloads():
+    report_ops_header('nfloat workloads')
+    number = float32(2.0)
+    assert rsqrt(number) == rsqrt_compiled(number) == rsqrt_baseline(2.0)
+    report_ops('rsqrt', lambda: rsqrt(number), None, lambda: rsqrt_baseline(2.0))
+    report_ops('rsqrt (jit)', lambda: rsqrt_compiled(number), None,
+        lambda: rsqrt_baseline(2.0))
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import string
+import struct
+
+from nativetypes import *
+from nativetypes import native_int
+from nativetypes import native_lazy
+from .common import *
+
+# Reference operators, converting Python integers into temporary nint objects
+def op_binary_reference(lhs, rhs, op):
+    lhs, rhs = native_int.ensure_native(lhs, rhs)
+    cls = native_int.nint_class(promote_bits(lhs, rhs), promote_signed(lhs, rhs))
+    return cls(op(wrap_value(lhs.v, cls), wrap_value(rhs.v, cls)))
+
+def op_relational_reference(lhs, rhs, op):
+    lhs, rhs = native_int.ensure_native(lhs, rhs)
+    cls = native_int.nint_class(promote_bits(lhs, rhs), promote_signed(lhs, rhs))
+    return op(wrap_value(lhs.v, cls), wrap_value(rhs.v, cls))
+
+def bench_nint_literals():
+    i = int32(0x3F800000)
+    t1 = uint32(0x12345678)
+    s = uint32(0xDEADBEEF)
+    expressions = (
+        ('0x5F3759DF - (i >> 1)', lambda: 0x5F3759DF - (i >> 1)),
+        ('t1 * 16', lambda: t1 * 16),
+        ('t1 & 0x1FFF', lambda: t1 & 0x1FFF),
+        ('t1 < 0x80000000', lambda: t1 < 0x80000000),
+        ('ranbyus t1 update', lambda: (t1 >> 15) ^ (16 * (t1 & 0x1FFF ^ 4 * (t1 ^ s)))),
+    )
+    report_header('nint literal operands (allocations per expression)', ('before', 'after', ''))
+    for name, func in expressions:
+        with patched(native_int, op_binary=op_binary_reference,
+                op_relational=op_relational_reference):
+            before = count_allocations(native_int, func)
+        after = count_allocations(native_int, func)
+        print('%-24s %13.1f %13.1f' % (name, before, after))
+    report_header('nint literal operands (time per expression)')
+    for name, func in expressions:
+        with patched(native_int, op_binary=op_binary_reference,
+                op_relational=op_relational_reference):
+            before = measure(func)
+        after = measure(func)
+        report(name, before, after)
+
+# Suite
+# Baselines compute the same result on plain Python integers with explicit
+# masking, or with ctypes where it provides the type.
+NINT_TYPES = (uint8, int16, uint32, int64, nint_class(24, True), nint_class(128, False))
+
+def ctypes_type(cls):
+    if ctypes is None or cls.b not in (8, 16, 32, 64):
+        return None
+    return getattr(ctypes, 'c_%sint%d' % ('' if cls.s else 'u', cls.b))
+
+def masked(cls):
+    # Wraps a Python integer to `cls`, as hand-written code would
+    mask = cls.m
+    if not cls.s:
+        return lambda value: value & mask
+    sign = cls.h
+    return lambda value: ((value & mask) ^ sign) - sign
+
+def bench_nint_construction():
+    report_ops_header('nint construction')
+    for cls in NINT_TYPES:
+        wrap = masked(cls)
+        ctype = ctypes_type(cls)
+        report_ops('%s(int)' % cls.__name__, lambda: cls(0x1234567),
+            count_allocations(native_int, lambda: cls(0x1234567)),
+            lambda: wrap(0x1234567))
+        if ctype is not None:
+            report_ops('%s ctypes' % cls.__name__, lambda: ctype(0x1234567).value)
+
+def bench_nint_operators():
+    report_ops_header('nint operators')
+    binary = (
+        ('+', lambda a, b: a + b),
+        ('-', lambda a, b: a - b),
+        ('*', lambda a, b: a * b),
+        ('//', lambda a, b: a // b),
+        ('%', lambda a, b: a % b),
+        ('&', lambda a, b: a & b),
+        ('|', lambda a, b: a | b),
+        ('^', lambda a, b: a ^ b),
+        ('<<', lambda a, b: a << 3),
+        ('>>', lambda a, b: a >> 3),
+    )
+    for cls in (uint32, int64):
+        a = cls(-1234567)
+        b = cls(1000)
+        x = int(a)
+        y = int(b)
+        wrap = masked(cls)
+        for name, op in binary:
+            report_ops('%s %s' % (cls.__name__, name), lambda: op(a, b),
+                count_allocations(native_int, lambda: op(a, b)),
+                lambda: wrap(op(x, y)))
+        for name, op in (('-x', lambda a: -a), ('~x', lambda a: ~a), ('abs', abs)):
+            report_ops('%s %s' % (cls.__name__, name), lambda: op(a),
+                count_allocations(native_int, lambda: op(a)),
+                lambda: wrap(op(x)))
+        report_ops('%s 7 + x' % cls.__name__, lambda: 7 + a,
+            count_allocations(native_int, lambda: 7 + a), lambda: wrap(7 + x))
+        report_ops('%s x + 7' % cls.__name__, lambda: a + 7,
+            count_allocations(native_int, lambda: a + 7), lambda: wrap(x + 7))
+        report_ops('%s x < y' % cls.__name__, lambda: a < b,
+            count_allocations(native_int, lambda: a < b), lambda: x < y)
+        report_ops('%s x == 7' % cls.__name__, lambda: a == 7,
+            count_allocations(native_int, lambda: a == 7), lambda: x == 7)
+        def inplace(a=a, b=b):
+            a += b
+            a ^= 0x55
+            a <<= 1
+        def inplace_baseline(x=x, y=y):
+            x = wrap(x + y)
+            x = wrap(x ^ 0x55)
+            x = wrap(x << 1)
+        report_ops('%s +=, ^=, <<=' % cls.__name__, inplace,
+            count_allocations(native_int, inplace), inplace_baseline)
+    # Operand widths and mixed types
+    for cls in NINT_TYPES:
+        a = cls(-1234567)
+        b = cls(1000)
+        x = int(a)
+        y = int(b)
+        wrap = masked(cls)
+        report_ops('%s a * b' % cls.__name__, lambda: a * b,
+            count_allocations(native_int, lambda: a * b), lambda: wrap(x * y))
+    a = uint8(200)
+    b = int32(-5)
+    report_ops('uint8 + int32', lambda: a + b,
+        count_allocations(native_int, lambda: a + b))
+
+def bench_nint_bytes():
+    report_ops_header('nint bytes conversion')
+    for cls in (uint16, int32, uint64):
+        size = cls.b // 8
+        code = {2: '<H', 4: '<i', 8: '<Q'}[size]
+        a = cls(-1234567)
+        data = a.to_bytes('little')
+        report_ops('%s to_bytes' % cls.__name__, lambda: a.to_bytes('little'),
+            None, lambda: struct.pack(code, int(a)))
+        report_ops('%s from_bytes' % cls.__name__,
+            lambda: nint.from_bytes(data, 'little', cls.b, cls.s),
+            count_allocations(native_int, lambda: nint.from_bytes(data, 'little', cls.b, cls.s)),
+            lambda: struct.unpack(code, data)[0])
+        report_ops('%s from_buffer x256' % cls.__name__,
+            lambda: cls.from_buffer(data * 256, 'little'),
+            None, lambda: struct.unpack('<256' + code[1], data * 256))
+
+def ranbyus_dga(s, t1, t2, t3):
+    # README example, seeded with native or lazy integers
+    name = ''
+    for i in range(12):
+        t1 = (t1 >> 15) ^ (16 * (t1 & 0x1FFF ^ 4 * (t1 ^ s)))
+        t2 = ((t2 ^ (4 * t2)) >> 8) ^ ((t2 & 0xFFFFFFFE) * 14)
+        t3 = ((t3 ^ (7 * t3)) >> 11) | ((t3 & 0xFFFFFFF0) << 17)
+        s = (s >> 6) ^ (((t1 + 8 * s) << 8) & 0x3FFFF00)
+        name += string.ascii_lowercase[int(t1 ^ t2 ^ t3) % 25]
+    return name
+
+@native_jit
+def ranbyus_dga_compiled(s: uint32, t1: uint32, t2: uint32, t3: uint32):
+    name = ''
+    for i in range(12):
+        t1 = (t1 >> 15) ^ (16 * (t1 & 0x1FFF ^ 4 * (t1 ^ s)))
+        t2 = ((t2 ^ (4 * t2)) >> 8) ^ ((t2 & 0xFFFFFFFE) * 14)
+        t3 = ((t3 ^ (7 * t3)) >> 11) | ((t3 & 0xFFFFFFF0) << 17)
+        s = (s >> 6) ^ (((t1 + 8 * s) << 8) & 0x3FFFF00)
+        name += string.ascii_lowercase[int(t1 ^ t2 ^ t3) % 25]
+    return name
+
+def ranbyus_dga_baseline(s, t1, t2, t3):
+    # Same algorithm, masking every operation by hand
+    m = 0xFFFFFFFF
+    name = ''
+    for i in range(12):
+        t1 = ((t1 >> 15) ^ (16 * (t1 & 0x1FFF ^ 4 * (t1 ^ s)))) & m
+        t2 = (((t2 ^ (4 * t2)) & m) >> 8) ^ (((t2 & 0xFFFFFFFE) * 14) & m)
+        t3 = (((t3 ^ (7 * t3)) & m) >> 11) | (((t3 & 0xFFFFFFF0) << 17) & m)
+        s = (s >> 6) ^ ((((t1 + 8 * s) & m) << 8) & 0x3FFFF00)
+        name += string.ascii_lowercase[(t1 ^ t2 ^ t3) % 25]
+    return name
+
+def bench_nint_workloads():
+    report_ops_header('nint workloads')
+    args = (0x1E1F5A7C, 18, 10, 2026)
+    native = tuple(uint32(arg) for arg in args)
+    lazy = tuple(arg.lazy() for arg in native)
+    compiled = ranbyus_dga_compiled
+    assert ranbyus_dga(*native) == ranbyus_dga_baseline(*args)
+    assert ranbyus_dga(*lazy) == ranbyus_dga(*native) == compiled(*native)
+    baseline = lambda: ranbyus_dga_baseline(*args)
+    report_ops('ranbyus dga', lambda: ranbyus_dga(*native),
+        count_allocations(native_int, lambda: ranbyus_dga(*native)), baseline)
+    report_ops('ranbyus dga (lazy)', lambda: ranbyus_dga(*lazy),
+        count_allocations(native_lazy, lambda: ranbyus_dga(*lazy)), baseline)
+    report_ops('ranbyus dga (jit)', lambda: compiled(*native),
+        count_allocations(native_int, lambda: compiled(*native)), baseline)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import json
+import platform
+import sys
+import timeit
+
+try:
+    import ctypes
+except ImportError:
+    ctypes = None
+
+# Settings shared by all benchmarks, changed from the command line
+settings = {
+    'repeat': 5,
+    'number': None,
+    'group': '',
+}
+
+# Results
+# Every reported measurement is recorded, so that runs can be saved as JSON
+# and compared between versions.
+results = []
+
+def record(name, ns, allocations=None, baseline=None):
+    results.append({
+        'group': settings['group'],
+        'name': name,
+        'ns': ns,
+        'ops': 1e9 / ns,
+        'allocations': allocations,
+        'baseline': baseline,
+    })
+
+def save_results(path):
+    data = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+def compare_results(path):
+    # Prints the speedup of every measurement also present in `path`
+    with open(path) as f:
+        previous = json.load(f)['results']
+    previous = dict(((r['group'], r['name']), r['ns']) for r in previous)
+    print('comparison with %s' % path)
+    print('%-40s %13s %13s %9s' % ('', 'previous', 'current', 'speedup'))
+    for result in results:
+        key = (result['group'], result['name'])
+        if key not in previous:
+            continue
+        name = '%s: %s' % key
+        print('%-40s %10.1f ns %10.1f ns %8.2fx' % (name[:40],
+            previous[key], result['ns'], previous[key] / result['ns']))
+
+# Measurements
+def measure(func, repeat=None, number=None):
+    # Best time per call in nanoseconds
+    timer = timeit.Timer(func)
+    if repeat is None:
+        repeat = settings['repeat']
+    if number is None:
+        number = settings['number'] or timer.autorange()[0]
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+def report(name, before, after):
+    record(name, after)
+    print('%-24s %10.1f ns %10.1f ns %8.1fx' % (name, before, after, before / after))
+
+def report_header(title, columns=('before', 'after', 'speedup')):
+    settings['group'] = title
+    print(title)
+    print('%-24s %13s %13s %9s' % (('',) + tuple(columns)))
+
+def report_ops(name, func, allocations=None, baseline=None):
+    # Throughput of `func`, its allocations, and the time of `baseline`
+    # relative to it, e.g. the same operation on plain Python integers
+    ns = measure(func)
+    baseline_ns = None if baseline is None else measure(baseline)
+    record(name, ns, allocations, baseline_ns)
+    print('%-24s %13.0f %13s %9s' % (name, 1e9 / ns,
+        '-' if allocations is None else '%.1f' % allocations,
+        '-' if baseline_ns is None else '%.2fx' % (ns / baseline_ns)))
+
+def report_ops_header(title):
+    report_header(title, ('ops/sec', 'allocations', 'baseline'))
+
+class patched(object):
+    # Temporarily replace module attributes
+    def __init__(self, module, **attrs):
+        self.module = module
+        self.attrs = attrs
+        self.saved = {}
+
+    def __enter__(self):
+        for name, value in self.attrs.items():
+            self.saved[name] = getattr(self.module, name)
+            setattr(self.module, name, value)
+        return self
+
+    def __exit__(self, *args):
+        for name, value in self.saved.items():
+            setattr(self.module, name, value)
+
+def count_allocations(module, func, number=1000):
+    # Objects created per call through the allocation hook of `module`
+    allocate = module.allocate
+    count = [0]
+    def counter(cls):
+        count[0] += 1
+        return allocate(cls)
+    with patched(module, allocate=counter):
+        for i in range(number):
+            func()
+    return count[0] / float(number)
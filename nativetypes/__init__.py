@@ -5,15 +5,129 @@ Native types.
 """
 
 # Imports
+import array
+
 from .native_int import *
+from .native_lazy import *
 from .native_float import *
+from .native_array import *
+from .native_vector import *
+from .native_frozen import *
+from .native_struct import *
+from .native_register import *
+from .native_memory import *
+from .native_compiler import *
+from .native_profile import *
 
 # Prevent polluting namespace
 del native_int
+del native_lazy
 del native_float
+del native_array
+del native_vector
+del native_frozen
+del native_struct
+del native_register
+del native_memory
+del native_compiler
+del native_profile
+
+# Casts
+# Bit patterns are moved directly between representations. The conversion
+# for each pair of types is checked and chosen once, then cached.
+_reinterpret_casts = {}
+
+def reinterpret_bits(cls):
+    # Returns the width of `cls` in bits, and whether its storage is signed
+    if issubclass(cls, nint):
+        return cls.b, cls.s
+    if issubclass(cls, nvector):
+        return cls.b, False
+    return 1 + cls.e + cls.m, False
+
+def reinterpret_value(dst, src):
+    dst_bits, _ = reinterpret_bits(dst)
+    src_bits, src_signed = reinterpret_bits(src)
+    mask = (1 << src_bits) - 1
+    def cast(value):
+        result = allocate(dst)
+        bits = value.v & mask if src_signed else value.v
+        if issubclass(dst, nint):
+            result.v = wrap_value(bits, dst)
+        else:
+            result.v = bits & ((1 << dst_bits) - 1)
+        return result
+    return cast
+
+def reinterpret_array(dst, src):
+    dst_bits, dst_signed = reinterpret_bits(dst)
+    def cast(values):
+        if isinstance(values, nfloat_array):
+            src_bits = 1 + values.e + values.m
+            data = values.a
+        else:
+            src_bits = values.b
+            data = values.astype(values.b, False).a
+        width = array_width(src_bits)
+        count = len(data)
+        lanes = swar_load(data)
+        if array_width(dst_bits) == width:
+            result = nint_array.from_lanes(lanes, count, dst_bits, dst_signed)
+        else:
+            data = array.array(array_typecode(width, False), swar_store(lanes, width, count))
+            result = nint_array.from_values(data, dst_bits, dst_signed)
+        if issubclass(dst, nint):
+            return result
+        floats = nfloat_array(exponent=dst.e, mantissa=dst.m)
+        floats.a = result.a
+        return floats
+    return cast
 
 def reinterpret_cast(dst, src):
-    assert (isinstance(dst(), nint) or isinstance(dst(), nfloat)) and \
-           (isinstance(src, nint) or isinstance(src, nfloat))
-    byteorder = 'big'
-    return dst.from_bytes(src.to_bytes(byteorder), byteorder)
+    try:
+        cast = _reinterpret_casts[dst, src.__class__]
+    except KeyError:
+        assert isinstance(dst, type) and issubclass(dst, (nint, nfloat, nvector)) and \
+            dst not in (nint, nfloat, nvector), 'Destination must be a native type alias'
+        if isinstance(src, (nint_array, nfloat_array)):
+            assert not issubclass(dst, nvector), 'Arrays cannot be cast to vectors'
+            cast = reinterpret_array(dst, src.__class__)
+        else:
+            assert isinstance(src, (nint, nfloat, nvector))
+            cast = reinterpret_value(dst, src.__class__)
+        _reinterpret_casts[dst, src.__class__] = cast
+    return cast(src)
+
+# Aliases
+# Shorthands such as `uint24`, `int128`, `bfloat16`, `float8_e4m3` or
+# `uint8x16` are created on first access and cached in the module.
+def __getattr__(name):
+    cls = nint_alias(name) or nfloat_alias(name) or nvector_alias(name)
+    if cls is None:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    globals()[name] = cls
+    return cls
+
+__all__ = [
+    'nint', 'nint_type', 'nint_class',
+    'nint_lazy', 'nint_lazy_class',
+    'nint_frozen', 'nint_frozen_class',
+    'nfloat', 'nfloat_type', 'nfloat_class',
+    'nfloat_frozen', 'nfloat_frozen_class',
+    'nint_array', 'nfloat_array',
+    'nvector', 'nvector_type', 'nvector_class',
+    'nstruct', 'nstruct_type',
+    'nmemory',
+    'bitfield', 'register_file', 'register_file_type',
+    'native_jit',
+    'nprofile',
+    'reinterpret_cast',
+    'FLAG_CF', 'FLAG_ZF', 'FLAG_SF', 'FLAG_OF',
+    # Helpers exported since the first releases
+    'get_value', 'wrap_value', 'ensure_native', 'promote_bits', 'promote_signed',
+    'promote_exponent', 'promote_mantissa', 'float_encode', 'float_decode',
+    'op_unary', 'op_binary', 'op_relational', 'op_div', 'op_mod',
+] + NINT_SHORTHANDS + NFLOAT_SHORTHANDS
+
+# Profiling
+profile_environment()
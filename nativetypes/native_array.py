@@ -0,0 +1,856 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import array
+import bisect
+import math
+import operator
+import struct
+import sys
+
+from .native_int import *
+from .native_float import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Storage
+ARRAY_TYPECODES = {}
+for _codes in (('b', 'B'), ('h', 'H'), ('i', 'I'), ('l', 'L'), ('q', 'Q')):
+    ARRAY_TYPECODES.setdefault(array.array(_codes[0]).itemsize, _codes)
+del _codes
+
+def array_width(bits):
+    for size in (1, 2, 4, 8):
+        if bits <= size * 8:
+            return size * 8
+    raise AssertionError('Support up to 64-bit elements only')
+
+def array_typecode(width, signed):
+    return ARRAY_TYPECODES[width // 8][0 if signed else 1]
+
+def array_view(data):
+    # Flat byte view over any contiguous buffer (bytes, bytearray, mmap, ...)
+    return memoryview(data).cast('B')
+
+def array_resize(data):
+    # Storage viewing a buffer is a memoryview, which has a fixed length
+    if isinstance(data, memoryview):
+        raise TypeError('Arrays viewing a buffer cannot be resized')
+
+STRUCT_CODES = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+STRUCT_BYTEORDERS = {'little': '<', 'big': '>'}
+
+# SWAR helpers
+# Lanes of `width` bits are packed into a single Python integer, so that one
+# big-integer operation processes every element of an array at once.
+def swar_repeat(lane, width, count):
+    data = (lane & ((1 << width) - 1)).to_bytes(width // 8, sys.byteorder)
+    return int.from_bytes(data * count, sys.byteorder)
+
+def swar_load(data):
+    return int.from_bytes(data, sys.byteorder)
+
+def swar_store(value, width, count):
+    return value.to_bytes(width // 8 * count, sys.byteorder)
+
+def swar_add(lhs, rhs, high):
+    low = ~high
+    return ((lhs & low) + (rhs & low)) ^ ((lhs ^ rhs) & high)
+
+def swar_sub(lhs, rhs, high):
+    low = ~high
+    return ((lhs | high) - (rhs & low)) ^ ((lhs ^ rhs ^ high) & high)
+
+def swar_shl(value, shift, width, count, full):
+    mask = swar_repeat(((1 << width) - 1) << shift, width, count)
+    return (value << shift) & mask & full
+
+def swar_shr(value, shift, width, count):
+    mask = swar_repeat(((1 << width) - 1) >> shift, width, count)
+    return (value >> shift) & mask
+
+def swar_extend(value, bits, width, count):
+    # Sign-extend the low `bits` of every lane to the whole lane
+    if bits == width:
+        return value
+    sign = swar_repeat(1 << (bits - 1), width, count)
+    upper = ((1 << width) - 1) ^ ((1 << bits) - 1)
+    return value | (((value & sign) >> (bits - 1)) * upper)
+
+def array_wrap(value, count, bits, signed):
+    # Wrap all elements at once, given lanes of the container width
+    width = array_width(bits)
+    if bits < width:
+        value &= swar_repeat((1 << bits) - 1, width, count)
+        if signed:
+            value = swar_extend(value, bits, width, count)
+    return swar_store(value, width, count)
+
+# NumPy backend
+# Used only if NumPy is installed. Elements move through the buffer protocol
+# in their container width, and operators without a SWAR form run as NumPy
+# operations whose results are identical to those of Python integers.
+def numpy_dtype(width, signed):
+    return numpy.dtype('%s%d' % ('i' if signed else 'u', width // 8))
+
+def numpy_array(values, copy):
+    # Elements of a nint_array, in the container width
+    result = numpy.frombuffer(values.a, numpy_dtype(values.w, values.s))
+    return result.copy() if copy else result
+
+def numpy_lanes(values, width):
+    # Lanes of an integer ndarray, truncated to the container width
+    return swar_load(values.ravel().astype(numpy_dtype(width, False)).tobytes())
+
+def numpy_operand(value, width, signed):
+    if isinstance(value, nint_array):
+        return numpy_array(value, False)
+    return numpy.array(value, numpy_dtype(width, signed))
+
+def numpy_binary(lhs, rhs, bits, signed, op):
+    # Returns None if NumPy results could differ from Python integers:
+    # op_div is exact in float64 only up to 32-bit operands
+    width = array_width(bits)
+    if op is not operator.__mul__ and width > 32:
+        return None
+    count = len(lhs if isinstance(lhs, nint_array) else rhs)
+    lhs = numpy_operand(lhs, width, signed)
+    rhs = numpy_operand(rhs, width, signed)
+    if op is operator.__mul__:
+        result = lhs * rhs
+    else:
+        if count and not numpy.all(rhs):
+            raise ZeroDivisionError('integer division or modulo by zero')
+        lhs = lhs.astype(numpy.int64)
+        rhs = rhs.astype(numpy.int64)
+        result = (lhs / rhs).astype(numpy.int64)
+        if op is op_mod:
+            result = lhs - result * rhs
+    result = numpy.broadcast_to(result, (count,))
+    return nint_array.from_lanes(numpy_lanes(result, width), count, bits, signed)
+
+NUMPY_BINARY = (operator.__mul__, op_div, op_mod)
+
+def numpy_float_dtype(exponent, mantissa):
+    code = FLOAT_STRUCT_CODES.get((exponent, mantissa))
+    return None if code is None else numpy.dtype(code)
+
+def numpy_float_decode(values):
+    # Exact float64 values of an nfloat_array in any format
+    exponent = values.e
+    mantissa = values.m
+    bits = numpy.frombuffer(values.a, numpy_dtype(values.w, False)).astype(numpy.int64)
+    sign = (bits >> (exponent + mantissa)) & 1
+    ve = (bits >> mantissa) & ((1 << exponent) - 1)
+    vm = bits & ((1 << mantissa) - 1)
+    bias = (1 << (exponent - 1)) - 1
+    result = numpy.ldexp(numpy.where(ve > 0, vm | (1 << mantissa), vm).astype(numpy.float64),
+        (numpy.maximum(ve, 1) - bias - mantissa).astype(numpy.int32))
+    special = ve == (1 << exponent) - 1
+    result[special] = numpy.where(vm[special] == 0, numpy.inf, numpy.nan)
+    return numpy.where((sign == 1) & ~numpy.isnan(result), -result, result)
+
+# Operators
+def ensure_array(lhs, rhs):
+    assert isinstance(lhs, nint_array) or isinstance(rhs, nint_array)
+    if numpy is not None:
+        if isinstance(lhs, numpy.ndarray):
+            lhs = nint_array(lhs, rhs.b, rhs.s)
+        if isinstance(rhs, numpy.ndarray):
+            rhs = nint_array(rhs, lhs.b, lhs.s)
+    if not isinstance(lhs, (nint_array, nint)):
+        lhs = nint(lhs, rhs.b, rhs.s)
+    if not isinstance(rhs, (nint_array, nint)):
+        rhs = nint(rhs, lhs.b, lhs.s)
+    return lhs, rhs
+
+def array_operands(lhs, rhs):
+    lhs, rhs = ensure_array(lhs, rhs)
+    bits = promote_bits(lhs, rhs)
+    signed = promote_signed(lhs, rhs)
+    if isinstance(lhs, nint_array) and isinstance(rhs, nint_array):
+        assert len(lhs) == len(rhs), 'Array lengths must match'
+    if isinstance(lhs, nint_array):
+        lhs = lhs.astype(bits, signed)
+    else:
+        lhs = get_value(lhs, bits, signed)
+    if isinstance(rhs, nint_array):
+        rhs = rhs.astype(bits, signed)
+    else:
+        rhs = get_value(rhs, bits, signed)
+    return lhs, rhs, bits, signed
+
+def array_unary_swar(value, op):
+    bits = value.b
+    signed = value.s
+    width = value.w
+    count = len(value)
+    full = (1 << (width * count)) - 1
+    high = swar_repeat(1 << (width - 1), width, count)
+    result = op(swar_load(value.a), full, high)
+    return nint_array.from_lanes(result, count, bits, signed)
+
+def array_unary(value, op):
+    if numpy is not None and op is operator.__abs__ and value.s:
+        result = numpy.abs(numpy_array(value, False))
+        return nint_array.from_lanes(numpy_lanes(result, value.w), len(value), value.b, value.s)
+    result = [op(x) for x in value.a]
+    return nint_array.from_values(result, value.b, value.s)
+
+def array_binary_swar(lhs, rhs, op):
+    lhs, rhs, bits, signed = array_operands(lhs, rhs)
+    array_ = lhs if isinstance(lhs, nint_array) else rhs
+    width = array_.w
+    count = len(array_)
+    high = swar_repeat(1 << (width - 1), width, count)
+    if isinstance(lhs, nint_array):
+        lhs = swar_load(lhs.a)
+    else:
+        lhs = swar_repeat(lhs, width, count)
+    if isinstance(rhs, nint_array):
+        rhs = swar_load(rhs.a)
+    else:
+        rhs = swar_repeat(rhs, width, count)
+    result = op(lhs, rhs, high) & ((1 << (width * count)) - 1)
+    return nint_array.from_lanes(result, count, bits, signed)
+
+def array_binary(lhs, rhs, op):
+    lhs, rhs, bits, signed = array_operands(lhs, rhs)
+    if numpy is not None and op in NUMPY_BINARY:
+        result = numpy_binary(lhs, rhs, bits, signed, op)
+        if result is not None:
+            return result
+    if isinstance(lhs, nint_array) and isinstance(rhs, nint_array):
+        result = [op(x, y) for x, y in zip(lhs.a, rhs.a)]
+    elif isinstance(lhs, nint_array):
+        result = [op(x, rhs) for x in lhs.a]
+    else:
+        result = [op(lhs, y) for y in rhs.a]
+    return nint_array.from_values(result, bits, signed)
+
+def array_shift(lhs, rhs, op):
+    # Shifting every element by the same amount is done in a single step
+    if isinstance(rhs, nint_array):
+        return array_binary(lhs, rhs, op)
+    lhs, rhs, bits, signed = array_operands(lhs, rhs)
+    width = lhs.w
+    count = len(lhs)
+    value = swar_load(lhs.a)
+    if rhs <= 0 or rhs >= width:
+        return array_binary(lhs, rhs, op)
+    if op is operator.__lshift__:
+        full = (1 << (width * count)) - 1
+        result = swar_shl(value, rhs, width, count, full)
+    else:
+        result = swar_shr(value, rhs, width, count)
+        if signed:
+            result = swar_extend(result, width - rhs, width, count)
+    return nint_array.from_lanes(result, count, bits, signed)
+
+def array_relational(lhs, rhs, op):
+    lhs, rhs, bits, signed = array_operands(lhs, rhs)
+    if numpy is not None:
+        width = array_width(bits)
+        return op(numpy_operand(lhs, width, signed), numpy_operand(rhs, width, signed)).tolist()
+    if isinstance(lhs, nint_array) and isinstance(rhs, nint_array):
+        return [op(x, y) for x, y in zip(lhs.a, rhs.a)]
+    if isinstance(lhs, nint_array):
+        return [op(x, rhs) for x in lhs.a]
+    return [op(lhs, y) for y in rhs.a]
+
+def swar_op_add(lhs, rhs, high):
+    return swar_add(lhs, rhs, high)
+def swar_op_sub(lhs, rhs, high):
+    return swar_sub(lhs, rhs, high)
+def swar_op_and(lhs, rhs, high):
+    return lhs & rhs
+def swar_op_or(lhs, rhs, high):
+    return lhs | rhs
+def swar_op_xor(lhs, rhs, high):
+    return lhs ^ rhs
+def swar_op_neg(value, full, high):
+    return swar_sub(0, value, high) & full
+def swar_op_invert(value, full, high):
+    return value ^ full
+
+# Native Integer Array
+class nint_array(object):
+    def __init__(self, values=(), bits=32, signed=True):
+        assert bits >= 1, 'Support down to int1 only'
+        self.b = bits
+        self.s = signed
+        self.w = array_width(bits)
+        self.m = (1 << bits) - 1
+        if isinstance(values, nint_array):
+            values = values.astype(bits, signed)
+            self.a = array.array(array_typecode(self.w, signed))
+            self.a.frombytes(array_view(values.a))
+        elif numpy is not None and isinstance(values, numpy.ndarray) and values.dtype.kind in 'biu':
+            self.a = array.array(array_typecode(self.w, signed))
+            self.a.frombytes(array_wrap(numpy_lanes(values, self.w), values.size, bits, signed))
+        else:
+            self.a = array.array(array_typecode(self.w, signed))
+            self.extend(values)
+
+    @staticmethod
+    def from_lanes(value, count, bits, signed):
+        result = nint_array(bits=bits, signed=signed)
+        result.a.frombytes(array_wrap(value, count, bits, signed))
+        return result
+
+    @staticmethod
+    def from_values(values, bits, signed):
+        # Truncate each element to the container width, then wrap at once
+        width = array_width(bits)
+        mask = (1 << width) - 1
+        data = array.array(array_typecode(width, False), [x & mask for x in values])
+        return nint_array.from_lanes(swar_load(data), len(data), bits, signed)
+
+    # Bytes conversion
+    @staticmethod
+    def from_bytes(data, byteorder, bits, signed):
+        size = (bits + 7) // 8
+        assert len(data) % size == 0, 'Data length must be a multiple of the element size'
+        width = array_width(bits)
+        if size * 8 == width:
+            values = array.array(array_typecode(width, False))
+            values.frombytes(data)
+            if byteorder != sys.byteorder and size > 1:
+                values.byteswap()
+            return nint_array.from_lanes(swar_load(values), len(values), bits, signed)
+        values = [int.from_bytes(data[i:i + size], byteorder)
+            for i in range(0, len(data), size)]
+        return nint_array.from_values(values, bits, signed)
+
+    def to_bytes(self, byteorder):
+        size = (self.b + 7) // 8
+        if size * 8 == self.w:
+            values = array.array(array_typecode(self.w, self.s))
+            values.frombytes(array_view(self.a))
+            if byteorder != sys.byteorder and size > 1:
+                values.byteswap()
+            return values.tobytes()
+        return b''.join(nint(x, self.b, self.s).to_bytes(byteorder) for x in self.a)
+
+    # Buffer conversion
+    # Elements stored in their native layout are viewed in place: the result
+    # shares memory with `buf`, so writes to either are visible in both.
+    @staticmethod
+    def from_buffer(buf, byteorder, bits, signed, offset=0, count=None):
+        size = (bits + 7) // 8
+        view = array_view(buf)[offset:]
+        if count is None:
+            count = len(view) // size
+        view = view[:count * size]
+        assert len(view) == count * size, 'Buffer is too small'
+        width = array_width(bits)
+        if bits == width and (byteorder == sys.byteorder or size == 1):
+            result = nint_array(bits=bits, signed=signed)
+            result.a = view.cast(array_typecode(width, signed))
+            return result
+        return nint_array.from_bytes(view, byteorder, bits, signed)
+
+    @staticmethod
+    def iter_from_buffer(buf, byteorder, bits, signed, offset=0, count=None):
+        cls = nint_class(bits, signed)
+        size = (bits + 7) // 8
+        view = array_view(buf)[offset:]
+        if count is None:
+            count = len(view) // size
+        view = view[:count * size]
+        assert len(view) == count * size, 'Buffer is too small'
+        if bits == size * 8:
+            code = STRUCT_CODES[size]
+            code = STRUCT_BYTEORDERS[byteorder] + (code if signed else code.upper())
+            for value, in struct.iter_unpack(code, view):
+                yield cls(value)
+        else:
+            for i in range(0, len(view), size):
+                yield cls(int.from_bytes(view[i:i + size], byteorder))
+
+    def pack_into(self, buf, offset, byteorder):
+        size = (self.b + 7) // 8
+        if size * 8 == self.w and (byteorder == sys.byteorder or size == 1):
+            data = array_view(self.a)
+        else:
+            data = self.to_bytes(byteorder)
+        view = array_view(buf)
+        assert offset + len(data) <= len(view), 'Buffer is too small'
+        view[offset:offset + len(data)] = data
+
+    # Conversion
+    def astype(self, bits, signed):
+        if bits == self.b and signed == self.s:
+            return self
+        width = array_width(bits)
+        count = len(self)
+        if width == self.w:
+            data = self.a
+        elif width > self.w:
+            data = array.array(array_typecode(width, self.s), self.a)
+        else:
+            return nint_array.from_values(self.a, bits, signed)
+        return nint_array.from_lanes(swar_load(data), count, bits, signed)
+
+    def tolist(self):
+        return self.a.tolist()
+
+    # NumPy conversion
+    # Elements are returned in their container width, e.g. uint16 for uint9
+    __array_ufunc__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        result = numpy_array(self, copy is not False)
+        if dtype is not None:
+            result = result.astype(dtype, copy=False)
+        return result
+
+    def extend(self, values):
+        array_resize(self.a)
+        mask = (1 << self.w) - 1
+        data = array.array(array_typecode(self.w, False), [int(x) & mask for x in values])
+        self.a.frombytes(array_wrap(swar_load(data), len(data), self.b, self.s))
+
+    def append(self, value):
+        array_resize(self.a)
+        self.a.append(get_value(int(value), self.b, self.s))
+
+    # Container operations
+    def __len__(self):
+        return len(self.a)
+    def __iter__(self):
+        for x in self.a:
+            yield nint(x, self.b, self.s)
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            result = nint_array(bits=self.b, signed=self.s)
+            result.a = self.a[key]
+            return result
+        return nint(self.a[key], self.b, self.s)
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = nint_array(value, self.b, self.s)
+            self.a[key] = value.a
+        else:
+            self.a[key] = get_value(int(value), self.b, self.s)
+
+    # Conversion operations
+    def __str__(self):
+        return str(self.a.tolist())
+    def __repr__(self):
+        typename = type(self).__name__
+        return '%s(%s, bits=%d, signed=%s)' % (typename, self, self.b, self.s)
+
+    def op_binary_inplace(self, value, op):
+        result = op(self, value).astype(self.b, self.s)
+        self.a[:] = result.a
+        return self
+
+    # Unary operations
+    def __abs__(self):
+        return array_unary(self, operator.__abs__)
+    def __pos__(self):
+        return nint_array(self, self.b, self.s)
+    def __neg__(self):
+        return array_unary_swar(self, swar_op_neg)
+    def __invert__(self):
+        return array_unary_swar(self, swar_op_invert)
+
+    # Binary operations
+    def __add__(self, rhs):
+        return array_binary_swar(self, rhs, swar_op_add)
+    def __sub__(self, rhs):
+        return array_binary_swar(self, rhs, swar_op_sub)
+    def __mul__(self, rhs):
+        return array_binary(self, rhs, operator.__mul__)
+    def __div__(self, rhs):
+        return array_binary(self, rhs, op_div)
+    def __floordiv__(self, rhs):
+        return array_binary(self, rhs, op_div)
+    def __truediv__(self, rhs):
+        return array_binary(self, rhs, op_div)
+    def __mod__(self, rhs):
+        return array_binary(self, rhs, op_mod)
+    def __pow__(self, rhs):
+        return array_binary(self, rhs, operator.__pow__)
+    def __and__(self, rhs):
+        return array_binary_swar(self, rhs, swar_op_and)
+    def __or__(self, rhs):
+        return array_binary_swar(self, rhs, swar_op_or)
+    def __xor__(self, rhs):
+        return array_binary_swar(self, rhs, swar_op_xor)
+    def __lshift__(self, rhs):
+        return array_shift(self, rhs % self.b, operator.__lshift__)
+    def __rshift__(self, rhs):
+        return array_shift(self, rhs % self.b, operator.__rshift__)
+
+    # Reflected binary operation
+    def __radd__(self, lhs):
+        return array_binary_swar(lhs, self, swar_op_add)
+    def __rsub__(self, lhs):
+        return array_binary_swar(lhs, self, swar_op_sub)
+    def __rmul__(self, lhs):
+        return array_binary(lhs, self, operator.__mul__)
+    def __rdiv__(self, lhs):
+        return array_binary(lhs, self, op_div)
+    def __rfloordiv__(self, lhs):
+        return array_binary(lhs, self, op_div)
+    def __rtruediv__(self, lhs):
+        return array_binary(lhs, self, op_div)
+    def __rmod__(self, lhs):
+        return array_binary(lhs, self, op_mod)
+    def __rpow__(self, lhs):
+        return array_binary(lhs, self, operator.__pow__)
+    def __rand__(self, lhs):
+        return array_binary_swar(lhs, self, swar_op_and)
+    def __ror__(self, lhs):
+        return array_binary_swar(lhs, self, swar_op_or)
+    def __rxor__(self, lhs):
+        return array_binary_swar(lhs, self, swar_op_xor)
+    def __rlshift__(self, lhs):
+        return array_binary(lhs, self % self.b, operator.__lshift__)
+    def __rrshift__(self, lhs):
+        return array_binary(lhs, self % self.b, operator.__rshift__)
+
+    # In-place operations
+    def __iadd__(self, v):
+        return self.op_binary_inplace(v, operator.__add__)
+    def __isub__(self, v):
+        return self.op_binary_inplace(v, operator.__sub__)
+    def __imul__(self, v):
+        return self.op_binary_inplace(v, operator.__mul__)
+    def __idiv__(self, v):
+        return self.op_binary_inplace(v, operator.__truediv__)
+    def __ifloordiv__(self, v):
+        return self.op_binary_inplace(v, operator.__floordiv__)
+    def __itruediv__(self, v):
+        return self.op_binary_inplace(v, operator.__truediv__)
+    def __imod__(self, v):
+        return self.op_binary_inplace(v, operator.__mod__)
+    def __ipow__(self, v):
+        return self.op_binary_inplace(v, operator.__pow__)
+    def __iand__(self, v):
+        return self.op_binary_inplace(v, operator.__and__)
+    def __ior__(self, v):
+        return self.op_binary_inplace(v, operator.__or__)
+    def __ixor__(self, v):
+        return self.op_binary_inplace(v, operator.__xor__)
+    def __ilshift__(self, v):
+        return self.op_binary_inplace(v, operator.__lshift__)
+    def __irshift__(self, v):
+        return self.op_binary_inplace(v, operator.__rshift__)
+
+    # Boolean operations
+    def __eq__(self, rhs):
+        return array_relational(self, rhs, operator.__eq__)
+    def __ne__(self, rhs):
+        return array_relational(self, rhs, operator.__ne__)
+    def __lt__(self, rhs):
+        return array_relational(self, rhs, operator.__lt__)
+    def __le__(self, rhs):
+        return array_relational(self, rhs, operator.__le__)
+    def __ge__(self, rhs):
+        return array_relational(self, rhs, operator.__ge__)
+    def __gt__(self, rhs):
+        return array_relational(self, rhs, operator.__gt__)
+
+
+# Float storage
+def float_array_decode(data, exponent, mantissa):
+    code = FLOAT_STRUCT_CODES.get((exponent, mantissa))
+    if code == 'e':
+        return struct.unpack('=%de' % len(data), data.tobytes())
+    if exponent + mantissa < FLOAT_TABLE_BITS:
+        return list(map(float_decode_table(exponent, mantissa).__getitem__, data))
+    if code is not None:
+        return array.array(code, data.tobytes())
+    return [float_decode(x, exponent, mantissa) for x in data]
+
+def float_array_encode(values, exponent, mantissa):
+    # Returns the raw bits of every value, rounded to the target format
+    code = FLOAT_STRUCT_CODES.get((exponent, mantissa))
+    data = array.array(array_typecode(array_width(1 + exponent + mantissa), False))
+    if code == 'e':
+        try:
+            data.frombytes(struct.pack('=%de' % len(values), *values))
+            return data
+        except OverflowError:
+            pass
+    elif code is not None:
+        data.frombytes(array.array(code, values).tobytes())
+        return data
+    elif exponent + mantissa < FLOAT_TABLE_BITS and exponent <= FLOAT_TABLE_EXPONENT:
+        # Same search as float_encode, inlined
+        table = float_encode_table(exponent, mantissa)
+        search = bisect.bisect_right
+        copysign = math.copysign
+        sign = 1 << (exponent + mantissa)
+        data.extend([(sign | search(table, -x) if copysign(1.0, x) < 0 else search(table, x))
+            if x == x else float_encode(x, exponent, mantissa) for x in values])
+        return data
+    data.extend([float_encode(x, exponent, mantissa) for x in values])
+    return data
+
+# Float operators
+def ensure_float_array(lhs, rhs):
+    assert isinstance(lhs, nfloat_array) or isinstance(rhs, nfloat_array)
+    if numpy is not None:
+        if isinstance(lhs, numpy.ndarray):
+            lhs = nfloat_array(lhs, rhs.e, rhs.m)
+        if isinstance(rhs, numpy.ndarray):
+            rhs = nfloat_array(rhs, lhs.e, lhs.m)
+    if not isinstance(lhs, (nfloat_array, nfloat)):
+        lhs = nfloat(float(lhs), rhs.e, rhs.m)
+    if not isinstance(rhs, (nfloat_array, nfloat)):
+        rhs = nfloat(float(rhs), lhs.e, lhs.m)
+    return lhs, rhs
+
+def float_array_operands(lhs, rhs):
+    lhs, rhs = ensure_float_array(lhs, rhs)
+    exponent = promote_exponent(lhs, rhs)
+    mantissa = promote_mantissa(lhs, rhs)
+    if isinstance(lhs, nfloat_array) and isinstance(rhs, nfloat_array):
+        assert len(lhs) == len(rhs), 'Array lengths must match'
+    if isinstance(lhs, nfloat_array):
+        lhs = lhs.astype(exponent, mantissa).floats()
+    else:
+        lhs = float(lhs)
+    if isinstance(rhs, nfloat_array):
+        rhs = rhs.astype(exponent, mantissa).floats()
+    else:
+        rhs = float(rhs)
+    return lhs, rhs, exponent, mantissa
+
+def float_array_elementwise(lhs, rhs, op):
+    if isinstance(lhs, float):
+        return [op(lhs, y) for y in rhs]
+    if isinstance(rhs, float):
+        return [op(x, rhs) for x in lhs]
+    return [op(x, y) for x, y in zip(lhs, rhs)]
+
+def float_array_unary(value, op):
+    result = [op(x) for x in value.floats()]
+    return nfloat_array(result, value.e, value.m)
+
+def float_array_sign(value, op):
+    # Sign changes only touch the sign bit of every element
+    result = nfloat_array(exponent=value.e, mantissa=value.m)
+    width = value.w
+    count = len(value)
+    sign = swar_repeat(1 << (value.e + value.m), width, count)
+    result.a.frombytes(swar_store(op(swar_load(value.a), sign), width, count))
+    return result
+
+def float_array_binary(lhs, rhs, op):
+    lhs, rhs, exponent, mantissa = float_array_operands(lhs, rhs)
+    result = float_array_elementwise(lhs, rhs, op)
+    return nfloat_array(result, exponent, mantissa)
+
+def float_array_relational(lhs, rhs, op):
+    lhs, rhs, exponent, mantissa = float_array_operands(lhs, rhs)
+    return float_array_elementwise(lhs, rhs, op)
+
+def sign_op_abs(value, sign):
+    return value & ~sign
+def sign_op_neg(value, sign):
+    return value ^ sign
+
+# Native Float Array
+class nfloat_array(object):
+    def __init__(self, values=(), exponent=8, mantissa=23):
+        assert exponent <= 11, 'Support up to float64 only'
+        assert mantissa <= 52, 'Support up to float64 only'
+        self.e = exponent
+        self.m = mantissa
+        self.w = array_width(1 + exponent + mantissa)
+        if isinstance(values, nfloat_array) and \
+           (values.e, values.m) == (exponent, mantissa):
+            self.a = array.array(array_typecode(self.w, False))
+            self.a.frombytes(array_view(values.a))
+        elif numpy is not None and isinstance(values, numpy.ndarray) and \
+           numpy_float_dtype(exponent, mantissa) is not None:
+            self.a = array.array(array_typecode(self.w, False))
+            with numpy.errstate(over='ignore'):
+                values = values.ravel().astype(numpy_float_dtype(exponent, mantissa))
+            self.a.frombytes(values.tobytes())
+        else:
+            self.a = array.array(array_typecode(self.w, False))
+            self.extend(values)
+
+    # Bits conversion
+    @staticmethod
+    def from_bits(values, exponent, mantissa):
+        result = nfloat_array(exponent=exponent, mantissa=mantissa)
+        mask = (1 << (1 + exponent + mantissa)) - 1
+        result.a.extend([int(x) & mask for x in values])
+        return result
+
+    def to_bits(self):
+        return self.a.tolist()
+
+    # Bytes conversion
+    @staticmethod
+    def from_bytes(data, byteorder, exponent, mantissa):
+        bits = 1 + exponent + mantissa
+        result = nfloat_array(exponent=exponent, mantissa=mantissa)
+        result.a = nint_array.from_bytes(data, byteorder, bits, False).a
+        return result
+
+    def to_bytes(self, byteorder):
+        data = nint_array(bits=1 + self.e + self.m, signed=False)
+        data.a = self.a
+        return data.to_bytes(byteorder)
+
+    # Conversion
+    def astype(self, exponent, mantissa):
+        if exponent == self.e and mantissa == self.m:
+            return self
+        return nfloat_array(self.floats(), exponent, mantissa)
+
+    def floats(self):
+        return float_array_decode(self.a, self.e, self.m)
+
+    def tolist(self):
+        return list(self.floats())
+
+    # NumPy conversion
+    # Formats without a NumPy type are returned as float64 values
+    __array_ufunc__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        code = numpy_float_dtype(self.e, self.m)
+        if code is None:
+            result = numpy_float_decode(self)
+        else:
+            result = numpy.frombuffer(self.a, code)
+            if copy is not False:
+                result = result.copy()
+        if dtype is not None:
+            result = result.astype(dtype, copy=False)
+        return result
+
+    def extend(self, values):
+        array_resize(self.a)
+        values = [float(x) for x in values]
+        self.a.extend(float_array_encode(values, self.e, self.m))
+
+    def append(self, value):
+        self.extend([value])
+
+    # Container operations
+    def __len__(self):
+        return len(self.a)
+    def __iter__(self):
+        for x in self.a:
+            yield self.item(x)
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            result = nfloat_array(exponent=self.e, mantissa=self.m)
+            result.a = self.a[key]
+            return result
+        return self.item(self.a[key])
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = nfloat_array(value, self.e, self.m)
+            self.a[key] = value.a
+        else:
+            self.a[key] = float_array_encode([float(value)], self.e, self.m)[0]
+
+    def item(self, bits):
+        result = nfloat(0.0, self.e, self.m)
+        result.set_bits(bits)
+        return result
+
+    # Conversion operations
+    def __str__(self):
+        return str(self.tolist())
+    def __repr__(self):
+        typename = type(self).__name__
+        return '%s(%s, exponent=%d, mantissa=%d)' % (typename, self, self.e, self.m)
+
+    def op_binary_inplace(self, value, op):
+        result = op(self, value).astype(self.e, self.m)
+        self.a[:] = result.a
+        return self
+
+    # Unary operations
+    def __abs__(self):
+        return float_array_sign(self, sign_op_abs)
+    def __pos__(self):
+        return nfloat_array(self, self.e, self.m)
+    def __neg__(self):
+        return float_array_sign(self, sign_op_neg)
+
+    # Binary operations
+    def __add__(self, rhs):
+        return float_array_binary(self, rhs, operator.__add__)
+    def __sub__(self, rhs):
+        return float_array_binary(self, rhs, operator.__sub__)
+    def __mul__(self, rhs):
+        return float_array_binary(self, rhs, operator.__mul__)
+    def __div__(self, rhs):
+        return float_array_binary(self, rhs, operator.__truediv__)
+    def __floordiv__(self, rhs):
+        return float_array_binary(self, rhs, operator.__floordiv__)
+    def __truediv__(self, rhs):
+        return float_array_binary(self, rhs, operator.__truediv__)
+    def __mod__(self, rhs):
+        return float_array_binary(self, rhs, operator.__mod__)
+    def __pow__(self, rhs):
+        return float_array_binary(self, rhs, operator.__pow__)
+
+    # Reflected binary operation
+    def __radd__(self, lhs):
+        return float_array_binary(lhs, self, operator.__add__)
+    def __rsub__(self, lhs):
+        return float_array_binary(lhs, self, operator.__sub__)
+    def __rmul__(self, lhs):
+        return float_array_binary(lhs, self, operator.__mul__)
+    def __rdiv__(self, lhs):
+        return float_array_binary(lhs, self, operator.__truediv__)
+    def __rfloordiv__(self, lhs):
+        return float_array_binary(lhs, self, operator.__floordiv__)
+    def __rtruediv__(self, lhs):
+        return float_array_binary(lhs, self, operator.__truediv__)
+    def __rmod__(self, lhs):
+        return float_array_binary(lhs, self, operator.__mod__)
+    def __rpow__(self, lhs):
+        return float_array_binary(lhs, self, operator.__pow__)
+
+    # In-place operations
+    def __iadd__(self, v):
+        return self.op_binary_inplace(v, operator.__add__)
+    def __isub__(self, v):
+        return self.op_binary_inplace(v, operator.__sub__)
+    def __imul__(self, v):
+        return self.op_binary_inplace(v, operator.__mul__)
+    def __idiv__(self, v):
+        return self.op_binary_inplace(v, operator.__truediv__)
+    def __ifloordiv__(self, v):
+        return self.op_binary_inplace(v, operator.__floordiv__)
+    def __itruediv__(self, v):
+        return self.op_binary_inplace(v, operator.__truediv__)
+    def __imod__(self, v):
+        return self.op_binary_inplace(v, operator.__mod__)
+    def __ipow__(self, v):
+        return self.op_binary_inplace(v, operator.__pow__)
+
+    # Boolean operations
+    def __eq__(self, rhs):
+        return float_array_relational(self, rhs, operator.__eq__)
+    def __ne__(self, rhs):
+        return float_array_relational(self, rhs, operator.__ne__)
+    def __lt__(self, rhs):
+        return float_array_relational(self, rhs, operator.__lt__)
+    def __le__(self, rhs):
+        return float_array_relational(self, rhs, operator.__le__)
+    def __ge__(self, rhs):
+        return float_array_relational(self, rhs, operator.__ge__)
+    def __gt__(self, rhs):
+        return float_array_relational(self, rhs, operator.__gt__)
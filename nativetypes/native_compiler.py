@@ -0,0 +1,730 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import ast
+import functools
+import inspect
+import operator
+import struct
+import textwrap
+
+from .native_int import *
+from .native_float import *
+
+# Helpers
+def jit_box(cls, value):
+    result = allocate(cls)
+    result.v = value
+    return result
+
+def jit_codec(exponent, mantissa):
+    # Returns the decoder, encoder and rounding function (the decoded value of
+    # the encoded argument) of a float format, as used by nfloat
+    code = FLOAT_STRUCT_CODES.get((exponent, mantissa))
+    if code is None:
+        def decode(value):
+            return float_decode(value, exponent, mantissa)
+        def encode(value):
+            return float_encode(value, exponent, mantissa)
+        def round(value):
+            return float_decode(float_encode(value, exponent, mantissa), exponent, mantissa)
+        return decode, encode, round
+    size = struct.calcsize(code)
+    bits = struct.Struct('<' + {2: 'H', 4: 'I', 8: 'Q'}[size])
+    real = struct.Struct('<' + code)
+    pack_bits, unpack_bits = bits.pack, bits.unpack
+    pack_real, unpack_real = real.pack, real.unpack
+    def decode(value):
+        return unpack_real(pack_bits(value))[0]
+    def encode(value):
+        try:
+            return unpack_bits(pack_real(value))[0]
+        except OverflowError:
+            return float_encode(value, exponent, mantissa)
+    def round(value):
+        try:
+            return unpack_real(pack_real(value))[0]
+        except OverflowError:
+            return decode(float_encode(value, exponent, mantissa))
+    return decode, encode, round
+
+class jit_error(Exception):
+    pass
+
+class jit_literal(str):
+    # Source code of a literal, which keeps its value for constant folding
+    def __new__(cls, code, value):
+        self = str.__new__(cls, code)
+        self.value = value
+        return self
+
+class jit_encoded(str):
+    # Source code of an encoded float, which keeps the code of the value
+    def __new__(cls, code, value, format):
+        self = str.__new__(cls, code)
+        self.value = value
+        self.format = format
+        return self
+
+class jit_pending(Exception):
+    pass
+
+# Compiler
+# Native values become plain Python integers: the value of a nint, or the bit
+# pattern of a nfloat. Every expression has a static kind, either a Python
+# type (int, float, bool, str) or a native alias, and native values are kept
+# canonical so that masks are only emitted after operations that can
+# overflow. Anything not understood raises jit_error.
+JIT_BINARY = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.FloorDiv: '//',
+    ast.Mod: '%', ast.Pow: '**', ast.LShift: '<<', ast.RShift: '>>',
+    ast.BitAnd: '&', ast.BitOr: '|', ast.BitXor: '^',
+}
+JIT_COMPARE = {
+    ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=',
+}
+JIT_SIMPLE = (int, float, bool, str)
+JIT_OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '//': operator.floordiv, '%': operator.mod, '**': operator.pow,
+}
+JIT_FOLDS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '&': operator.and_,
+    '|': operator.or_, '^': operator.xor,
+}
+
+def jit_native(kind):
+    return isinstance(kind, type) and issubclass(kind, (nint, nfloat)) and kind not in (nint, nfloat)
+
+def jit_nint(kind):
+    return isinstance(kind, type) and issubclass(kind, nint)
+
+def jit_nfloat(kind):
+    return isinstance(kind, type) and issubclass(kind, nfloat)
+
+class jit_compiler(object):
+    def __init__(self, func):
+        if func.__code__.co_freevars:
+            raise jit_error('closures are not supported')
+        try:
+            tree = ast.parse(textwrap.dedent(inspect.getsource(func))).body[0]
+        except (IOError, OSError, TypeError, SyntaxError):
+            raise jit_error('source is not available')
+        if not isinstance(tree, ast.FunctionDef):
+            raise jit_error('not a function definition')
+        self.func = func
+        self.tree = tree
+        self.names = {}
+        self.helpers = {}
+        self.codecs = {}
+        self.guards = {}
+        self.types = {}
+        self.aliased = set()
+
+    # Namespace
+    def helper(self, value, prefix='c'):
+        key = (prefix, id(value))
+        name = self.names.get(key)
+        if name is None:
+            name = '__j_%s%d' % (prefix, len(self.helpers))
+            self.names[key] = name
+            self.helpers[name] = value
+        return name
+
+    def codec(self, cls):
+        key = (cls.e, cls.m)
+        if key not in self.codecs:
+            decode, encode, round = jit_codec(cls.e, cls.m)
+            self.codecs[key] = (self.helper(decode, 'd'), self.helper(encode, 'e'), self.helper(round, 'r'))
+        return self.codecs[key]
+
+    def resolve(self, name):
+        if name.startswith('__j_'):
+            raise jit_error('reserved name: %s' % name)
+        scope = self.func.__globals__
+        if name in scope:
+            return scope[name]
+        builtins = scope.get('__builtins__')
+        builtins = builtins if isinstance(builtins, dict) else vars(builtins)
+        if name in builtins:
+            return builtins[name]
+        raise jit_error('unknown name: %s' % name)
+
+    def literal(self, value):
+        if isinstance(value, float) and (value != value or value in (float('inf'), -float('inf'))):
+            return jit_literal(self.helper(value), value)
+        if isinstance(value, (int, float)) and value < 0:
+            return jit_literal('(%r)' % value, value)
+        return jit_literal(repr(value), value)
+
+    # Conversions
+    def wrap(self, code, cls):
+        if cls.s:
+            return '((((%s) & %d) ^ %d) - %d)' % (code, cls.m, cls.h, cls.h)
+        return '((%s) & %d)' % (code, cls.m)
+
+    def convert(self, code, src, dst):
+        # Values of `src` that fit in `dst` are already canonical there
+        if src is dst or (dst.lo <= src.lo and src.hi <= dst.hi):
+            return code
+        return self.wrap(code, dst)
+
+    def decode(self, code, cls):
+        # Decoding a value that was just encoded only needs rounding
+        if isinstance(code, jit_encoded) and code.format == (cls.e, cls.m):
+            return '%s(%s)' % (self.codec(cls)[2], code.value)
+        return '%s(%s)' % (self.codec(cls)[0], code)
+
+    def encode(self, code, cls):
+        return jit_encoded('%s(%s)' % (self.codec(cls)[1], code), code, (cls.e, cls.m))
+
+    def native_int(self, expr, cls):
+        # Converts an operand of a nint operation to the class `cls`
+        code, kind = expr
+        if kind is int:
+            if isinstance(code, jit_literal):
+                return self.literal(wrap_value(code.value, cls))
+            return self.wrap(code, cls)
+        return self.convert(code, kind, cls)
+
+    def native_float(self, expr, cls):
+        # Decodes an operand of a nfloat operation, rounding Python floats
+        code, kind = expr
+        if kind is float:
+            if isinstance(code, jit_literal):
+                return self.literal(jit_codec(cls.e, cls.m)[2](code.value))
+            return self.decode(self.encode(code, cls), cls)
+        return self.decode(code, kind)
+
+    # Expressions
+    # Results are pairs of code and kind, literals keep their value so that
+    # they can be folded into the native type of the other operand.
+    def expr(self, node):
+        method = getattr(self, 'expr_' + type(node).__name__, None)
+        if method is None:
+            raise jit_error('unsupported expression: %s' % type(node).__name__)
+        return method(node)
+
+    def expr_Constant(self, node):
+        if type(node.value) not in JIT_SIMPLE:
+            raise jit_error('unsupported constant: %r' % node.value)
+        return self.literal(node.value), type(node.value)
+
+    def expr_Num(self, node):
+        return self.literal(node.n), type(node.n)
+
+    def expr_Str(self, node):
+        return self.literal(node.s), str
+
+    def expr_Name(self, node):
+        if node.id in self.types:
+            return node.id, self.types[node.id]
+        if node.id in self.assigned:
+            raise jit_pending(node.id)
+        return self.load_global(node.id, self.resolve(node.id))
+
+    def expr_Attribute(self, node):
+        # Attributes of imported modules, e.g. string.ascii_lowercase
+        path = []
+        while isinstance(node, ast.Attribute):
+            path.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id in self.assigned:
+            raise jit_error('unsupported attribute')
+        value = self.resolve(node.id)
+        if not inspect.ismodule(value):
+            raise jit_error('unsupported attribute')
+        code = node.id
+        for attr in reversed(path):
+            if not hasattr(value, attr):
+                raise jit_error('unknown attribute: %s.%s' % (code, attr))
+            value = getattr(value, attr)
+            code += '.' + attr
+        return self.load_global(code, value)
+
+    def load_global(self, code, value):
+        # Globals are read at runtime, their type is checked on entry
+        if type(value) not in JIT_SIMPLE:
+            raise jit_error('unsupported global: %s' % code)
+        self.guards[code] = type(value)
+        return code, type(value)
+
+    def expr_BinOp(self, node):
+        op = JIT_BINARY.get(type(node.op))
+        if op is None:
+            raise jit_error('unsupported operator')
+        return self.binary(self.expr(node.left), self.expr(node.right), op)
+
+    def binary(self, lhs, rhs, op):
+        lkind = lhs[1]
+        rkind = rhs[1]
+        if jit_nint(lkind) or jit_nint(rkind):
+            return self.binary_nint(lhs, rhs, op)
+        if jit_nfloat(lkind) or jit_nfloat(rkind):
+            return self.binary_nfloat(lhs, rhs, op)
+        if lkind is str and rkind is str and op == '+':
+            return '(%s + %s)' % (lhs[0], rhs[0]), str
+        if lkind not in (int, float) or rkind not in (int, float):
+            raise jit_error('unsupported operands')
+        if op in ('<<', '>>', '&', '|', '^') and float in (lkind, rkind):
+            raise jit_error('unsupported operands')
+        if op == '**' and not (isinstance(rhs[0], jit_literal) and rhs[0].value >= 0):
+            raise jit_error('unsupported power')
+        kind = float if op == '/' or float in (lkind, rkind) else int
+        if kind is int and isinstance(lhs[0], jit_literal) and isinstance(rhs[0], jit_literal) \
+                and op in JIT_FOLDS:
+            return self.literal(JIT_FOLDS[op](lhs[0].value, rhs[0].value)), int
+        return '(%s %s %s)' % (lhs[0], op, rhs[0]), kind
+
+    def binary_nint(self, lhs, rhs, op):
+        lkind = lhs[1]
+        rkind = rhs[1]
+        for kind in (lkind, rkind):
+            if kind is not int and not jit_nint(kind):
+                raise jit_error('unsupported operands')
+        if op in ('<<', '>>'):
+            # The shift amount is reduced modulo the width of the native
+            # operand first, as done by nint
+            rhs = self.modulo(rhs, (lkind if jit_nint(lkind) else rkind).b)
+            rkind = rhs[1]
+        if rkind is int:
+            cls = lkind
+        elif lkind is int:
+            cls = rkind
+        else:
+            cls = promote_type(lkind, rkind)
+        lcode = self.native_int(lhs, cls)
+        rcode = self.native_int(rhs, cls)
+        if op in ('/', '//'):
+            code = '%s(%s, %s)' % (self.helper(op_div), lcode, rcode)
+        elif op == '%':
+            code = '%s(%s, %s)' % (self.helper(op_mod), lcode, rcode)
+        else:
+            code = '(%s %s %s)' % (lcode, op, rcode)
+        if op in ('&', '|', '^', '>>'):
+            return code, cls
+        return self.wrap(code, cls), cls
+
+    def modulo(self, expr, bits):
+        code, kind = expr
+        if kind is int:
+            if isinstance(code, jit_literal):
+                return self.literal(code.value % bits), int
+            return '(%s %% %d)' % (code, bits), int
+        return self.binary_nint(expr, (self.literal(bits), int), '%')
+
+    def binary_nfloat(self, lhs, rhs, op):
+        lkind = lhs[1]
+        rkind = rhs[1]
+        for kind in (lkind, rkind):
+            if kind is not float and not jit_nfloat(kind):
+                raise jit_error('unsupported operands')
+        if op in ('<<', '>>', '&', '|', '^'):
+            raise jit_error('unsupported operator')
+        lformat = rkind if lkind is float else lkind
+        rformat = lkind if rkind is float else rkind
+        cls = nfloat_class(max(lformat.e, rformat.e), max(lformat.m, rformat.m))
+        code = self.float_op(self.native_float(lhs, lformat), op, self.native_float(rhs, rformat))
+        return self.encode(code, cls), cls
+
+    def float_op(self, lhs, op, rhs):
+        # Same functions as nfloat, since the specialized float operators of
+        # the interpreter may differ in the sign of NaN results
+        return '%s(%s, %s)' % (self.helper(JIT_OPERATORS[op]), lhs, rhs)
+
+    def expr_UnaryOp(self, node):
+        code, kind = self.expr(node.operand)
+        if isinstance(node.op, ast.Not):
+            return '(not %s)' % self.condition((code, kind)), bool
+        op = {ast.UAdd: '+', ast.USub: '-', ast.Invert: '~'}[type(node.op)]
+        return self.unary((code, kind), op)
+
+    def unary(self, expr, op):
+        code, kind = expr
+        if jit_nint(kind):
+            if op == 'abs':
+                return self.wrap('abs(%s)' % code, kind), kind
+            if op == '+':
+                return code, kind
+            if op == '~' and kind.s:
+                return '(~%s)' % code, kind
+            return self.wrap('%s%s' % (op, code), kind), kind
+        if jit_nfloat(kind):
+            if op == '~':
+                raise jit_error('unsupported operator')
+            cls = nfloat_class(kind.e, kind.m)
+            if op == 'abs':
+                return self.encode('abs(%s)' % self.decode(code, kind), cls), cls
+            return self.encode('%s%s' % (op, self.decode(code, kind)), cls), cls
+        if kind not in (int, float) or (op == '~' and kind is not int):
+            raise jit_error('unsupported operand')
+        if isinstance(code, jit_literal):
+            value = {'abs': abs, '+': operator.pos, '-': operator.neg, '~': operator.invert}[op]
+            return self.literal(value(code.value)), kind
+        if op == 'abs':
+            return 'abs(%s)' % code, kind
+        return '(%s%s)' % (op, code), kind
+
+    def expr_Compare(self, node):
+        if len(node.ops) != 1:
+            raise jit_error('chained comparisons are not supported')
+        op = JIT_COMPARE.get(type(node.ops[0]))
+        if op is None:
+            raise jit_error('unsupported comparison')
+        lhs = self.expr(node.left)
+        rhs = self.expr(node.comparators[0])
+        lkind = lhs[1]
+        rkind = rhs[1]
+        if jit_nint(lkind) or jit_nint(rkind):
+            for kind in (lkind, rkind):
+                if kind is not int and not jit_nint(kind):
+                    raise jit_error('unsupported operands')
+            if rkind is int:
+                cls = lkind
+            elif lkind is int:
+                cls = rkind
+            else:
+                cls = promote_type(lkind, rkind)
+            lcode = self.native_int(lhs, cls)
+            rcode = self.native_int(rhs, cls)
+        elif jit_nfloat(lkind) or jit_nfloat(rkind):
+            for kind in (lkind, rkind):
+                if kind is not float and not jit_nfloat(kind):
+                    raise jit_error('unsupported operands')
+            lcode = self.native_float(lhs, rkind if lkind is float else lkind)
+            rcode = self.native_float(rhs, lkind if rkind is float else rkind)
+        elif lkind in JIT_SIMPLE and rkind in JIT_SIMPLE:
+            lcode, rcode = lhs[0], rhs[0]
+        else:
+            raise jit_error('unsupported operands')
+        return '(%s %s %s)' % (lcode, op, rcode), bool
+
+    def expr_BoolOp(self, node):
+        values = [self.expr(value) for value in node.values]
+        if any(kind is not bool for code, kind in values):
+            raise jit_error('boolean operators require bool operands')
+        op = ' and ' if isinstance(node.op, ast.And) else ' or '
+        return '(%s)' % op.join(code for code, kind in values), bool
+
+    def expr_IfExp(self, node):
+        body = self.expr(node.body)
+        orelse = self.expr(node.orelse)
+        if body[1] is not orelse[1]:
+            raise jit_error('conditional branches of different types')
+        test = self.condition(self.expr(node.test))
+        return '(%s if %s else %s)' % (body[0], test, orelse[0]), body[1]
+
+    def expr_Subscript(self, node):
+        value = self.expr(node.value)
+        index = node.slice
+        if isinstance(index, ast.Index):
+            index = index.value
+        index = self.expr(index)
+        if value[1] is not str or not (index[1] is int or jit_nint(index[1])):
+            raise jit_error('unsupported subscript')
+        return '%s[%s]' % (value[0], index[0]), str
+
+    def expr_Call(self, node):
+        if node.keywords or not isinstance(node.func, ast.Name) or node.func.id in self.assigned:
+            raise jit_error('unsupported call')
+        func = self.resolve(node.func.id)
+        if func is reinterpret_cast_function() and len(node.args) == 2:
+            cls = self.resolve_type(node.args[0])
+            return self.reinterpret(cls, self.expr(node.args[1]))
+        args = [self.expr(arg) for arg in node.args]
+        if len(args) != 1:
+            raise jit_error('unsupported call')
+        code, kind = args[0]
+        if jit_nint(func) and jit_native(func):
+            if kind is not int:
+                raise jit_error('unsupported constructor argument')
+            return self.native_int(args[0], func), func
+        if jit_nfloat(func) and jit_native(func):
+            if kind is not float:
+                raise jit_error('unsupported constructor argument')
+            if isinstance(code, jit_literal):
+                return self.literal(jit_codec(func.e, func.m)[1](code.value)), func
+            return self.encode(code, func), func
+        if func is abs:
+            return self.unary(args[0], 'abs')
+        if func in (int, float, bool):
+            if jit_nint(kind):
+                code = '%s(%s)' % (func.__name__, code)
+            elif jit_nfloat(kind):
+                code = '%s(%s)' % (func.__name__, self.decode(code, kind))
+            elif kind in (int, float, bool):
+                code = '%s(%s)' % (func.__name__, code)
+            else:
+                raise jit_error('unsupported conversion')
+            return code, func
+        raise jit_error('unsupported call')
+
+    def resolve_type(self, node):
+        if not isinstance(node, ast.Name) or node.id in self.assigned:
+            raise jit_error('unsupported type')
+        cls = self.resolve(node.id)
+        if not jit_native(cls):
+            raise jit_error('unsupported type')
+        return cls
+
+    def reinterpret(self, cls, expr):
+        code, kind = expr
+        if not jit_native(kind):
+            raise jit_error('unsupported reinterpret_cast')
+        if jit_nint(kind) and kind.s:
+            code = '(%s & %d)' % (code, kind.m)
+        if jit_nint(cls):
+            return self.wrap(code, cls), cls
+        bits = kind.b if jit_nint(kind) else 1 + kind.e + kind.m
+        if bits <= 1 + cls.e + cls.m:
+            return code, cls
+        return '(%s & %d)' % (code, (1 << (1 + cls.e + cls.m)) - 1), cls
+
+    def condition(self, expr):
+        code, kind = expr
+        if jit_nfloat(kind):
+            return self.decode(code, kind)
+        return code
+
+    # Statements
+    def stmts(self, nodes, indent):
+        lines = []
+        for node in nodes:
+            method = getattr(self, 'stmt_' + type(node).__name__, None)
+            if method is None:
+                raise jit_error('unsupported statement: %s' % type(node).__name__)
+            try:
+                lines.extend(method(node, indent))
+            except jit_pending:
+                # Types of some variables are only known after a later pass
+                self.pending = True
+                lines.append(indent + 'pass')
+        return lines or [indent + 'pass']
+
+    def assign(self, name, expr):
+        code, kind = expr
+        if name.startswith('__j_'):
+            raise jit_error('reserved name: %s' % name)
+        known = self.types.setdefault(name, kind)
+        if known is not kind:
+            raise jit_error('variable %s changes type' % name)
+        return '%s = %s' % (name, code)
+
+    def stmt_Assign(self, node, indent):
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            raise jit_error('unsupported assignment')
+        return [indent + self.assign(node.targets[0].id, self.expr(node.value))]
+
+    def stmt_AnnAssign(self, node, indent):
+        # Annotations of local variables have no effect, as in Python
+        if node.value is None or not isinstance(node.target, ast.Name):
+            raise jit_error('unsupported assignment')
+        return [indent + self.assign(node.target.id, self.expr(node.value))]
+
+    def stmt_AugAssign(self, node, indent):
+        if not isinstance(node.target, ast.Name):
+            raise jit_error('unsupported assignment')
+        name = node.target.id
+        op = JIT_BINARY.get(type(node.op))
+        if op is None:
+            raise jit_error('unsupported operator')
+        target = self.expr(node.target)
+        value = self.expr(node.value)
+        kind = target[1]
+        if jit_native(kind) and name in self.aliased:
+            # The native object would be updated in place for all its aliases
+            raise jit_error('in-place update of an aliased value: %s' % name)
+        if jit_nint(kind):
+            code = self.inplace_nint(target, value, op)
+        elif jit_nfloat(kind):
+            code = self.inplace_nfloat(target, value, op)
+        else:
+            code = self.binary(target, value, op)[0]
+        return [indent + self.assign(name, (code, kind))]
+
+    def inplace_nint(self, target, value, op):
+        code, cls = target
+        vcode, vkind = value
+        if jit_nint(vkind) and op not in ('<<', '>>'):
+            result = self.binary_nint((self.convert(code, cls, vkind), vkind), value, op)
+            return self.convert(result[0], vkind, cls)
+        if vkind is not int:
+            raise jit_error('unsupported operands')
+        if op in ('<<', '>>'):
+            vcode = self.modulo(value, cls.b)[0]
+        if op in ('/', '//'):
+            return self.wrap('%s(%s, %s)' % (self.helper(op_div), code, vcode), cls)
+        if op == '%':
+            return self.wrap('%s(%s, %s)' % (self.helper(op_mod), code, vcode), cls)
+        return self.wrap('(%s %s %s)' % (code, op, vcode), cls)
+
+    def inplace_nfloat(self, target, value, op):
+        code, cls = target
+        vcode, vkind = value
+        if op in ('<<', '>>', '&', '|', '^'):
+            raise jit_error('unsupported operator')
+        if jit_nfloat(vkind):
+            vcode = self.decode(vcode, vkind)
+        elif jit_nint(vkind) or vkind is int:
+            vcode = 'float(%s)' % vcode
+        elif vkind is not float:
+            raise jit_error('unsupported operands')
+        return self.encode(self.float_op(self.decode(code, cls), op, vcode), cls)
+
+    def stmt_Return(self, node, indent):
+        if node.value is None:
+            return [indent + 'return None']
+        if isinstance(node.value, ast.Tuple):
+            values = [self.result(value) for value in node.value.elts]
+            return [indent + 'return (%s,)' % ', '.join(values)]
+        return [indent + 'return %s' % self.result(node.value)]
+
+    def result(self, node):
+        # Native values are only boxed when they leave the function
+        code, kind = self.expr(node)
+        if jit_native(kind):
+            return '%s(%s, %s)' % (self.helper(jit_box), self.helper(kind), code)
+        return code
+
+    def stmt_If(self, node, indent):
+        lines = [indent + 'if %s:' % self.condition(self.expr(node.test))]
+        lines += self.stmts(node.body, indent + '    ')
+        if node.orelse:
+            lines.append(indent + 'else:')
+            lines += self.stmts(node.orelse, indent + '    ')
+        return lines
+
+    def stmt_While(self, node, indent):
+        if node.orelse:
+            raise jit_error('while-else is not supported')
+        lines = [indent + 'while %s:' % self.condition(self.expr(node.test))]
+        return lines + self.stmts(node.body, indent + '    ')
+
+    def stmt_For(self, node, indent):
+        call = node.iter
+        if node.orelse or not isinstance(node.target, ast.Name) or \
+                not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name) or \
+                call.func.id in self.assigned or self.resolve(call.func.id) is not range:
+            raise jit_error('only for loops over range() are supported')
+        args = [self.expr(arg) for arg in call.args]
+        if call.keywords or any(kind is not int and not jit_nint(kind) for code, kind in args):
+            raise jit_error('unsupported range')
+        self.assign(node.target.id, (node.target.id, int))
+        lines = [indent + 'for %s in range(%s):' % (node.target.id, ', '.join(code for code, kind in args))]
+        return lines + self.stmts(node.body, indent + '    ')
+
+    def stmt_Expr(self, node, indent):
+        if isinstance(node.value, (ast.Constant, ast.Str)):
+            return []
+        raise jit_error('unsupported expression statement')
+
+    def stmt_Pass(self, node, indent):
+        return [indent + 'pass']
+    def stmt_Break(self, node, indent):
+        return [indent + 'break']
+    def stmt_Continue(self, node, indent):
+        return [indent + 'continue']
+
+    # Function
+    def params(self):
+        args = self.tree.args
+        if args.vararg or args.kwarg or args.kwonlyargs or getattr(args, 'posonlyargs', None):
+            raise jit_error('only positional parameters are supported')
+        annotations = self.func.__annotations__
+        params = []
+        for arg in args.args:
+            kind = annotations.get(arg.arg, int)
+            if isinstance(kind, str):
+                try:
+                    kind = eval(kind, self.func.__globals__)
+                except Exception:
+                    raise jit_error('unsupported annotation: %s' % kind)
+            if not jit_native(kind) and kind not in JIT_SIMPLE:
+                raise jit_error('unsupported annotation: %r' % kind)
+            params.append((arg.arg, kind))
+        return params
+
+    def scan(self, params):
+        # Variables assigned anywhere shadow globals, and values bound to
+        # more than one name must not be updated in place
+        self.assigned = set(name for name, kind in params)
+        self.aliased = set(self.assigned)
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        self.assigned.add(target.id)
+                if isinstance(node, ast.AugAssign) or node.value is None:
+                    continue
+                if not isinstance(node.value, (ast.BinOp, ast.UnaryOp, ast.Call, ast.Compare)):
+                    for target in targets:
+                        self.aliased.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+                    self.aliased.update(n.id for n in ast.walk(node.value) if isinstance(n, ast.Name))
+            elif isinstance(node, ast.For):
+                self.assigned.update(n.id for n in ast.walk(node.target) if isinstance(n, ast.Name))
+            elif isinstance(node, (ast.Global, ast.Nonlocal)):
+                raise jit_error('global statements are not supported')
+
+    def compile(self):
+        params = self.params()
+        self.scan(params)
+        self.types = dict(params)
+        while True:
+            known = len(self.types)
+            self.pending = False
+            body = self.stmts(self.tree.body, '        ')
+            if not self.pending:
+                break
+            if len(self.types) == known:
+                raise jit_error('cannot infer variable types')
+        names = [name for name, kind in params]
+        guards = ['type(%s) is not %s' % (name, self.helper(kind)) for name, kind in params]
+        guards += ['type(%s) is not %s' % (code, self.helper(kind))
+            for code, kind in sorted(self.guards.items())]
+        lines = ['def __j_factory(%s):' % ', '.join(
+            ['__j_orig'] + list(self.helpers))]
+        lines.append('    def %s(%s):' % (self.tree.name, ', '.join(names)))
+        if guards:
+            lines.append('        if %s:' % ' or '.join(guards))
+            lines.append('            return __j_orig(%s)' % ', '.join(names))
+        for name, kind in params:
+            if jit_native(kind):
+                lines.append('        %s = %s.v' % (name, name))
+        lines += body
+        lines.append('    return %s' % self.tree.name)
+        source = '\n'.join(lines) + '\n'
+        namespace = {}
+        exec(compile(source, '<native_jit %s>' % self.tree.name, 'exec'), self.func.__globals__, namespace)
+        result = namespace['__j_factory'](self.func, *self.helpers.values())
+        result.__defaults__ = self.func.__defaults__
+        result.source = source
+        return result
+
+def reinterpret_cast_function():
+    from . import reinterpret_cast
+    return reinterpret_cast
+
+# Decorator
+def jit_function(func):
+    try:
+        return jit_compiler(func).compile()
+    except jit_error:
+        return func
+
+def native_jit(func):
+    # Compiled on first call, so that globals defined later are available.
+    # Functions that cannot be compiled keep running unchanged.
+    state = []
+    def compiled():
+        if not state:
+            state.append(jit_function(func))
+        return state[0]
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return (state[0] if state else compiled())(*args, **kwargs)
+    wrapper.compiled = compiled
+    return wrapper
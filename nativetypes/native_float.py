@@ -4,7 +4,10 @@
 Native types.
 """
 
+import bisect
+import math
 import operator
+import re
 import struct
 
 from .native_int import *
@@ -24,6 +27,122 @@ def promote_exponent(lhs, rhs):
 def promote_mantissa(lhs, rhs):
     return max(lhs.m, rhs.m)
 
+# Encoding
+FLOAT_STRUCT_CODES = {(5, 10): 'e', (8, 23): 'f', (11, 52): 'd'}
+FLOAT_STRUCTS = dict((k, struct.Struct('<' + v)) for k, v in FLOAT_STRUCT_CODES.items())
+
+def float_encode(value, exponent, mantissa):
+    # Round to the nearest representable value, ties to even
+    packer = FLOAT_STRUCTS.get((exponent, mantissa))
+    if packer is not None:
+        try:
+            return int.from_bytes(packer.pack(value), 'little')
+        except OverflowError:
+            pass
+    if exponent + mantissa < FLOAT_TABLE_BITS and exponent <= FLOAT_TABLE_EXPONENT and value == value:
+        table = _float_encode_tables.get((exponent, mantissa))
+        if table is None:
+            table = float_encode_table(exponent, mantissa)
+        if math.copysign(1.0, value) < 0:
+            return (1 << (exponent + mantissa)) | bisect.bisect_right(table, -value)
+        return bisect.bisect_right(table, value)
+    return float_encode_generic(value, exponent, mantissa)
+
+def float_encode_generic(value, exponent, mantissa):
+    sign = int(math.copysign(1.0, value) < 0) << (exponent + mantissa)
+    special = ((1 << exponent) - 1) << mantissa
+    if value != value:
+        value = struct.unpack('<Q', struct.pack('<d', value))[0]
+        payload = (value & ((1 << 52) - 1)) >> (52 - mantissa)
+        return sign | special | (payload or 1)
+    value = abs(value)
+    if value == float('inf'):
+        return sign | special
+    if value == 0.0:
+        return sign
+    bias = (1 << (exponent - 1)) - 1
+    exp = max(math.frexp(value)[1] - 1, 1 - bias)
+    digits = int(round(math.ldexp(value, mantissa - exp)))
+    if digits >> (mantissa + 1):
+        digits >>= 1
+        exp += 1
+    if not digits >> mantissa:
+        return sign | digits
+    if exp + bias >= (1 << exponent) - 1:
+        return sign | special
+    return sign | ((exp + bias) << mantissa) | (digits & ((1 << mantissa) - 1))
+
+def float_decode(value, exponent, mantissa):
+    if exponent + mantissa < FLOAT_TABLE_BITS:
+        table = _float_decode_tables.get((exponent, mantissa))
+        if table is None:
+            table = float_decode_table(exponent, mantissa)
+        return table[value]
+    return float_decode_generic(value, exponent, mantissa)
+
+def float_decode_generic(value, exponent, mantissa):
+    # Standard formats are decoded natively from their bit pattern
+    packer = FLOAT_STRUCTS.get((exponent, mantissa))
+    if packer is not None:
+        return packer.unpack(value.to_bytes(packer.size, 'little'))[0]
+    # Other formats are assembled as an integer significand scaled by 2**exp
+    sign = value >> (exponent + mantissa)
+    ve = (value >> mantissa) & ((1 << exponent) - 1)
+    vm = value & ((1 << mantissa) - 1)
+    # Non-numbers
+    if ve == (1 << exponent) - 1:
+        if vm == 0:
+            return -float('inf') if sign else float('inf')
+        return float('nan')
+    # Denormalized values lack the implicit leading bit
+    if ve:
+        vm |= 1 << mantissa
+    else:
+        ve = 1
+    result = math.ldexp(vm, ve - ((1 << (exponent - 1)) - 1) - mantissa)
+    return -result if sign else result
+
+# Tables
+# Formats of up to 16 bits are decoded by indexing a table of every bit
+# pattern. They are encoded by searching a sorted table of the midpoints
+# between consecutive positive values: the number of midpoints below a
+# magnitude is the bit pattern of its rounded value. Midpoints that round
+# down to an even pattern are moved up by one ulp, so that ties round to
+# even. Tables are built on first use.
+FLOAT_TABLE_BITS = 16
+FLOAT_TABLE_EXPONENT = 10
+_float_decode_tables = {}
+_float_encode_tables = {}
+
+def float_next(value):
+    # Smallest float64 greater than a positive `value`
+    packer = FLOAT_STRUCTS[11, 52]
+    bits = int.from_bytes(packer.pack(value), 'little') + 1
+    return packer.unpack(bits.to_bytes(8, 'little'))[0]
+
+def float_decode_table(exponent, mantissa):
+    table = _float_decode_tables.get((exponent, mantissa))
+    if table is None:
+        count = 1 << (1 + exponent + mantissa)
+        table = [float_decode_generic(x, exponent, mantissa) for x in range(count)]
+        _float_decode_tables[exponent, mantissa] = table
+    return table
+
+def float_encode_table(exponent, mantissa):
+    table = _float_encode_tables.get((exponent, mantissa))
+    if table is None:
+        # Finite positive values, followed by the power of two that rounds
+        # to infinity
+        special = (1 << exponent) - 1
+        values = float_decode_table(exponent, mantissa)[:special << mantissa]
+        values.append(math.ldexp(1.0, special - (1 << (exponent - 1)) + 1))
+        table = []
+        for bits in range(len(values) - 1):
+            middle = (values[bits] + values[bits + 1]) / 2
+            table.append(middle if bits & 1 else float_next(middle))
+        _float_encode_tables[exponent, mantissa] = table
+    return table
+
 # Operators
 def op_unary(value, op):
     exponent = value.e
@@ -46,16 +165,17 @@ def op_relational(lhs, rhs, op):
 
 # Native Float
 class nfloat(object):
-    def __init__(self, value=0.0, exponent=8, mantissa=23):
-        assert exponent <= 11, 'Support up to float64 only'
-        assert mantissa <= 52, 'Support up to float64 only'
-        self.e = exponent
-        self.m = mantissa
-        # Value
-        self.vs = nint(bits=1)
-        self.ve = nint(bits=exponent, signed=False)
-        self.vm = nint(bits=mantissa, signed=False)
+    # Instances only store the packed bit pattern, the format is per-class
+    __slots__ = ('v',)
+    e = 8
+    m = 23
+
+    def __new__(cls, value=0.0, exponent=8, mantissa=23):
+        if cls is nfloat:
+            cls = nfloat_class(exponent, mantissa)
+        self = allocate(cls)
         self.set(value)
+        return self
 
     # Bytes conversion
     @staticmethod
@@ -63,40 +183,41 @@ class nfloat(object):
         bits = 1 + exponent + mantissa
         value = int(nint.from_bytes(data, byteorder, bits=bits, signed=False))
         result = nfloat(0.0, exponent, mantissa)
-        result.vs.set(value >> (mantissa + exponent))
-        result.ve.set(value >> (mantissa))
-        result.vm.set(value)
+        result.set_bits(value)
         return result
 
     def to_bytes(self, byteorder):
-        value = 0
-        value |= int(self.vm)
-        value |= int(self.ve) << (self.m)
-        value |= int(self.vs) << (self.m + self.e)
         bits = 1 + self.e + self.m
-        return nint(value, bits=bits, signed=False).to_bytes(byteorder)
+        return nint(self.get_bits(), bits=bits, signed=False).to_bytes(byteorder)
+
+    # Bits conversion
+    def get_bits(self):
+        return self.v
+
+    def set_bits(self, value):
+        self.v = value & ((1 << (1 + self.e + self.m)) - 1)
 
     def set(self, value):
         assert isinstance(value, float)
-        value = struct.pack('d', value)
-        value = struct.unpack('Q', value)[0]
-        self.vs.set(value >> (63))
-        # Exponent
-        ve = (value >> 52) & 0x7FF
-        if not ve:
-            self.ve.set(0)
-        else:
-            src_bits = 11
-            dst_bits = self.e
-            exp_min = - 2 ** (dst_bits - 1) + 2
-            exp_max = + 2 ** (dst_bits - 1) + 0
-            ve -= (2 ** (src_bits - 1)) - 1
-            ve = min(max(ve, exp_min), exp_max)
-            ve += (2 ** (dst_bits - 1)) - 1
-            self.ve.set(ve)
-        # Mantissa
-        self.vm.set(value >> (52 - self.m))
-        self.vm |= (value >> (51 - min(51, self.m))) & 1
+        self.v = float_encode(value, self.e, self.m)
+
+    # Frozen values
+    def freeze(self):
+        from .native_frozen import nfloat_frozen_class
+        result = allocate(nfloat_frozen_class(self.__class__))
+        result.v = self.v
+        return result
+
+    # Fields
+    @property
+    def vs(self):
+        return nint(self.v >> (self.e + self.m), bits=1)
+    @property
+    def ve(self):
+        return nint(self.v >> self.m, bits=self.e, signed=False)
+    @property
+    def vm(self):
+        return nint(self.v, bits=self.m, signed=False)
 
     def __str__(self):
         return str(float(self))
@@ -113,24 +234,7 @@ class nfloat(object):
     def __nonzero__(self):
         return bool(float(self))
     def __float__(self):
-        sign = (-1) ** self.vs.v
-        # Non-numbers
-        if self.ve == self.ve.max():
-            if self.vm == 0:
-                return float('inf') * sign
-            return float('nan')
-        denormalized = (self.ve == 0)
-        # Exponent
-        exponent = -(2 ** (self.e - 1)) + 2
-        if not denormalized:
-            exponent += self.ve.v - 1
-        # Mantissa
-        mantissa = 0.0 if denormalized else 1.0
-        for i in range(1, self.m + 1):
-            mantissa += ((self.vm.v >> (self.m - i)) & 1) * (2 ** (-i))
-        # Value
-        value = mantissa * (2 ** exponent)
-        return sign * value
+        return float_decode(self.get_bits(), self.e, self.m)
 
     def op_binary_inplace(self, value, op):
         result_float = op(float(self), float(value))
@@ -215,18 +319,75 @@ class nfloat(object):
 
 
 # Aliases
+# Types are cached by name and parameters, so that repeated definitions of
+# the same type return the same class.
+_nfloat_types = {}
+
 def nfloat_type(name, exponent, mantissa):
-    def __init__(self, value=0.0):
-        nfloat.__init__(self, value, exponent, mantissa)
+    assert exponent <= 11, 'Support up to float64 only'
+    assert mantissa <= 52, 'Support up to float64 only'
+    cls = _nfloat_types.get((name, exponent, mantissa))
+    if cls is not None:
+        return cls
     @staticmethod
     def from_bytes(data, byteorder):
         return nfloat.from_bytes(data, byteorder, exponent, mantissa)
-    return type(name, (nfloat,), {
-        "__init__": __init__,
+    cls = type(name, (nfloat,), {
+        "__slots__": (),
+        "e": exponent,
+        "m": mantissa,
         "from_bytes": from_bytes
     })
+    _nfloat_types[name, exponent, mantissa] = cls
+    if name == nfloat_name(exponent, mantissa):
+        _nfloat_classes.setdefault((exponent, mantissa), cls)
+    return cls
+
+# Canonical aliases for each format
+_nfloat_classes = {}
+
+FLOAT_NAMES = {(8, 7): 'bfloat16'}
+
+def nfloat_name(exponent, mantissa):
+    name = FLOAT_NAMES.get((exponent, mantissa))
+    if name is not None:
+        return name
+    name = FLOAT_STRUCT_CODES.get((exponent, mantissa))
+    if name is not None:
+        return 'float%d' % (1 + exponent + mantissa)
+    return 'float%d_e%dm%d' % (1 + exponent + mantissa, exponent, mantissa)
+
+def nfloat_class(exponent, mantissa):
+    cls = _nfloat_classes.get((exponent, mantissa))
+    if cls is None:
+        cls = nfloat_type(nfloat_name(exponent, mantissa), exponent, mantissa)
+    return cls
 
 # Shorthands
-float16 = nfloat_type('float16', exponent=5,  mantissa=10)
-float32 = nfloat_type('float32', exponent=8,  mantissa=23)
-float64 = nfloat_type('float64', exponent=11, mantissa=52)
+# Names such as `float32`, `bfloat16` or `float8_e4m3` are resolved by the
+# package on first access, no types are created at import time.
+NFLOAT_SHORTHANDS = ['float16', 'float32', 'float64']
+NFLOAT_ALIAS = re.compile(r'float([1-9][0-9]*)(?:_e([0-9]+)m([0-9]+))?$')
+
+def nfloat_alias(name):
+    # Returns the canonical class named `name`, or None
+    for (exponent, mantissa), alias in FLOAT_NAMES.items():
+        if name == alias:
+            return nfloat_class(exponent, mantissa)
+    match = NFLOAT_ALIAS.match(name)
+    if match is None:
+        return None
+    bits = int(match.group(1))
+    if match.group(2) is None:
+        formats = [k for k in FLOAT_STRUCT_CODES if 1 + k[0] + k[1] == bits]
+        if not formats:
+            return None
+        exponent, mantissa = formats[0]
+    else:
+        exponent = int(match.group(2))
+        mantissa = int(match.group(3))
+        if 1 + exponent + mantissa != bits or not 2 <= exponent <= 11 or not 1 <= mantissa <= 52:
+            return None
+    if name != nfloat_name(exponent, mantissa):
+        return None
+    return nfloat_class(exponent, mantissa)
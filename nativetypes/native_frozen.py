@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from .native_int import *
+from .native_float import *
+
+# Frozen integers
+# Values between -128 and 255 are interned per type when constructed, so
+# that frequent constants are allocated only once.
+NINT_INTERNED_LO = -128
+NINT_INTERNED_HI = 255
+
+def frozen_error(value):
+    raise TypeError("'%s' object is immutable" % type(value).__name__)
+
+def frozen_operand(value):
+    # Frozen integers and Python integers are compared by value, without
+    # wrapping them to a common type, so that equal values have equal
+    # hashes. Returns None for other operands, compared as native integers.
+    if isinstance(value, nint_frozen):
+        return value.v
+    if isinstance(value, int):
+        return value
+    return None
+
+class nint_frozen(nint):
+    # Instances are hashable and never modified after construction,
+    # in-place operators return new instances instead
+    __slots__ = ()
+    t = nint
+    i = []
+
+    def __new__(cls, value=0, bits=32, signed=True):
+        if cls is nint_frozen:
+            cls = nint_frozen_class(nint_class(bits, signed))
+        if isinstance(value, nint):
+            value = value.v
+        return nint_frozen_value(cls, wrap_value(value, cls))
+
+    def __eq__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__eq__(self, rhs) if value is None else self.v == value
+    def __ne__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__ne__(self, rhs) if value is None else self.v != value
+    def __lt__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__lt__(self, rhs) if value is None else self.v < value
+    def __le__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__le__(self, rhs) if value is None else self.v <= value
+    def __ge__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__ge__(self, rhs) if value is None else self.v >= value
+    def __gt__(self, rhs):
+        value = frozen_operand(rhs)
+        return nint.__gt__(self, rhs) if value is None else self.v > value
+    def __hash__(self):
+        return hash(self.v)
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        result = allocate(self.t)
+        result.v = self.v
+        return result
+
+    def set(self, value):
+        frozen_error(self)
+
+    def op_binary_inplace(self, value, op):
+        result = self.thaw().op_binary_inplace(value, op)
+        return nint_frozen_value(self.__class__, result.v)
+
+def nint_frozen_value(cls, value):
+    # Returns a frozen instance of `cls` with canonical value `value`
+    if NINT_INTERNED_LO <= value <= NINT_INTERNED_HI:
+        index = value - NINT_INTERNED_LO
+        result = cls.i[index]
+        if result is None:
+            result = allocate(cls)
+            result.v = value
+            cls.i[index] = result
+        return result
+    result = allocate(cls)
+    result.v = value
+    return result
+
+# Frozen floats
+class nfloat_frozen(nfloat):
+    __slots__ = ()
+    t = nfloat
+
+    def __new__(cls, value=0.0, exponent=8, mantissa=23):
+        if cls is nfloat_frozen:
+            cls = nfloat_frozen_class(nfloat_class(exponent, mantissa))
+        self = allocate(cls)
+        nfloat.set(self, value)
+        return self
+
+    def __hash__(self):
+        return hash(float(self))
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        result = allocate(self.t)
+        result.v = self.v
+        return result
+
+    def set(self, value):
+        frozen_error(self)
+    def set_bits(self, value):
+        frozen_error(self)
+
+    def op_binary_inplace(self, value, op):
+        result = self.thaw().op_binary_inplace(value, op)
+        frozen = allocate(self.__class__)
+        frozen.v = result.v
+        return frozen
+
+# Aliases
+_nint_frozen_classes = {}
+_nfloat_frozen_classes = {}
+
+def nint_frozen_class(cls):
+    if issubclass(cls, nint_frozen):
+        return cls
+    frozen = _nint_frozen_classes.get(cls)
+    if frozen is None:
+        @staticmethod
+        def from_bytes(data, byteorder):
+            return frozen(bytes_to_int(data, byteorder))
+        frozen = type(cls.__name__ + '_frozen', (nint_frozen,), {
+            "__slots__": (),
+            "b": cls.b,
+            "s": cls.s,
+            "m": cls.m,
+            "h": cls.h,
+            "n": cls.n,
+            "lo": cls.lo,
+            "hi": cls.hi,
+            "t": cls,
+            "i": [None] * (NINT_INTERNED_HI - NINT_INTERNED_LO + 1),
+            "from_bytes": from_bytes
+        })
+        _nint_frozen_classes[cls] = frozen
+    return frozen
+
+def nfloat_frozen_class(cls):
+    if issubclass(cls, nfloat_frozen):
+        return cls
+    frozen = _nfloat_frozen_classes.get(cls)
+    if frozen is None:
+        @staticmethod
+        def from_bytes(data, byteorder):
+            result = allocate(frozen)
+            result.v = bytes_to_int(data, byteorder) & ((1 << (1 + cls.e + cls.m)) - 1)
+            return result
+        frozen = type(cls.__name__ + '_frozen', (nfloat_frozen,), {
+            "__slots__": (),
+            "e": cls.e,
+            "m": cls.m,
+            "t": cls,
+            "from_bytes": from_bytes
+        })
+        _nfloat_frozen_classes[cls] = frozen
+    return frozen
@@ -5,17 +5,44 @@ Native types.
 """
 
 import operator
+import re
 import sys
 
+# Allocation hook, every nint and nfloat instance is created through it
+allocate = object.__new__
+
+# Bytes conversion
+if sys.version_info[0] < 3:
+    def bytes_to_int(data, byteorder):
+        if byteorder == 'little':
+            data = data[::-1]
+        return int(data.encode('hex'), 16)
+
+    def int_to_bytes(value, length, byteorder, signed):
+        data = '%x' % (value & ((1 << (length * 8)) - 1))
+        data = ('0' * (len(data) % 2) + data)
+        data = data.zfill(length * 2).decode('hex')
+        if byteorder == 'little':
+            data = data[::-1]
+        return data
+else:
+    def bytes_to_int(data, byteorder):
+        return int.from_bytes(data, byteorder)
+
+    def int_to_bytes(value, length, byteorder, signed):
+        return value.to_bytes(length, byteorder, signed=signed)
+
 # Helpers
 def get_value(value, bits, signed):
     if isinstance(value, nint):
         value = value.v
-    mask = 2**bits - 1
-    if signed and value & (1 << (bits - 1)):
-        return value | ~mask
+    return wrap_value(value, nint_class(bits, signed))
+
+def wrap_value(value, cls):
+    if cls.s and value & cls.h:
+        return value | cls.n
     else:
-        return value & mask
+        return value & cls.m
 
 def ensure_native(lhs, rhs):
     assert isinstance(lhs, nint) or isinstance(rhs, nint)
@@ -31,101 +58,426 @@ def promote_bits(lhs, rhs):
 def promote_signed(lhs, rhs):
     return lhs.s & rhs.s
 
+def promote_type(lhs, rhs):
+    # Result type of an operation between two native types. Operand types
+    # are preserved if they already have the promoted width and signedness.
+    cls = _nint_promotions.get((lhs, rhs))
+    if cls is None:
+        bits = promote_bits(lhs, rhs)
+        signed = promote_signed(lhs, rhs)
+        if lhs.b == bits and lhs.s == signed:
+            cls = lhs
+        elif rhs.b == bits and rhs.s == signed:
+            cls = rhs
+        else:
+            cls = nint_class(bits, signed)
+        _nint_promotions[(lhs, rhs)] = cls
+    return cls
+
+_nint_promotions = {}
+
 # Helpers
 def op_div(lhs, rhs):
     return int(operator.truediv(lhs, rhs))
 def op_mod(lhs, rhs):
     return lhs - op_div(lhs, rhs) * rhs
 
+op_shifts = (operator.__lshift__, operator.__rshift__)
+
 # Operators
 def op_unary(value, op):
-    bits = value.b
-    signed = value.s
-    result = op(get_value(value, bits, signed))
-    return nint(result, bits, signed)
+    cls = value.__class__
+    result = allocate(cls)
+    result.v = wrap_value(op(value.v), cls)
+    return result
 
-def op_binary(lhs, rhs, op):
+def op_operands(lhs, rhs):
+    # Python integers take the type of the native operand, masked inline
+    if isinstance(rhs, int):
+        cls = lhs.__class__
+        return cls, lhs.v, wrap_value(rhs, cls)
+    if isinstance(lhs, int):
+        cls = rhs.__class__
+        return cls, wrap_value(lhs, cls), rhs.v
     lhs, rhs = ensure_native(lhs, rhs)
-    bits = promote_bits(lhs, rhs)
-    signed = promote_signed(lhs, rhs)
-    result = op(
-        get_value(lhs, bits, signed),
-        get_value(rhs, bits, signed))
-    return nint(result, bits, signed)
+    cls = promote_type(lhs.__class__, rhs.__class__)
+    lhs = lhs.v if lhs.__class__ is cls else wrap_value(lhs.v, cls)
+    rhs = rhs.v if rhs.__class__ is cls else wrap_value(rhs.v, cls)
+    return cls, lhs, rhs
+
+def op_binary(lhs, rhs, op):
+    cls, lhs, rhs = op_operands(lhs, rhs)
+    result = allocate(cls)
+    result.v = wrap_value(op(lhs, rhs), cls)
+    return result
 
 def op_relational(lhs, rhs, op):
-    lhs, rhs = ensure_native(lhs, rhs)
-    bits = promote_bits(lhs, rhs)
-    signed = promote_signed(lhs, rhs)
-    return op(
-        get_value(lhs, bits, signed),
-        get_value(rhs, bits, signed))
+    cls, lhs, rhs = op_operands(lhs, rhs)
+    return op(lhs, rhs)
+
+def op_shift_operands(lhs, rhs):
+    # Shift amounts are reduced as in __lshift__/__rlshift__, which convert
+    # them modulo the width of the native operand
+    if isinstance(lhs, nint):
+        if not isinstance(rhs, nint):
+            return op_operands(lhs, rhs % lhs.b)
+        cls = rhs.__class__
+        rhs = wrap_value(op_mod(rhs.v, wrap_value(lhs.b, cls)), cls)
+        cls = promote_type(lhs.__class__, cls)
+        return cls, wrap_value(lhs.v, cls), wrap_value(rhs, cls)
+    cls = rhs.__class__
+    rhs = wrap_value(op_mod(rhs.v, wrap_value(rhs.b, cls)), cls)
+    return cls, wrap_value(lhs, cls), rhs
+
+# Assignments
+# Results are written into an existing instance `dst`, converted to its type
+def op_store(dst, cls, value):
+    if cls is not dst.__class__:
+        value = wrap_value(value, cls)
+    dst.set(value)
+    return dst
+
+def op_assign_unary(dst, value, op):
+    return op_store(dst, value.__class__, op(value.v))
+
+def op_assign_binary(dst, lhs, rhs, op):
+    if op in op_shifts:
+        cls, lhs, rhs = op_shift_operands(lhs, rhs)
+    else:
+        cls, lhs, rhs = op_operands(lhs, rhs)
+    return op_store(dst, cls, op(lhs, rhs))
+
+def op_assign_fused(dst, lhs, rhs, value, inner, outer):
+    # Same result as outer(inner(lhs, rhs), value), where outer only depends
+    # on the low bits of its operands
+    if inner in op_shifts:
+        cls, lhs, rhs = op_shift_operands(lhs, rhs)
+    else:
+        cls, lhs, rhs = op_operands(lhs, rhs)
+    result = inner(lhs, rhs)
+    if isinstance(value, nint):
+        promoted = promote_type(cls, value.__class__)
+        if promoted.b > cls.b:
+            result = wrap_value(result, cls)
+        cls = promoted
+        value = value.v
+    return op_store(dst, cls, outer(result, value))
+
+# Intrinsics
+# Computed on the unsigned bits of a value, `value & cls.m`
+if hasattr(int, 'bit_count'):
+    def bits_popcount(value):
+        return value.bit_count()
+else:
+    def bits_popcount(value):
+        return bin(value).count('1')
+
+def bits_run(mask):
+    # Position and length of the lowest run of set bits in `mask`
+    low = (mask & -mask).bit_length() - 1
+    run = mask >> low
+    return low, (~run & (run + 1)).bit_length() - 1
+
+def bits_extract(value, mask):
+    # Gathers the bits of `value` selected by `mask` into the low bits
+    result = 0
+    shift = 0
+    while mask:
+        low, length = bits_run(mask)
+        result |= ((value >> low) & ((1 << length) - 1)) << shift
+        shift += length
+        mask &= ~(((1 << length) - 1) << low)
+    return result
+
+def bits_deposit(value, mask):
+    # Scatters the low bits of `value` into the bits selected by `mask`
+    result = 0
+    while mask:
+        low, length = bits_run(mask)
+        result |= (value & ((1 << length) - 1)) << low
+        value >>= length
+        mask &= ~(((1 << length) - 1) << low)
+    return result
+
+def op_intrinsic(value, result):
+    return op_intrinsic_type(value.__class__, result)
+
+def op_intrinsic_type(cls, result):
+    value = allocate(cls)
+    value.v = wrap_value(result, cls)
+    return value
+
+# Flags
+# Flags are combined into a single integer, using the x86 EFLAGS positions.
+# Carries and borrows are computed from the unsigned bits of the operands,
+# overflows from their signed interpretation, regardless of signedness.
+FLAG_CF = 0x0001
+FLAG_ZF = 0x0040
+FLAG_SF = 0x0080
+FLAG_OF = 0x0800
+
+def flags_result(cls, result, carry, overflow):
+    # Returns the wrapped result and its flags, given its unsigned bits
+    sign = result >> (cls.b - 1)
+    flags = carry | (sign << 7) | (overflow << 11)
+    if not result:
+        flags |= FLAG_ZF
+    value = allocate(cls)
+    value.v = result | cls.n if cls.s and sign else result
+    return value, flags
+
+def flags_add(lhs, rhs, carry):
+    cls, lhs, rhs = op_operands(lhs, rhs)
+    mask = cls.m
+    lhs &= mask
+    rhs &= mask
+    value = lhs + rhs + carry
+    result = value & mask
+    overflow = ((lhs ^ result) & (rhs ^ result)) >> (cls.b - 1)
+    return flags_result(cls, result, value >> cls.b, overflow)
+
+def flags_sub(lhs, rhs, borrow):
+    cls, lhs, rhs = op_operands(lhs, rhs)
+    mask = cls.m
+    lhs &= mask
+    rhs &= mask
+    value = lhs - rhs - borrow
+    result = value & mask
+    overflow = ((lhs ^ rhs) & (lhs ^ result)) >> (cls.b - 1)
+    return flags_result(cls, result, int(value < 0), overflow)
+
+# Limbs
+# Multi-limb integers are sequences of native values, least significant
+# limb first, processed as a single Python integer
+def limbs_type(lhs, rhs):
+    for lhs_limb, rhs_limb in zip(lhs, rhs):
+        if isinstance(lhs_limb, nint) and isinstance(rhs_limb, nint):
+            return promote_type(lhs_limb.__class__, rhs_limb.__class__)
+        if isinstance(lhs_limb, nint):
+            return lhs_limb.__class__
+        if isinstance(rhs_limb, nint):
+            return rhs_limb.__class__
+    raise TypeError('Limbs require a native integer type')
+
+def limbs_value(limbs, cls):
+    value = 0
+    for limb in reversed(limbs):
+        value = (value << cls.b) | (int(limb) & cls.m)
+    return value
+
+def limbs_split(value, cls, count):
+    limbs = []
+    for i in range(count):
+        limbs.append(op_intrinsic_type(cls, value & cls.m))
+        value >>= cls.b
+    return limbs
+
+def limbs_operands(lhs, rhs):
+    assert len(lhs) == len(rhs), 'Limb counts must match'
+    cls = limbs_type(lhs, rhs)
+    return cls, limbs_value(lhs, cls), limbs_value(rhs, cls)
 
 # Native Integer
 class nint(object):
-    def __init__(self, value=0, bits=32, signed=True):
-        assert bits >= 1, 'Support down to int1 only'
-        self.b = bits
-        self.s = signed
-        self.m = (1 << bits) - 1
+    # Instances only store the value, the type constants are per-class:
+    # bits (b), signedness (s), mask (m), sign bit (h), sign extension (n),
+    # minimum (lo) and maximum (hi) values.
+    __slots__ = ('v',)
+    b = 32
+    s = True
+    m = (1 << 32) - 1
+    h = 1 << 31
+    n = ~((1 << 32) - 1)
+    lo = -(1 << 31)
+    hi = (1 << 31) - 1
+
+    def __new__(cls, value=0, bits=32, signed=True):
+        if cls is nint:
+            cls = nint_class(bits, signed)
+        self = allocate(cls)
         self.set(value)
+        return self
 
     # Bytes conversion
     @staticmethod
     def from_bytes(data, byteorder, bits, signed):
-        if sys.version_info[0] < 3:
-            if byteorder == 'little':
-                data = data[::-1]
-            value = int(data.encode('hex'), 16)
-        else:
-            value = int.from_bytes(data, byteorder)
-        return nint(value, bits, signed)
+        return nint(bytes_to_int(data, byteorder), bits, signed)
 
     def to_bytes(self, byteorder):
         length = (self.b + 7) // 8
-        if sys.version_info[0] < 3:
-            data = '%x' % int(self)
-            data = ('0' * (len(data) % 2) + data)
-            data = data.zfill(length * 2).decode('hex')
-            if byteorder == 'little':
-                data = data[::-1]
-            return data
-        else:
-            return int(self).to_bytes(length, byteorder, signed=self.s)
+        return int_to_bytes(self.v, length, byteorder, self.s)
+
+    # Buffer conversion
+    @classmethod
+    def from_buffer(cls, buf, byteorder, offset=0, count=None):
+        from .native_array import nint_array
+        return nint_array.from_buffer(buf, byteorder, cls.b, cls.s, offset, count)
+
+    @classmethod
+    def iter_from_buffer(cls, buf, byteorder, offset=0, count=None):
+        from .native_array import nint_array
+        return nint_array.iter_from_buffer(buf, byteorder, cls.b, cls.s, offset, count)
+
+    @classmethod
+    def pack_into(cls, buf, offset, values, byteorder):
+        from .native_array import nint_array
+        nint_array(values, cls.b, cls.s).pack_into(buf, offset, byteorder)
+
+    # Frozen values
+    def freeze(self):
+        from .native_frozen import nint_frozen_class, nint_frozen_value
+        return nint_frozen_value(nint_frozen_class(self.__class__), self.v)
+
+    # Lazy evaluation
+    def lazy(self):
+        from .native_lazy import nint_lazy_class
+        result = allocate(nint_lazy_class(self.__class__))
+        result.r = self.v
+        result.d = self.b
+        return result
 
     def set(self, value):
-        if self.s and value & (1 << (self.b - 1)):
-            self.v = value | ~self.m
+        if self.s and value & self.h:
+            self.v = value | self.n
         else:
             self.v = value & self.m
 
     def op_binary_inplace(self, value, op):
-        result = op(self.v, value)
-        if isinstance(result, int):
-            self.set(result)
+        if isinstance(value, nint):
+            # Same result as op(self.v, value), without the temporary
+            if op in op_shifts:
+                cls, lhs, rhs = op_shift_operands(self.v, value)
+            else:
+                cls = value.__class__
+                lhs = wrap_value(self.v, cls)
+                rhs = value.v
+            result = wrap_value(op(lhs, rhs), cls)
         else:
-            self.set(result.v)
+            result = op(self.v, value)
+            if not isinstance(result, int):
+                result = result.v
+        self.set(result)
         return self
 
     # Utilities
     def min(self):
-        return -(2 ** (self.b - 1)) * int(self.s)
+        return self.lo
 
     def max(self):
-        return (2 ** (self.b - int(self.s))) - 1
+        return self.hi
+
+    # Intrinsics
+    # Results have the type of the value, counts are Python integers
+    def rotl(self, shift):
+        bits = self.b
+        value = self.v & self.m
+        shift = int(shift) % bits
+        return op_intrinsic(self, (value << shift) | (value >> (bits - shift)))
+
+    def rotr(self, shift):
+        bits = self.b
+        value = self.v & self.m
+        shift = int(shift) % bits
+        return op_intrinsic(self, (value >> shift) | (value << (bits - shift)))
+
+    def bswap(self):
+        assert self.b % 8 == 0, 'Byte swaps require a whole number of bytes'
+        data = (self.v & self.m).to_bytes(self.b // 8, 'little')
+        return op_intrinsic(self, int.from_bytes(data, 'big'))
+
+    def popcount(self):
+        return bits_popcount(self.v & self.m)
+
+    def parity(self):
+        return bits_popcount(self.v & self.m) & 1
+
+    def clz(self):
+        return self.b - (self.v & self.m).bit_length()
+
+    def ctz(self):
+        value = self.v & self.m
+        if not value:
+            return self.b
+        return (value & -value).bit_length() - 1
+
+    def pext(self, mask):
+        return op_intrinsic(self, bits_extract(self.v & self.m, int(mask) & self.m))
+
+    def pdep(self, mask):
+        return op_intrinsic(self, bits_deposit(self.v & self.m, int(mask) & self.m))
+
+    # Flags
+    # Return the result and its flags, see FLAG_CF, FLAG_ZF, FLAG_SF, FLAG_OF
+    def add_with_flags(self, rhs, carry_in=0):
+        return flags_add(self, rhs, int(carry_in) & 1)
+
+    def sub_with_flags(self, rhs, borrow_in=0):
+        return flags_sub(self, rhs, int(borrow_in) & 1)
+
+    def shl_with_flags(self, shift):
+        # Carry is the last bit shifted out, overflow is set if the sign
+        # bit differs from it, as for x86 shifts by one
+        bits = self.b
+        value = self.v & self.m
+        shift = int(shift)
+        result = (value << shift) & self.m
+        carry = (value >> (bits - shift)) & 1 if 0 < shift <= bits else 0
+        overflow = ((result >> (bits - 1)) ^ carry) if shift else 0
+        return flags_result(self.__class__, result, carry, overflow)
+
+    def shr_with_flags(self, shift):
+        # Shifts are arithmetic for signed types, overflow is set for
+        # logical shifts of values with the sign bit set, as for x86 shifts
+        # by one
+        bits = self.b
+        value = self.v if self.s else self.v & self.m
+        shift = int(shift)
+        result = (value >> shift) & self.m
+        carry = (value >> (shift - 1)) & 1 if shift > 0 else 0
+        overflow = ((self.v & self.m) >> (bits - 1)) if shift and not self.s else 0
+        return flags_result(self.__class__, result, carry, overflow)
+
+    @staticmethod
+    def add_limbs(lhs, rhs, carry_in=0):
+        # Returns the limbs of lhs + rhs + carry_in, and the carry out
+        cls, lhs_value, rhs_value = limbs_operands(lhs, rhs)
+        value = lhs_value + rhs_value + (int(carry_in) & 1)
+        return limbs_split(value, cls, len(lhs)), value >> (cls.b * len(lhs))
+
+    @staticmethod
+    def sub_limbs(lhs, rhs, borrow_in=0):
+        # Returns the limbs of lhs - rhs - borrow_in, and the borrow out
+        cls, lhs_value, rhs_value = limbs_operands(lhs, rhs)
+        value = lhs_value - rhs_value - (int(borrow_in) & 1)
+        return limbs_split(value, cls, len(lhs)), int(value < 0)
 
     # Slicing
     def __getitem__(self, key):
         if isinstance(key, int):
             assert 0 <= key < self.b
-            return bool((int(self) >> key) & 1)
+            return bool((self.v >> key) & 1)
         if isinstance(key, slice):
-            assert 0 <= key.start < self.b
-            assert 0 <= key.stop <= self.b
-            assert key.start < key.stop
-            bits = key.stop - key.start
-            value = int(self) >> key.start
-            return nint(value, bits, signed=False)
+            start = key.start
+            stop = key.stop
+            assert 0 <= start < stop <= self.b
+            cls = nint_class(stop - start, False)
+            result = allocate(cls)
+            result.v = (self.v >> start) & cls.m
+            return result
+
+    def __setitem__(self, key, value):
+        if isinstance(key, int):
+            assert 0 <= key < self.b
+            if value:
+                self.set(self.v | (1 << key))
+            else:
+                self.set(self.v & ~(1 << key))
+        elif isinstance(key, slice):
+            start = key.start
+            stop = key.stop
+            assert 0 <= start < stop <= self.b
+            mask = ((1 << (stop - start)) - 1) << start
+            self.set((self.v & ~mask) | ((int(value) << start) & mask))
 
     # Conversion operations
     def __str__(self):
@@ -241,6 +593,102 @@ class nint(object):
     def __irshift__(self, v):
         return self.op_binary_inplace(v % self.b, operator.__rshift__)
 
+    # Assignment operations
+    # Store the result of an operation into this instance, without
+    # allocating, e.g. `dst.assign_add(a, b)` for `dst = type(dst)(a + b)`
+    def assign_abs(self, value):
+        return op_assign_unary(self, value, operator.__abs__)
+    def assign_pos(self, value):
+        return op_assign_unary(self, value, operator.__pos__)
+    def assign_neg(self, value):
+        return op_assign_unary(self, value, operator.__neg__)
+    def assign_invert(self, value):
+        return op_assign_unary(self, value, operator.__invert__)
+    def assign_add(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__add__)
+    def assign_sub(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__sub__)
+    def assign_mul(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__mul__)
+    def assign_div(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, op_div)
+    def assign_mod(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, op_mod)
+    def assign_pow(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__pow__)
+    def assign_and(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__and__)
+    def assign_or(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__or__)
+    def assign_xor(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__xor__)
+    def assign_lshift(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__lshift__)
+    def assign_rshift(self, lhs, rhs):
+        return op_assign_binary(self, lhs, rhs, operator.__rshift__)
+
+    # Fused assignment operations
+    def assign_muladd(self, a, b, c):
+        # a * b + c, e.g. linear congruential generators
+        return op_assign_fused(self, a, b, c, operator.__mul__, operator.__add__)
+    def assign_xormul(self, a, b, c):
+        # (a ^ b) * c, e.g. FNV-1a hashes
+        return op_assign_fused(self, a, b, c, operator.__xor__, operator.__mul__)
+    def assign_xorshl(self, a, b):
+        # a ^ (a << b), e.g. xorshift generators
+        return op_assign_fused(self, a, b, a, operator.__lshift__, operator.__xor__)
+    def assign_xorshr(self, a, b):
+        # a ^ (a >> b), e.g. xorshift generators
+        return op_assign_fused(self, a, b, a, operator.__rshift__, operator.__xor__)
+
+    # Functional operations
+    # Return a new instance, or store the result into `out` if provided
+    @staticmethod
+    def abs(value, out=None):
+        return abs(value) if out is None else out.assign_abs(value)
+    @staticmethod
+    def pos(value, out=None):
+        return +value if out is None else out.assign_pos(value)
+    @staticmethod
+    def neg(value, out=None):
+        return -value if out is None else out.assign_neg(value)
+    @staticmethod
+    def invert(value, out=None):
+        return ~value if out is None else out.assign_invert(value)
+    @staticmethod
+    def add(lhs, rhs, out=None):
+        return lhs + rhs if out is None else out.assign_add(lhs, rhs)
+    @staticmethod
+    def sub(lhs, rhs, out=None):
+        return lhs - rhs if out is None else out.assign_sub(lhs, rhs)
+    @staticmethod
+    def mul(lhs, rhs, out=None):
+        return lhs * rhs if out is None else out.assign_mul(lhs, rhs)
+    @staticmethod
+    def div(lhs, rhs, out=None):
+        return lhs // rhs if out is None else out.assign_div(lhs, rhs)
+    @staticmethod
+    def mod(lhs, rhs, out=None):
+        return lhs % rhs if out is None else out.assign_mod(lhs, rhs)
+    @staticmethod
+    def pow(lhs, rhs, out=None):
+        return lhs ** rhs if out is None else out.assign_pow(lhs, rhs)
+    @staticmethod
+    def and_(lhs, rhs, out=None):
+        return lhs & rhs if out is None else out.assign_and(lhs, rhs)
+    @staticmethod
+    def or_(lhs, rhs, out=None):
+        return lhs | rhs if out is None else out.assign_or(lhs, rhs)
+    @staticmethod
+    def xor(lhs, rhs, out=None):
+        return lhs ^ rhs if out is None else out.assign_xor(lhs, rhs)
+    @staticmethod
+    def lshift(lhs, rhs, out=None):
+        return lhs << rhs if out is None else out.assign_lshift(lhs, rhs)
+    @staticmethod
+    def rshift(lhs, rhs, out=None):
+        return lhs >> rhs if out is None else out.assign_rshift(lhs, rhs)
+
     # Boolean operations
     def __eq__(self, rhs):
         return op_relational(self, rhs, operator.__eq__)
@@ -256,24 +704,93 @@ class nint(object):
         return op_relational(self, rhs, operator.__gt__)
 
 
+# Bitfields
+# Descriptors for bits start to stop (exclusive) of nint subclasses, e.g.
+# `mode = bitfield(3, 7)`. Single bits are booleans, other fields native
+# integers of their width.
+class bitfield(object):
+    def __init__(self, start, stop=None, signed=False):
+        if stop is None:
+            stop = start + 1
+            self.t = None
+        else:
+            self.t = nint_class(stop - start, signed)
+        assert 0 <= start < stop
+        self.start = start
+        self.stop = stop
+        self.m = (1 << (stop - start)) - 1
+        self.clear_mask = ~(self.m << start)
+
+    def __set_name__(self, owner, name):
+        if issubclass(owner, nint):
+            assert self.stop <= owner.b, 'Bitfield %r exceeds the width of %r' % (name, owner.__name__)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = (instance.v >> self.start) & self.m
+        cls = self.t
+        if cls is None:
+            return bool(value)
+        result = allocate(cls)
+        result.v = value | cls.n if cls.s and value & cls.h else value
+        return result
+
+    def __set__(self, instance, value):
+        value = int(bool(value)) if self.t is None else int(value) & self.m
+        instance.set((instance.v & self.clear_mask) | (value << self.start))
+
 # Aliases
+# Types are cached by name and parameters, so that repeated definitions of
+# the same type return the same class.
+_nint_types = {}
+
 def nint_type(name, bits, signed):
-    def __init__(self, value=0):
-        nint.__init__(self, value, bits, signed)
+    assert bits >= 1, 'Support down to int1 only'
+    cls = _nint_types.get((name, bits, signed))
+    if cls is not None:
+        return cls
     @staticmethod
     def from_bytes(data, byteorder):
         return nint.from_bytes(data, byteorder, bits, signed)
-    return type(name, (nint,), {
-        "__init__": __init__,
+    mask = (1 << bits) - 1
+    cls = type(name, (nint,), {
+        "__slots__": (),
+        "b": bits,
+        "s": signed,
+        "m": mask,
+        "h": 1 << (bits - 1),
+        "n": ~mask,
+        "lo": -(1 << (bits - 1)) if signed else 0,
+        "hi": (1 << (bits - int(signed))) - 1,
         "from_bytes": from_bytes
     })
+    _nint_types[name, bits, signed] = cls
+    if name == nint_name(bits, signed):
+        _nint_classes.setdefault((bits, signed), cls)
+    return cls
+
+# Canonical aliases for each width and signedness
+_nint_classes = {}
+
+def nint_name(bits, signed):
+    return '%sint%d' % ('' if signed else 'u', bits)
+
+def nint_class(bits, signed):
+    cls = _nint_classes.get((bits, signed))
+    if cls is None:
+        cls = nint_type(nint_name(bits, signed), bits, signed)
+    return cls
 
 # Shorthands
-int8   = nint_type('int8',   bits=8,  signed=True)
-int16  = nint_type('int16',  bits=16, signed=True)
-int32  = nint_type('int32',  bits=32, signed=True)
-int64  = nint_type('int64',  bits=64, signed=True)
-uint8  = nint_type('uint8',  bits=8,  signed=False)
-uint16 = nint_type('uint16', bits=16, signed=False)
-uint32 = nint_type('uint32', bits=32, signed=False)
-uint64 = nint_type('uint64', bits=64, signed=False)
+# Names such as `int8` or `uint24` are resolved by the package on first
+# access, no types are created at import time.
+NINT_SHORTHANDS = ['int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64']
+NINT_ALIAS = re.compile(r'(u?)int([1-9][0-9]*)$')
+
+def nint_alias(name):
+    # Returns the canonical class named `name`, or None
+    match = NINT_ALIAS.match(name)
+    if match is None:
+        return None
+    return nint_class(int(match.group(2)), not match.group(1))
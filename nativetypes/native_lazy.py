@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import operator
+
+from .native_int import *
+
+# Lazy integers
+# The raw value (r) of a lazy integer is only congruent to its canonical value
+# modulo 2**bits. Operations that never look at the high bits (+, -, *, &, |,
+# ^, ~, <<) work on raw values, so intermediates are neither masked nor
+# sign-extended. Raw values are reduced once their bit length bound (d)
+# exceeds a limit, other operations use the canonical value (v).
+LAZY_BITS = 256
+
+def lazy_operand(value, cls):
+    # Returns a raw value of `value` for the type `cls`, and its bit bound
+    if isinstance(value, nint_lazy):
+        if value.b == cls.b:
+            return value.r, value.d
+        return wrap_value(value.r, value), value.b
+    return value.v, value.b
+
+def lazy_operands(lhs, rhs):
+    if isinstance(rhs, int):
+        cls = lhs.__class__
+        return cls, lhs.r, lhs.d, rhs & cls.m, cls.b
+    if isinstance(lhs, int):
+        cls = rhs.__class__
+        return cls, lhs & cls.m, cls.b, rhs.r, rhs.d
+    lhs, rhs = ensure_native(lhs, rhs)
+    ltype = lhs.t if isinstance(lhs, nint_lazy) else lhs.__class__
+    rtype = rhs.t if isinstance(rhs, nint_lazy) else rhs.__class__
+    cls = nint_lazy_class(promote_type(ltype, rtype))
+    lhs, lbits = lazy_operand(lhs, cls)
+    rhs, rbits = lazy_operand(rhs, cls)
+    return cls, lhs, lbits, rhs, rbits
+
+def lazy_result(cls, value, bits):
+    if bits > cls.x:
+        value &= cls.m
+        bits = cls.b
+    result = allocate(cls)
+    result.r = value
+    result.d = bits
+    return result
+
+def lazy_add(lhs, rhs, op):
+    cls, lhs, lbits, rhs, rbits = lazy_operands(lhs, rhs)
+    return lazy_result(cls, op(lhs, rhs), max(lbits, rbits) + 1)
+
+def lazy_mul(lhs, rhs):
+    cls, lhs, lbits, rhs, rbits = lazy_operands(lhs, rhs)
+    return lazy_result(cls, lhs * rhs, lbits + rbits)
+
+def lazy_bitwise(lhs, rhs, op):
+    cls, lhs, lbits, rhs, rbits = lazy_operands(lhs, rhs)
+    return lazy_result(cls, op(lhs, rhs), max(lbits, rbits))
+
+lazy_ops = (
+    operator.__add__,
+    operator.__sub__,
+    operator.__mul__,
+    operator.__and__,
+    operator.__or__,
+    operator.__xor__,
+)
+
+# Lazy Native Integer
+# Operations that need canonical values are inherited from nint, and read
+# them through the `v` property.
+class nint_lazy(nint):
+    __slots__ = ('r', 'd')
+    t = nint
+    x = LAZY_BITS
+
+    @property
+    def v(self):
+        return wrap_value(self.r, self.__class__)
+    @v.setter
+    def v(self, value):
+        self.r = value
+        self.d = self.b
+
+    def lazy(self):
+        return self
+
+    def eval(self):
+        cls = self.t
+        result = allocate(cls)
+        result.v = wrap_value(self.r, cls)
+        return result
+
+    def op_binary_inplace(self, value, op):
+        # Same result as nint, without reducing the stored value
+        if op in lazy_ops and isinstance(value, (int, nint)):
+            if isinstance(value, int):
+                lhs, lbits = self.r, self.d
+                rhs, rbits = value & self.m, self.b
+                result = op(lhs, rhs)
+            else:
+                cls = value.__class__
+                lhs, lbits = lazy_operand(self, cls)
+                rhs, rbits = lazy_operand(value, cls)
+                result = op(lhs, rhs)
+                if cls.b < self.b:
+                    result = wrap_value(result, cls)
+                    lbits = rbits = cls.b
+            if op is operator.__mul__:
+                bits = lbits + rbits
+            elif op is operator.__add__ or op is operator.__sub__:
+                bits = max(lbits, rbits) + 1
+            else:
+                bits = max(lbits, rbits)
+        elif op is operator.__lshift__ and isinstance(value, int):
+            result = self.r << value
+            bits = self.d + value
+        else:
+            return nint.op_binary_inplace(self, value, op)
+        if bits > self.x:
+            result &= self.m
+            bits = self.b
+        self.r = result
+        self.d = bits
+        return self
+
+    # Unary operations
+    def __pos__(self):
+        return lazy_result(self.__class__, self.r, self.d)
+    def __neg__(self):
+        return lazy_result(self.__class__, -self.r, self.d)
+    def __invert__(self):
+        return lazy_result(self.__class__, ~self.r, self.d + 1)
+
+    # Binary operations
+    # Python integers and lazy values of the same type are handled inline,
+    # other operands go through lazy_operands.
+    def __add__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r + (rhs & cls.m), self.d + 1)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r + rhs.r, max(self.d, rhs.d) + 1)
+        return lazy_add(self, rhs, operator.__add__)
+    def __sub__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r - (rhs & cls.m), self.d + 1)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r - rhs.r, max(self.d, rhs.d) + 1)
+        return lazy_add(self, rhs, operator.__sub__)
+    def __mul__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r * (rhs & cls.m), self.d + cls.b)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r * rhs.r, self.d + rhs.d)
+        return lazy_mul(self, rhs)
+    def __and__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r & (rhs & cls.m), cls.b)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r & rhs.r, max(self.d, rhs.d))
+        return lazy_bitwise(self, rhs, operator.__and__)
+    def __or__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r | (rhs & cls.m), self.d)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r | rhs.r, max(self.d, rhs.d))
+        return lazy_bitwise(self, rhs, operator.__or__)
+    def __xor__(self, rhs):
+        cls = self.__class__
+        if isinstance(rhs, int):
+            return lazy_result(cls, self.r ^ (rhs & cls.m), self.d)
+        if rhs.__class__ is cls:
+            return lazy_result(cls, self.r ^ rhs.r, max(self.d, rhs.d))
+        return lazy_bitwise(self, rhs, operator.__xor__)
+    def __lshift__(self, rhs):
+        if isinstance(rhs, int):
+            rhs %= self.b
+            return lazy_result(self.__class__, self.r << rhs, self.d + rhs)
+        return nint.__lshift__(self, rhs)
+    def __rshift__(self, rhs):
+        if isinstance(rhs, int):
+            cls = self.__class__
+            result = allocate(cls)
+            result.r = wrap_value(self.r, cls) >> (rhs % cls.b)
+            result.d = cls.b
+            return result
+        return nint.__rshift__(self, rhs)
+
+    # Reflected binary operation
+    def __radd__(self, lhs):
+        if isinstance(lhs, int):
+            return lazy_result(self.__class__, (lhs & self.m) + self.r, self.d + 1)
+        return lazy_add(lhs, self, operator.__add__)
+    def __rsub__(self, lhs):
+        if isinstance(lhs, int):
+            return lazy_result(self.__class__, (lhs & self.m) - self.r, self.d + 1)
+        return lazy_add(lhs, self, operator.__sub__)
+    def __rmul__(self, lhs):
+        if isinstance(lhs, int):
+            return lazy_result(self.__class__, (lhs & self.m) * self.r, self.d + self.b)
+        return lazy_mul(lhs, self)
+    def __rand__(self, lhs):
+        return lazy_bitwise(lhs, self, operator.__and__)
+    def __ror__(self, lhs):
+        return lazy_bitwise(lhs, self, operator.__or__)
+    def __rxor__(self, lhs):
+        return lazy_bitwise(lhs, self, operator.__xor__)
+
+# Aliases
+_nint_lazy_classes = {}
+
+def nint_lazy_class(cls):
+    if issubclass(cls, nint_lazy):
+        return cls
+    lazy = _nint_lazy_classes.get(cls)
+    if lazy is None:
+        lazy = type(cls.__name__ + '_lazy', (nint_lazy,), {
+            "__slots__": (),
+            "b": cls.b,
+            "s": cls.s,
+            "m": cls.m,
+            "h": cls.h,
+            "n": cls.n,
+            "lo": cls.lo,
+            "hi": cls.hi,
+            "t": cls,
+            "x": max(LAZY_BITS, 4 * cls.b),
+        })
+        _nint_lazy_classes[cls] = lazy
+    return lazy
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import struct
+
+from .native_int import *
+from .native_float import *
+from .native_array import *
+
+# Accessors
+# Values are read and written in place with a precompiled struct, addresses
+# are byte offsets into the underlying buffer.
+class nmemory_accessor(object):
+    __slots__ = ('buf', 'byteorder', 't', 'size', 'unpack', 'pack')
+
+    def __init__(self, buf, byteorder, cls):
+        if issubclass(cls, nint):
+            bits = cls.b
+            signed = cls.s
+        else:
+            bits = 1 + cls.e + cls.m
+            signed = False
+        assert bits in (8, 16, 32, 64), 'Support standard widths only'
+        code = STRUCT_CODES[bits // 8]
+        if not signed:
+            code = code.upper()
+        packer = struct.Struct(STRUCT_BYTEORDERS[byteorder] + code)
+        self.buf = buf
+        self.byteorder = byteorder
+        self.t = cls
+        self.size = packer.size
+        self.unpack = packer.unpack_from
+        self.pack = packer.pack_into
+
+    def raw(self, value):
+        cls = self.t
+        if issubclass(cls, nint):
+            if type(value) is not int:
+                value = value.v if isinstance(value, nint) else int(value)
+            return wrap_value(value, cls)
+        if type(value) is cls:
+            return value.v
+        return float_encode(float(value), cls.e, cls.m)
+
+    # Bulk operations
+    def load(self, addr, count):
+        cls = self.t
+        data = memoryview(self.buf)[addr:addr + count * self.size]
+        assert len(data) == count * self.size, 'Address out of range'
+        if issubclass(cls, nint):
+            return nint_array.from_bytes(data, self.byteorder, cls.b, cls.s)
+        return nfloat_array.from_bytes(data, self.byteorder, cls.e, cls.m)
+
+    def store(self, addr, values):
+        cls = self.t
+        if issubclass(cls, nint):
+            values = nint_array(values, cls.b, cls.s)
+        else:
+            values = nfloat_array(values, cls.e, cls.m)
+        data = values.to_bytes(self.byteorder)
+        assert addr + len(data) <= len(self.buf), 'Address out of range'
+        memoryview(self.buf)[addr:addr + len(data)] = data
+
+    # Container operations
+    # Slices are byte ranges, open ends and negative addresses are relative
+    # to the bounds of the buffer
+    def span(self, addr):
+        assert addr.step is None, 'Slice step is not supported'
+        start, stop, _ = addr.indices(len(self.buf))
+        return start, max(stop - start, 0)
+
+    def __getitem__(self, addr):
+        if type(addr) is slice:
+            start, length = self.span(addr)
+            return self.load(start, length // self.size)
+        result = allocate(self.t)
+        result.v = self.unpack(self.buf, addr)[0]
+        return result
+    def __setitem__(self, addr, value):
+        if type(addr) is slice:
+            start, length = self.span(addr)
+            assert len(value) * self.size == length, 'Length mismatch'
+            return self.store(start, value)
+        self.pack(self.buf, addr, self.raw(value))
+
+# Memory
+class nmemory(object):
+    def __init__(self, buf, byteorder='little'):
+        self.buf = buf
+        self.byteorder = byteorder
+        self.u8 = nmemory_accessor(buf, byteorder, nint_class(8, False))
+        self.u16 = nmemory_accessor(buf, byteorder, nint_class(16, False))
+        self.u32 = nmemory_accessor(buf, byteorder, nint_class(32, False))
+        self.u64 = nmemory_accessor(buf, byteorder, nint_class(64, False))
+        self.i8 = nmemory_accessor(buf, byteorder, nint_class(8, True))
+        self.i16 = nmemory_accessor(buf, byteorder, nint_class(16, True))
+        self.i32 = nmemory_accessor(buf, byteorder, nint_class(32, True))
+        self.i64 = nmemory_accessor(buf, byteorder, nint_class(64, True))
+        self.f16 = nmemory_accessor(buf, byteorder, nfloat_class(5, 10))
+        self.f32 = nmemory_accessor(buf, byteorder, nfloat_class(8, 23))
+        self.f64 = nmemory_accessor(buf, byteorder, nfloat_class(11, 52))
+
+    def typed(self, cls):
+        return nmemory_accessor(self.buf, self.byteorder, cls)
+
+    def __len__(self):
+        return len(self.buf)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import atexit
+import os
+import sys
+import time
+
+from . import native_int
+from . import native_float
+
+profile_timer = getattr(time, 'perf_counter', time.time)
+
+# Helpers
+def profile_modules():
+    # Loaded modules of this package, all of them hold an `allocate` global
+    return [module for name, module in list(sys.modules.items())
+        if module is not None and (name == __package__ or name.startswith(__package__ + '.'))
+        and hasattr(module, 'allocate')]
+
+def profile_site(path):
+    # Innermost frame outside of this package
+    frame = sys._getframe(1)
+    while frame is not None and os.path.dirname(frame.f_code.co_filename) == path:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return '%s:%d' % (frame.f_code.co_filename, frame.f_lineno)
+
+def profile_name(op):
+    name = op if isinstance(op, str) else getattr(op, '__name__', repr(op))
+    for prefix in ('op_', 'assign_'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name.strip('_')
+
+# Entry points
+# Functions taking the operator as their last argument, counted per operator
+PROFILE_OPS = [
+    (native_int, ('op_unary', 'op_binary', 'op_relational', 'op_assign_unary', 'op_assign_binary')),
+    (native_float, ('op_unary', 'op_binary', 'op_relational')),
+]
+PROFILE_INPLACE = [native_int.nint, native_float.nfloat]
+
+# Methods not going through the functions above, counted per method name
+PROFILE_METHODS = [
+    ('nint.intrinsic', native_int.nint,
+        ('rotl', 'rotr', 'bswap', 'popcount', 'parity', 'clz', 'ctz', 'pext', 'pdep')),
+    ('nint.flags', native_int.nint,
+        ('add_with_flags', 'sub_with_flags', 'shl_with_flags', 'shr_with_flags', 'add_limbs', 'sub_limbs')),
+    ('nint.op_assign_fused', native_int.nint,
+        ('assign_muladd', 'assign_xormul', 'assign_xorshl', 'assign_xorshr')),
+]
+
+# Profile
+# Instrumented operators and allocation hooks are only swapped into the
+# package modules while a profile is active, so disabled profiling costs
+# nothing. Profiles can be nested.
+class nprofile(object):
+    def __init__(self, sites=False):
+        self.sites = sites
+        self.ops = {}
+        self.allocations = {}
+        self.times = {}
+        self.calls = {}
+        self.saved = None
+
+    # Instrumentation
+    def record_site(self):
+        site = profile_site(os.path.dirname(__file__))
+        self.calls[site] = self.calls.get(site, 0) + 1
+
+    def wrap_allocate(self, allocate):
+        allocations = self.allocations
+        def profile_allocate(cls):
+            name = cls.__name__
+            allocations[name] = allocations.get(name, 0) + 1
+            if self.sites:
+                self.record_site()
+            return allocate(cls)
+        return profile_allocate
+
+    def wrap_op(self, func, kind, key=None):
+        # Calls are counted under `key`, or the operator passed last
+        ops = self.ops
+        times = self.times
+        times.setdefault(kind, 0.0)
+        def profile_op(*args):
+            op = args[-1] if key is None else key
+            ops[op] = ops.get(op, 0) + 1
+            if self.sites:
+                self.record_site()
+            start = profile_timer()
+            try:
+                return func(*args)
+            finally:
+                times[kind] += profile_timer() - start
+        return profile_op
+
+    def start(self):
+        assert self.saved is None, 'Profile is already active'
+        self.saved = []
+        for module in profile_modules():
+            self.saved.append((module, 'allocate', module.allocate))
+            module.allocate = self.wrap_allocate(module.allocate)
+        for module, kinds in PROFILE_OPS:
+            prefix = 'n' + module.__name__.split('_')[-1]
+            for kind in kinds:
+                func = getattr(module, kind)
+                self.saved.append((module, kind, func))
+                setattr(module, kind, self.wrap_op(func, '%s.%s' % (prefix, kind)))
+        for cls in PROFILE_INPLACE:
+            self.wrap_method(cls, 'op_binary_inplace', '%s.op_binary_inplace' % cls.__name__, None)
+        for kind, cls, names in PROFILE_METHODS:
+            for name in names:
+                self.wrap_method(cls, name, kind, name)
+        self.wrap_method(native_int.bitfield, '__set__', 'bitfield.set', 'bitfield')
+        return self
+
+    def wrap_method(self, cls, name, kind, key):
+        func = cls.__dict__[name]
+        self.saved.append((cls, name, func))
+        if isinstance(func, staticmethod):
+            setattr(cls, name, staticmethod(self.wrap_op(func.__func__, kind, key)))
+        else:
+            setattr(cls, name, self.wrap_op(func, kind, key))
+
+    def stop(self):
+        for module, name, value in reversed(self.saved):
+            setattr(module, name, value)
+        self.saved = None
+
+    def __enter__(self):
+        return self.start()
+    def __exit__(self, *args):
+        self.stop()
+
+    # Results
+    def counts(self):
+        # Call counts per operator name, e.g. 'add' or 'div'
+        counts = {}
+        for op, count in self.ops.items():
+            name = profile_name(op)
+            counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def report(self, limit=10):
+        lines = []
+        def table(title, items, fmt):
+            items = sorted([item for item in items if item[1]], key=lambda item: -item[1])[:limit]
+            if items:
+                lines.append(title)
+                lines.extend(fmt % item for item in items)
+        table('operators', self.counts().items(), '  %-32s %10d')
+        table('allocations', self.allocations.items(), '  %-32s %10d')
+        table('time (s)', self.times.items(), '  %-32s %10.6f')
+        table('call sites', self.calls.items(), '  %-32s %10d')
+        return '\n'.join(lines)
+
+# Environment
+# NTYPES_PROFILE=1 profiles the whole process and prints a report at exit,
+# NTYPES_PROFILE=sites also attributes operations to call sites.
+def profile_environment():
+    mode = os.environ.get('NTYPES_PROFILE')
+    if not mode or mode == '0':
+        return None
+    profile = nprofile(sites=(mode == 'sites')).start()
+    def report():
+        profile.stop()
+        sys.stderr.write(profile.report() + '\n')
+    atexit.register(report)
+    return profile
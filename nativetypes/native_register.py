@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from .native_int import *
+
+# Registers
+class register(bitfield):
+    # Bitfield of a register file. Writes also clear the bits from `stop` up
+    # to `clear`, e.g. the upper half of RAX on writes to EAX.
+    def __init__(self, start, stop=None, clear=None):
+        bitfield.__init__(self, start, stop)
+        if clear is not None:
+            assert clear >= self.stop
+            self.clear_mask = ~(((1 << (clear - start)) - 1) << start)
+        self.clear = clear if clear is not None else self.stop
+
+# Register files
+# Every register is a bit range of a single Python integer, so that writes
+# to a register are visible in all registers that overlap it.
+class register_file(object):
+    # Layout attributes are underscored so that they never clash with names
+    __slots__ = ('v',)
+    _registers = {}
+    _roots = ()
+    b = 0
+    m = 0
+
+    def __init__(self, **values):
+        self.v = 0
+        for name, value in values.items():
+            assert name in self._registers, '%r has no register %r' % (type(self).__name__, name)
+            setattr(self, name, value)
+
+    def set(self, value):
+        self.v = value & self.m
+
+    def copy(self):
+        result = allocate(self.__class__)
+        result.v = self.v
+        return result
+
+    # Conversion operations
+    def __int__(self):
+        return self.v
+    def __eq__(self, rhs):
+        if type(self) is not type(rhs):
+            return NotImplemented
+        return self.v == rhs.v
+    def __ne__(self, rhs):
+        result = self.__eq__(rhs)
+        return result if result is NotImplemented else not result
+    __hash__ = None
+    def __repr__(self):
+        values = ', '.join('%s=%#x' % (name, int(getattr(self, name))) for name in self._roots)
+        return '%s(%s)' % (type(self).__name__, values)
+
+def register_file_type(name, registers):
+    # Registers are given as (name, start, stop) or (name, start, stop, clear)
+    registers = list(registers)
+    names = [entry[0] for entry in registers]
+    assert len(set(names)) == len(names), 'Register names must be unique'
+    for rname in names:
+        assert not rname.startswith('_') and not hasattr(register_file, rname), \
+            'Invalid register name: %r' % rname
+    fields = dict((entry[0], register(*entry[1:])) for entry in registers)
+    bits = max(field.clear for field in fields.values())
+    # Registers not contained in another register are shown by repr
+    roots = tuple(rname for rname, field in fields.items()
+        if not any(other is not field and other.start <= field.start and field.stop <= other.stop
+            and (other.start, other.stop) != (field.start, field.stop) for other in fields.values()))
+    attrs = dict(fields)
+    attrs.update({
+        "__slots__": (),
+        "_registers": fields,
+        "_roots": roots,
+        "b": bits,
+        "m": (1 << bits) - 1,
+    })
+    return type(name, (register_file,), attrs)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import struct
+
+from .native_int import *
+from .native_float import *
+from .native_array import *
+
+# Layout
+
+def struct_field(ftype):
+    # Returns the struct code of the container, and whether raw values can
+    # be stored as is, or still need to be wrapped to the field type
+    if issubclass(ftype, nint):
+        bits = ftype.b
+        signed = ftype.s
+    elif issubclass(ftype, nfloat):
+        bits = 1 + ftype.e + ftype.m
+        signed = False
+    else:
+        raise TypeError('Unsupported field type: %r' % ftype)
+    for size in (1, 2, 4, 8):
+        if bits <= size * 8:
+            break
+    else:
+        raise AssertionError('Support up to 64-bit fields only')
+    code = STRUCT_CODES[size]
+    if not signed:
+        code = code.upper()
+    return size, code, bits == size * 8
+
+def struct_value(raw, ftype):
+    # Wraps the raw container value of a field narrower than its container
+    if issubclass(ftype, nfloat):
+        return raw & ((1 << (1 + ftype.e + ftype.m)) - 1)
+    return wrap_value(raw, ftype)
+
+def struct_layout(fields, byteorder, packed):
+    # Offsets follow C rules: every field is aligned to its own size,
+    # and the whole record to its largest field
+    fmt = STRUCT_BYTEORDERS[byteorder]
+    offset = 0
+    align = 1
+    offsets = []
+    for name, ftype in fields:
+        size, code, exact = struct_field(ftype)
+        if not packed:
+            padding = -offset % size
+            fmt += 'x' * padding
+            offset += padding
+            align = max(align, size)
+        offsets.append(offset)
+        fmt += code
+        offset += size
+    fmt += 'x' * (-offset % align)
+    return fmt, offsets
+
+# Records
+class nstruct(object):
+    # Layout attributes are underscored so that they never clash with fields
+    __slots__ = ()
+    _fields = ()
+    _types = {}
+    _offsets = {}
+    _struct = struct.Struct('')
+    _size = 0
+
+    def __init__(self, *args, **kwargs):
+        assert len(args) <= len(self._fields), 'Too many fields'
+        for (name, ftype, exact), value in zip(self._fields, args):
+            setattr(self, name, value)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+        for name, ftype, exact in self._fields[len(args):]:
+            if name not in kwargs:
+                setattr(self, name, ftype())
+
+    def __setattr__(self, name, value):
+        ftype = self.__class__._types.get(name)
+        if ftype is None:
+            raise AttributeError('%r has no field %r' % (type(self).__name__, name))
+        if type(value) is not ftype:
+            value = ftype(float(value) if issubclass(ftype, nfloat) else int(value))
+        object.__setattr__(self, name, value)
+
+    # Bytes conversion
+    @classmethod
+    def from_values(cls, values):
+        record = allocate(cls)
+        setter = object.__setattr__
+        for (name, ftype, exact), raw in zip(cls._fields, values):
+            value = allocate(ftype)
+            value.v = raw if exact else struct_value(raw, ftype)
+            setter(record, name, value)
+        return record
+
+    @classmethod
+    def unpack(cls, data, offset=0):
+        return cls.from_values(cls._struct.unpack_from(data, offset))
+
+    @classmethod
+    def unpack_array(cls, data, offset=0, count=None):
+        size = cls._struct.size
+        view = memoryview(data).cast('B')[offset:]
+        if count is None:
+            count = len(view) // size
+        view = view[:count * size]
+        assert len(view) == count * size, 'Buffer is too small'
+        from_values = cls.from_values
+        return [from_values(values) for values in cls._struct.iter_unpack(view)]
+
+    def values(self):
+        return [getattr(self, name).v for name, _, _ in self._fields]
+
+    def pack(self):
+        return self._struct.pack(*self.values())
+
+    def pack_into(self, buf, offset=0):
+        self._struct.pack_into(buf, offset, *self.values())
+
+    @classmethod
+    def pack_array(cls, records):
+        pack = cls._struct.pack
+        return b''.join(pack(*record.values()) for record in records)
+
+    # Conversion operations
+    def __eq__(self, rhs):
+        if type(self) is not type(rhs):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(rhs, name) for name in self._types)
+    def __ne__(self, rhs):
+        result = self.__eq__(rhs)
+        return result if result is NotImplemented else not result
+    def __repr__(self):
+        fields = ', '.join('%s=%s' % (name, getattr(self, name)) for name, _, _ in self._fields)
+        return '%s(%s)' % (type(self).__name__, fields)
+
+def nstruct_type(name, fields, byteorder='little', packed=False):
+    fields = list(fields)
+    names = [field[0] for field in fields]
+    assert len(set(names)) == len(names), 'Field names must be unique'
+    for fname in names:
+        assert not fname.startswith('_') and not hasattr(nstruct, fname), \
+            'Invalid field name: %r' % fname
+    fmt, offsets = struct_layout(fields, byteorder, packed)
+    return type(name, (nstruct,), {
+        "__slots__": tuple(names),
+        "_fields": tuple((fname, ftype, struct_field(ftype)[2]) for fname, ftype in fields),
+        "_types": dict(fields),
+        "_offsets": dict(zip(names, offsets)),
+        "_struct": struct.Struct(fmt),
+        "_size": struct.calcsize(fmt),
+    })
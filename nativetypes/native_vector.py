@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import array
+import operator
+import re
+
+from .native_int import *
+from .native_array import *
+
+# Helpers
+# Registers hold every lane in a single unsigned Python integer, lane 0 in
+# the lowest bits. Lanes are processed at once with SWAR arithmetic.
+def vector_splat(value, cls):
+    return (int(value) & cls.l.m) * cls.o
+
+def vector_pack(values, cls):
+    data = array.array(array_typecode(cls.w, False), [int(x) & cls.l.m for x in values])
+    assert len(data) == cls.c, 'Vector requires %d lanes' % cls.c
+    return swar_load(data)
+
+def vector_lanes(value, cls, signed):
+    data = array.array(array_typecode(cls.w, signed))
+    data.frombytes(swar_store(value, cls.w, cls.c))
+    return data
+
+def vector_spread(value, cls):
+    # Expands the high bit of every lane to the whole lane
+    return ((value & cls.h) >> (cls.w - 1)) * cls.l.m
+
+def vector_operands(lhs, rhs):
+    # Native and Python integers are broadcast to every lane. If either
+    # vector has unsigned lanes, the result has unsigned lanes.
+    if isinstance(lhs, nvector):
+        cls = lhs.__class__
+        if isinstance(rhs, nvector):
+            assert rhs.w == cls.w and rhs.c == cls.c, 'Vector shapes must match'
+            if cls.s and not rhs.s:
+                cls = rhs.__class__
+            return cls, lhs.v, rhs.v
+        return cls, lhs.v, vector_splat(rhs, cls)
+    cls = rhs.__class__
+    return cls, vector_splat(lhs, cls), rhs.v
+
+def vector_result(cls, value):
+    result = allocate(cls)
+    result.v = value
+    return result
+
+# Lane operators
+def vector_op_add(lhs, rhs, cls):
+    return swar_add(lhs, rhs, cls.h) & cls.m
+def vector_op_sub(lhs, rhs, cls):
+    return swar_sub(lhs, rhs, cls.h) & cls.m
+def vector_op_and(lhs, rhs, cls):
+    return lhs & rhs
+def vector_op_or(lhs, rhs, cls):
+    return lhs | rhs
+def vector_op_xor(lhs, rhs, cls):
+    return lhs ^ rhs
+
+def vector_op_mul(lhs, rhs, cls):
+    code = array_typecode(cls.w, False)
+    values = zip(vector_lanes(lhs, cls, False), vector_lanes(rhs, cls, False))
+    return swar_load(array.array(code, [(x * y) & cls.l.m for x, y in values]))
+
+def vector_mul_scalar(value, scalar, cls):
+    # Even and odd lanes are spread into slots of twice their width, so a
+    # single multiplication computes every product without carries
+    width = cls.w
+    even = cls.e
+    low = ((value & even) * scalar) & even
+    high = (((value >> width) & even) * scalar) & even
+    return (low | (high << width)) & cls.m
+
+def vector_op_div(lhs, rhs, cls):
+    values = zip(vector_lanes(lhs, cls, cls.s), vector_lanes(rhs, cls, cls.s))
+    return vector_pack([op_div(x, y) for x, y in values], cls)
+def vector_op_mod(lhs, rhs, cls):
+    values = zip(vector_lanes(lhs, cls, cls.s), vector_lanes(rhs, cls, cls.s))
+    return vector_pack([op_mod(x, y) for x, y in values], cls)
+
+def vector_op_lshift(lhs, rhs, cls):
+    # Lanes shifted by their own amount, amounts past the width clear them
+    width = cls.w
+    values = zip(vector_lanes(lhs, cls, False), vector_lanes(rhs, cls, False))
+    return vector_pack([x << y if y < width else 0 for x, y in values], cls)
+def vector_op_rshift(lhs, rhs, cls):
+    # Signed lanes are filled with their sign bit
+    width = cls.w
+    values = zip(vector_lanes(lhs, cls, cls.s), vector_lanes(rhs, cls, False))
+    return vector_pack([x >> min(y, width) for x, y in values], cls)
+
+def vector_shift_scalar(value, shift, cls, op):
+    width = cls.w
+    count = cls.c
+    if shift < 0:
+        raise ValueError('negative shift count')
+    if op is operator.__lshift__:
+        if shift >= width:
+            return 0
+        return swar_shl(value, shift, width, count, cls.m)
+    if cls.s:
+        shift = min(shift, width - 1)
+        return swar_extend(swar_shr(value, shift, width, count), width - shift, width, count)
+    if shift >= width:
+        return 0
+    return swar_shr(value, shift, width, count)
+
+VECTOR_OPS = {
+    operator.__add__: vector_op_add,
+    operator.__sub__: vector_op_sub,
+    operator.__mul__: vector_op_mul,
+    operator.__floordiv__: vector_op_div,
+    operator.__truediv__: vector_op_div,
+    operator.__mod__: vector_op_mod,
+    operator.__and__: vector_op_and,
+    operator.__or__: vector_op_or,
+    operator.__xor__: vector_op_xor,
+    operator.__lshift__: vector_op_lshift,
+    operator.__rshift__: vector_op_rshift,
+}
+
+# Comparisons
+# Masks have all bits of a lane set where the condition holds
+def vector_cmpgt(lhs, rhs, cls):
+    if cls.s:
+        lhs ^= cls.h
+        rhs ^= cls.h
+    # Lanes where rhs - lhs borrows
+    diff = swar_sub(rhs, lhs, cls.h)
+    return vector_spread((~rhs & lhs) | (~(rhs ^ lhs) & diff), cls)
+
+def vector_cmpeq(lhs, rhs, cls):
+    value = lhs ^ rhs
+    low = cls.h ^ cls.m
+    # High bit of every lane with any bit set
+    nonzero = (value | ((value & low) + low)) & cls.h
+    return vector_spread(nonzero ^ cls.h, cls)
+
+def vector_cmpne(lhs, rhs, cls):
+    return vector_cmpeq(lhs, rhs, cls) ^ cls.m
+def vector_cmpge(lhs, rhs, cls):
+    return vector_cmpgt(rhs, lhs, cls) ^ cls.m
+def vector_cmplt(lhs, rhs, cls):
+    return vector_cmpgt(rhs, lhs, cls)
+def vector_cmple(lhs, rhs, cls):
+    return vector_cmpgt(lhs, rhs, cls) ^ cls.m
+
+def vector_min(lhs, rhs, cls):
+    return lhs ^ ((lhs ^ rhs) & vector_cmpgt(lhs, rhs, cls))
+def vector_max(lhs, rhs, cls):
+    return rhs ^ ((lhs ^ rhs) & vector_cmpgt(lhs, rhs, cls))
+
+# Saturation
+def vector_adds(lhs, rhs, cls):
+    high = cls.h
+    value = swar_add(lhs, rhs, high) & cls.m
+    if cls.s:
+        overflow = vector_spread((lhs ^ value) & (rhs ^ value), cls)
+        saturated = (high ^ cls.m) ^ vector_spread(lhs, cls)
+        return (value & ~overflow) | (saturated & overflow)
+    carry = vector_spread((lhs & rhs) | ((lhs | rhs) & ~value), cls)
+    return value | carry
+
+def vector_subs(lhs, rhs, cls):
+    high = cls.h
+    value = swar_sub(lhs, rhs, high) & cls.m
+    if cls.s:
+        overflow = vector_spread((lhs ^ rhs) & (lhs ^ value), cls)
+        saturated = (high ^ cls.m) ^ vector_spread(lhs, cls)
+        return (value & ~overflow) | (saturated & overflow)
+    borrow = vector_spread((~lhs & rhs) | (~(lhs ^ rhs) & value), cls)
+    return value & ~borrow
+
+# Operators
+def vector_unary(value, op):
+    cls = value.__class__
+    v = value.v
+    if op is operator.__invert__:
+        return vector_result(cls, v ^ cls.m)
+    if op is operator.__pos__:
+        return vector_result(cls, v)
+    negated = swar_sub(0, v, cls.h) & cls.m
+    if op is operator.__neg__:
+        return vector_result(cls, negated)
+    # Absolute value only negates signed lanes with their sign bit set
+    if not cls.s:
+        return vector_result(cls, v)
+    mask = vector_spread(v, cls)
+    return vector_result(cls, (v & ~mask) | (negated & mask))
+
+def vector_binary(lhs, rhs, op):
+    if not isinstance(rhs, nvector):
+        if op is operator.__mul__:
+            return vector_result(lhs.__class__, vector_mul_scalar(lhs.v, int(rhs) & lhs.l.m, lhs))
+        if op in op_shifts:
+            return vector_result(lhs.__class__, vector_shift_scalar(lhs.v, int(rhs), lhs, op))
+    elif op is operator.__mul__ and not isinstance(lhs, nvector):
+        return vector_result(rhs.__class__, vector_mul_scalar(rhs.v, int(lhs) & rhs.l.m, rhs))
+    cls, lhs, rhs = vector_operands(lhs, rhs)
+    return vector_result(cls, VECTOR_OPS[op](lhs, rhs, cls))
+
+def vector_method(func):
+    def method(self, rhs):
+        cls, lhs, rhs = vector_operands(self, rhs)
+        return vector_result(cls, func(lhs, rhs, cls))
+    return method
+
+# Native Vector
+class nvector(object):
+    # Instances only store the register value, the type constants are
+    # per-class: lane bits (w), lane count (c), lane signedness (s), lane
+    # type (l), register bits (b) and mask (m), lane sign bits (h), lane
+    # ones (o) and the lanes of even index (e).
+    __slots__ = ('v',)
+    w = 32
+    c = 4
+    s = False
+
+    def __new__(cls, values=0, bits=32, count=4, signed=False):
+        if cls is nvector:
+            cls = nvector_class(bits, count, signed)
+        self = allocate(cls)
+        self.set(values)
+        return self
+
+    @classmethod
+    def splat(cls, value):
+        return vector_result(cls, vector_splat(value, cls))
+
+    def set(self, values):
+        # Python integers are raw register values, iterables are lanes
+        if isinstance(values, (int, nint)):
+            self.v = int(values) & self.m
+        elif isinstance(values, nvector):
+            assert values.b == self.b, 'Vector sizes must match'
+            self.v = values.v
+        else:
+            self.v = vector_pack(values, self.__class__)
+
+    # Bytes conversion
+    @classmethod
+    def from_bytes(cls, data, byteorder):
+        assert len(data) * 8 == cls.b, 'Data length must match the vector size'
+        return vector_result(cls, bytes_to_int(data, byteorder))
+
+    def to_bytes(self, byteorder):
+        return int_to_bytes(self.v, self.b // 8, byteorder, False)
+
+    # Lanes
+    def tolist(self):
+        return vector_lanes(self.v, self.__class__, self.s).tolist()
+
+    def extract(self, index):
+        assert 0 <= index < self.c
+        lane = self.l
+        result = allocate(lane)
+        result.v = wrap_value(self.v >> (index * self.w), lane)
+        return result
+
+    def insert(self, index, value):
+        assert 0 <= index < self.c
+        shift = index * self.w
+        lane = self.l.m << shift
+        return vector_result(self.__class__, (self.v & ~lane) | ((int(value) << shift) & lane))
+
+    def shuffle(self, indices, other=None):
+        # Lane i of the result is lane indices[i] of `self`, or of `other`
+        # after subtracting the lane count. Negative indices or None yield 0.
+        size = self.w // 8
+        data = self.to_bytes('little')
+        if other is not None:
+            data += other.to_bytes('little')
+        zero = bytes(size)
+        lanes = [zero if i is None or i < 0 else data[i * size:(i + 1) * size] for i in indices]
+        assert len(lanes) == self.c and all(len(x) == size for x in lanes)
+        return vector_result(self.__class__, bytes_to_int(b''.join(lanes), 'little'))
+
+    def __len__(self):
+        return self.c
+    def __iter__(self):
+        return (self.extract(i) for i in range(self.c))
+    def __getitem__(self, index):
+        return self.extract(index)
+    def __setitem__(self, index, value):
+        self.v = self.insert(index, value).v
+
+    # Lane-wise operations
+    min = vector_method(vector_min)
+    max = vector_method(vector_max)
+    adds = vector_method(vector_adds)
+    subs = vector_method(vector_subs)
+    cmpeq = vector_method(vector_cmpeq)
+    cmpne = vector_method(vector_cmpne)
+    cmpgt = vector_method(vector_cmpgt)
+    cmpge = vector_method(vector_cmpge)
+    cmplt = vector_method(vector_cmplt)
+    cmple = vector_method(vector_cmple)
+
+    # Conversion operations
+    def __str__(self):
+        return str(self.tolist())
+    def __repr__(self):
+        typename = type(self).__name__
+        return '%s(%s)' % (typename, self)
+    def __int__(self):
+        return self.v
+    def __bool__(self):
+        return bool(self.v)
+    def __nonzero__(self):
+        return bool(self.v)
+
+    def op_binary_inplace(self, value, op):
+        self.v = vector_binary(self, value, op).v
+        return self
+
+    # Unary operations
+    def __abs__(self):
+        return vector_unary(self, operator.__abs__)
+    def __pos__(self):
+        return vector_unary(self, operator.__pos__)
+    def __neg__(self):
+        return vector_unary(self, operator.__neg__)
+    def __invert__(self):
+        return vector_unary(self, operator.__invert__)
+
+    # Binary operations
+    def __add__(self, rhs):
+        return vector_binary(self, rhs, operator.__add__)
+    def __sub__(self, rhs):
+        return vector_binary(self, rhs, operator.__sub__)
+    def __mul__(self, rhs):
+        return vector_binary(self, rhs, operator.__mul__)
+    def __floordiv__(self, rhs):
+        return vector_binary(self, rhs, operator.__floordiv__)
+    def __truediv__(self, rhs):
+        return vector_binary(self, rhs, operator.__truediv__)
+    def __mod__(self, rhs):
+        return vector_binary(self, rhs, operator.__mod__)
+    def __and__(self, rhs):
+        return vector_binary(self, rhs, operator.__and__)
+    def __or__(self, rhs):
+        return vector_binary(self, rhs, operator.__or__)
+    def __xor__(self, rhs):
+        return vector_binary(self, rhs, operator.__xor__)
+    def __lshift__(self, rhs):
+        return vector_binary(self, rhs, operator.__lshift__)
+    def __rshift__(self, rhs):
+        return vector_binary(self, rhs, operator.__rshift__)
+
+    # Reflected binary operations
+    def __radd__(self, lhs):
+        return vector_binary(lhs, self, operator.__add__)
+    def __rsub__(self, lhs):
+        return vector_binary(lhs, self, operator.__sub__)
+    def __rmul__(self, lhs):
+        return vector_binary(lhs, self, operator.__mul__)
+    def __rfloordiv__(self, lhs):
+        return vector_binary(lhs, self, operator.__floordiv__)
+    def __rtruediv__(self, lhs):
+        return vector_binary(lhs, self, operator.__truediv__)
+    def __rmod__(self, lhs):
+        return vector_binary(lhs, self, operator.__mod__)
+    def __rand__(self, lhs):
+        return vector_binary(lhs, self, operator.__and__)
+    def __ror__(self, lhs):
+        return vector_binary(lhs, self, operator.__or__)
+    def __rxor__(self, lhs):
+        return vector_binary(lhs, self, operator.__xor__)
+
+    # In-place operations
+    def __iadd__(self, v):
+        return self.op_binary_inplace(v, operator.__add__)
+    def __isub__(self, v):
+        return self.op_binary_inplace(v, operator.__sub__)
+    def __imul__(self, v):
+        return self.op_binary_inplace(v, operator.__mul__)
+    def __ifloordiv__(self, v):
+        return self.op_binary_inplace(v, operator.__floordiv__)
+    def __itruediv__(self, v):
+        return self.op_binary_inplace(v, operator.__truediv__)
+    def __imod__(self, v):
+        return self.op_binary_inplace(v, operator.__mod__)
+    def __iand__(self, v):
+        return self.op_binary_inplace(v, operator.__and__)
+    def __ior__(self, v):
+        return self.op_binary_inplace(v, operator.__or__)
+    def __ixor__(self, v):
+        return self.op_binary_inplace(v, operator.__xor__)
+    def __ilshift__(self, v):
+        return self.op_binary_inplace(v, operator.__lshift__)
+    def __irshift__(self, v):
+        return self.op_binary_inplace(v, operator.__rshift__)
+
+    # Boolean operations
+    # Registers are equal if all of their lanes are equal, lists and tuples
+    # are compared against the lanes
+    def __eq__(self, rhs):
+        if isinstance(rhs, (list, tuple)):
+            return self.tolist() == list(rhs)
+        cls, lhs, rhs = vector_operands(self, rhs)
+        return lhs == rhs
+    def __ne__(self, rhs):
+        return not self == rhs
+    __hash__ = None
+
+# Aliases
+_nvector_types = {}
+
+def nvector_type(name, bits, count, signed):
+    assert bits in (8, 16, 32, 64), 'Support 8, 16, 32 and 64-bit lanes only'
+    assert count >= 1
+    cls = _nvector_types.get((name, bits, count, signed))
+    if cls is not None:
+        return cls
+    cls = type(name, (nvector,), {
+        "__slots__": (),
+        "w": bits,
+        "c": count,
+        "s": signed,
+        "l": nint_class(bits, signed),
+        "b": bits * count,
+        "m": (1 << (bits * count)) - 1,
+        "h": swar_repeat(1 << (bits - 1), bits, count),
+        "o": swar_repeat(1, bits, count),
+        "e": swar_repeat((1 << bits) - 1, bits * 2, (count + 1) // 2),
+    })
+    _nvector_types[name, bits, count, signed] = cls
+    if name == nvector_name(bits, count, signed):
+        _nvector_classes.setdefault((bits, count, signed), cls)
+    return cls
+
+# Canonical aliases for each lane type and count
+_nvector_classes = {}
+
+def nvector_name(bits, count, signed):
+    return '%sint%dx%d' % ('' if signed else 'u', bits, count)
+
+def nvector_class(bits, count, signed):
+    cls = _nvector_classes.get((bits, count, signed))
+    if cls is None:
+        cls = nvector_type(nvector_name(bits, count, signed), bits, count, signed)
+    return cls
+
+# Shorthands
+# Names such as `uint8x16` or `int32x4` are resolved by the package on first
+# access, no types are created at import time.
+NVECTOR_ALIAS = re.compile(r'(u?)int(8|16|32|64)x([1-9][0-9]*)$')
+
+def nvector_alias(name):
+    # Returns the canonical class named `name`, or None
+    match = NVECTOR_ALIAS.match(name)
+    if match is None:
+        return None
+    return nvector_class(int(match.group(2)), int(match.group(3)), not match.group(1))
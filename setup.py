@@ -37,6 +37,7 @@ setuptools.setup(
     url=NTYPES_REPOSITORY_URL,
     download_url=NTYPES_DOWNLOAD_URL,
     packages=['nativetypes'],
+    extras_require={'numpy': ['numpy']},
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
@@ -11,17 +11,31 @@ def test_nint():
     test_nint_aliases()
     test_nint_bytes()
     test_nint_slicing()
+    test_nint_bitfields()
     test_nint_utils()
     test_nint_ops_type()
     test_nint_ops_unary()
     test_nint_ops_binary()
     test_nint_ops_reflected()
     test_nint_ops_inplace()
+    test_nint_ops_assign()
+    test_nint_intrinsics()
+    test_nint_flags()
     test_nint_ops_relational()
 
+def test_nlazy():
+    test_nlazy_results()
+    test_nlazy_inplace()
+
+def test_nfrozen():
+    test_nfrozen_hash()
+    test_nfrozen_immutable()
+
 def test_nfloat():
     test_nfloat_values()
     test_nfloat_aliases()
+    test_nfloat_tables()
+    test_nfloat_fields()
     test_nfloat_bytes()
     test_nfloat_ops_type()
     test_nfloat_ops_unary()
@@ -30,9 +44,62 @@ def test_nfloat():
     test_nfloat_ops_inplace()
     test_nfloat_ops_relational()
 
+def test_narray():
+    test_nint_array_values()
+    test_nint_array_bytes()
+    test_nint_array_ops_unary()
+    test_nint_array_ops_binary()
+    test_nint_array_ops_inplace()
+    test_nint_array_ops_relational()
+    test_nint_array_buffer()
+    test_nfloat_array_values()
+    test_nfloat_array_bytes()
+    test_nfloat_array_ops()
+    test_narray_reinterpret()
+    test_narray_numpy()
+
+def test_nvector():
+    test_nvector_lanes()
+    test_nvector_ops()
+
+def test_nstruct():
+    test_nstruct_layout()
+    test_nstruct_values()
+    test_nstruct_bytes()
+
+def test_nregister():
+    test_nregister_aliases()
+    test_nregister_layout()
+
+def test_nmemory():
+    test_nmemory_values()
+    test_nmemory_bulk()
+
+def test_njit():
+    test_njit_results()
+    test_njit_fallback()
+
+def test_nprofile():
+    test_nprofile_counts()
+    test_nprofile_paths()
+    test_nprofile_restore()
+
+def test_nbench():
+    test_nbench_smoke()
+
 def test():
     test_nint()
+    test_nlazy()
+    test_nfrozen()
     test_nfloat()
+    test_narray()
+    test_nvector()
+    test_nstruct()
+    test_nregister()
+    test_nmemory()
+    test_njit()
+    test_nprofile()
+    test_nbench()
 
 if __name__ == '__main__':
     test()
@@ -6,4 +6,14 @@ Native types.
 
 # Imports
 from .tests_nint import *
+from .tests_nlazy import *
+from .tests_nfrozen import *
 from .tests_nfloat import *
+from .tests_narray import *
+from .tests_nvector import *
+from .tests_nstruct import *
+from .tests_nregister import *
+from .tests_nmemory import *
+from .tests_njit import *
+from .tests_nprofile import *
+from .tests_nbench import *
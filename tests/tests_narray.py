@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import sys
+
+from nativetypes import *
+
+def test_nint_array_values():
+    assert nint_array([1, 2, 3], bits=8, signed=False).tolist() == [1, 2, 3]
+    assert nint_array([0x7F, 0x80, -1], bits=8, signed=True).tolist() == [0x7F, -0x80, -1]
+    assert nint_array([0x100, -1], bits=8, signed=False).tolist() == [0, 0xFF]
+    assert nint_array([int8(-1), uint8(0xFF)], bits=16, signed=False).tolist() == [0xFFFF, 0xFF]
+    # Custom widths
+    assert nint_array([0x1FF, 0x200], bits=9, signed=False).tolist() == [0x1FF, 0]
+    assert nint_array([0x3F, 0x40, -1], bits=7, signed=True).tolist() == [0x3F, -0x40, -1]
+    # Elements
+    a = nint_array([1, 2, 3], bits=8, signed=False)
+    assert a[0] == uint8(1) and a[0].b == 8 and a[0].s == False
+    assert len(a) == 3 and a[1:].tolist() == [2, 3]
+    assert [int(x) for x in a] == [1, 2, 3]
+    a[0] = 0x1FF
+    a[1:3] = [-1, 0x100]
+    assert a.tolist() == [0xFF, 0xFF, 0]
+
+def test_nint_array_bytes():
+    assert nint_array.from_bytes(b'\x00\x01\x01\x00', 'big', bits=16, signed=False).tolist() == [1, 256]
+    assert nint_array.from_bytes(b'\x00\x01\x01\x00', 'little', bits=16, signed=False).tolist() == [256, 1]
+    assert nint_array.from_bytes(b'\xFF\x7F', 'little', bits=8, signed=True).tolist() == [-1, 0x7F]
+    assert nint_array.from_bytes(b'\x12\x34', 'big', bits=12, signed=False).tolist() == [0x234]
+    assert nint_array([1, 256], bits=16, signed=False).to_bytes('big') == b'\x00\x01\x01\x00'
+    assert nint_array([-1, 1], bits=8, signed=True).to_bytes('little') == b'\xFF\x01'
+    assert nint_array([0x123456], bits=24, signed=False).to_bytes('big') == b'\x12\x34\x56'
+
+def test_nint_array_ops_unary():
+    a = nint_array([0, 1, 0x7F, 0x80, 0xFF], bits=8, signed=True)
+    b = nint_array([0, 1, 0x7F, 0x80, 0xFF], bits=8, signed=False)
+    for op in (abs, lambda x: +x, lambda x: -x, lambda x: ~x):
+        assert op(a).tolist() == [int(op(int8(x))) for x in a.tolist()]
+        assert op(b).tolist() == [int(op(uint8(x))) for x in b.tolist()]
+    assert (-nint_array([1, 0x100], bits=9, signed=False)).tolist() == [0x1FF, 0x100]
+
+def test_nint_array_ops_binary():
+    import operator
+    ops = (operator.add, operator.sub, operator.mul, operator.floordiv,
+        operator.mod, operator.and_, operator.or_, operator.xor,
+        operator.lshift, operator.rshift)
+    lhs = [0, 1, 3, -7, -8, 0x7F, -0x80, 0x55]
+    rhs = [1, 2, 5, 5, 5, 3, 7, 0x0F]
+    for bits, signed in ((8, True), (8, False), (7, True), (9, False), (32, True), (64, False)):
+        t = nint_type('t', bits, signed)
+        a = nint_array(lhs, bits, signed)
+        b = nint_array(rhs, bits, signed)
+        for op in ops:
+            expected = [int(op(t(x), t(y))) for x, y in zip(lhs, rhs)]
+            assert op(a, b).tolist() == expected
+            expected = [int(op(t(x), 3)) for x in lhs]
+            assert op(a, 3).tolist() == expected
+            expected = [int(op(3, t(y))) for y in rhs]
+            assert op(3, b).tolist() == expected
+    # Promotions
+    a = nint_array([-1, 2], bits=8, signed=True)
+    b = nint_array([1, 2], bits=16, signed=False)
+    assert (a + b).b == 16 and (a + b).s == False
+    assert (a + b).tolist() == [0, 4]
+    assert (a + uint32(1)).b == 32 and (a + uint32(1)).tolist() == [0, 3]
+    assert (a + 0).b == 8 and (a + 0).s == True
+    # Shifts
+    assert (nint_array([0x1234], bits=16, signed=False) >> 20).tolist() == [0x0123]
+    assert (nint_array([0x1234], bits=16, signed=False) << 20).tolist() == [0x2340]
+    assert (nint_array([-16], bits=16, signed=True) >> 2).tolist() == [-4]
+
+def test_nint_array_ops_inplace():
+    a = nint_array([0xF0, 0x0F], bits=8, signed=False)
+    a += nint_array([0x20, 0x01], bits=16, signed=False)
+    assert a.b == 8 and a.tolist() == [0x10, 0x10]
+    a ^= 0xFF
+    assert a.tolist() == [0xEF, 0xEF]
+    a <<= 4
+    assert a.tolist() == [0xF0, 0xF0]
+
+def test_nint_array_ops_relational():
+    a = nint_array([0x80, 0x7F], bits=8, signed=True)
+    b = nint_array([0x80, 0x7F], bits=8, signed=False)
+    assert (a < 0) == [True, False]
+    assert (b < 0) == [False, False]
+    assert (a == b) == [True, True]
+    assert (a > nint_array([0x7F, 0x80], bits=8, signed=False)) == [True, False]
+    assert (a != 0x7F) == [True, False]
+
+def test_nfloat_array_values():
+    import math
+    assert nfloat_array([1.0, -0.5, 2], exponent=8, mantissa=23).tolist() == [1.0, -0.5, 2.0]
+    assert nfloat_array([math.pi], exponent=8, mantissa=23).tolist() == [float(float32(math.pi))]
+    assert nfloat_array([math.pi], exponent=5, mantissa=10).tolist() == [float(float16(math.pi))]
+    assert nfloat_array([math.pi], exponent=4, mantissa=3).tolist() == [float(nfloat(math.pi, 4, 3))]
+    assert nfloat_array([1e6, -1e6], exponent=5, mantissa=10).tolist() == [float('inf'), -float('inf')]
+    # Elements
+    a = nfloat_array([1.0, 2.0, 3.0], exponent=5, mantissa=10)
+    assert a[0] == 1.0 and a[0].e == 5 and a[0].m == 10
+    assert len(a) == 3 and a[1:].tolist() == [2.0, 3.0]
+    a[0] = 0.1
+    a[1:3] = [float32(0.25), -1.0]
+    assert a.tolist() == [float(float16(0.1)), 0.25, -1.0]
+    # Bits
+    assert nfloat_array([1.0], exponent=8, mantissa=23).to_bits() == [0x3F800000]
+    assert nfloat_array.from_bits([0x3C00, 0xBC00], exponent=5, mantissa=10).tolist() == [1.0, -1.0]
+
+def test_nfloat_array_bytes():
+    assert nfloat_array.from_bytes(b'\x3f\x80\x00\x00', 'big', exponent=8, mantissa=23).tolist() == [1.0]
+    assert nfloat_array.from_bytes(b'\x00\x00\x80\x3f', 'little', exponent=8, mantissa=23).tolist() == [1.0]
+    assert nfloat_array([1.0, 2.0], exponent=8, mantissa=23).to_bytes('big') == \
+        float32(1.0).to_bytes('big') + float32(2.0).to_bytes('big')
+    assert nfloat_array([1.0], exponent=5, mantissa=11).to_bytes('big') == \
+        nfloat(1.0, exponent=5, mantissa=11).to_bytes('big')
+
+def test_nfloat_array_ops():
+    import operator
+    ops = (operator.add, operator.sub, operator.mul, operator.truediv,
+        operator.floordiv, operator.mod)
+    lhs = [3.0, -7.5, 0.1, 1e4, 65504.0]
+    rhs = [2.0, 5.0, 0.3, 3.0, 2.0]
+    for exponent, mantissa in ((5, 10), (8, 23), (11, 52), (4, 3), (8, 7)):
+        t = nfloat_type('t', exponent, mantissa)
+        a = nfloat_array(lhs, exponent, mantissa)
+        b = nfloat_array(rhs, exponent, mantissa)
+        for op in ops:
+            assert op(a, b).to_bits() == [op(t(x), t(y)).get_bits() for x, y in zip(lhs, rhs)]
+            assert op(a, 3.0).to_bits() == [op(t(x), 3.0).get_bits() for x in lhs]
+            assert op(3.0, b).to_bits() == [op(3.0, t(y)).get_bits() for y in rhs]
+        for op in (abs, operator.neg, operator.pos):
+            assert op(a).to_bits() == [op(t(x)).get_bits() for x in lhs]
+    # Promotions
+    a = nfloat_array([0.1], exponent=5, mantissa=10)
+    b = nfloat_array([0.1], exponent=8, mantissa=23)
+    assert (a + b).e == 8 and (a + b).m == 23
+    assert (a + float64(0.0)).e == 11
+    # In-place, writing through to the storage
+    storage = a.a
+    a += b
+    assert a.e == 5 and a.tolist() == [float(float16(0.2))]
+    assert a.a is storage and storage.tolist() == [float16(0.2).v]
+    # Relational
+    nan = float('nan')
+    a = nfloat_array([1.0, 2.0, nan], exponent=8, mantissa=23)
+    assert (a == 2.0) == [False, True, False]
+    assert (a < nfloat_array([2.0, 2.0, 2.0], exponent=5, mantissa=10)) == [True, False, False]
+
+def test_narray_reinterpret():
+    a = nfloat_array([1.0, -2.0], exponent=8, mantissa=23)
+    b = reinterpret_cast(uint32, a)
+    assert isinstance(b, nint_array) and b.b == 32 and b.s == False
+    assert b.tolist() == [0x3F800000, 0xC0000000]
+    assert reinterpret_cast(int32, a).tolist() == [0x3F800000, -0x40000000]
+    assert reinterpret_cast(uint64, a).tolist() == [0x3F800000, 0xC0000000]
+    assert reinterpret_cast(uint16, a).tolist() == [0, 0]
+    c = reinterpret_cast(float32, b)
+    assert isinstance(c, nfloat_array) and c.tolist() == [1.0, -2.0]
+    assert reinterpret_cast(float16, nint_array([0x3C00, -0x4000], bits=16, signed=True)).tolist() == [1.0, -2.0]
+    assert reinterpret_cast(uint16, nint_array([-1], bits=12, signed=True)).tolist() == [0xFFF]
+
+def test_nint_array_buffer():
+    import mmap
+    import struct
+    data = bytearray(struct.pack('<Bi3I', 0xAA, -2, 1, 2, 3))
+    # Views share memory with the buffer
+    a = nint_array.from_buffer(data, 'little', bits=32, signed=True, offset=1, count=1)
+    assert a.tolist() == [-2]
+    a[0] = 5
+    assert struct.unpack_from('<i', data, 1) == (5,)
+    b = uint32.from_buffer(data, 'little', offset=5)
+    assert b.tolist() == [1, 2, 3]
+    b += 1
+    assert struct.unpack_from('<3I', data, 5) == (2, 3, 4)
+    assert (b + b).tolist() == [4, 6, 8] and b[1:].tolist() == [3, 4]
+    assert b.to_bytes('big') == struct.pack('>3I', 2, 3, 4)
+    # Views cannot be resized, copies can
+    for resize in (lambda: b.append(5), lambda: b.extend([5, 6]), lambda: b[1:].append(5)):
+        try:
+            resize()
+            assert False
+        except TypeError:
+            pass
+    assert len(b) == 3 and struct.unpack_from('<3I', data, 5) == (2, 3, 4)
+    c = nint_array(b, bits=32, signed=False)
+    c.append(5)
+    c.extend([6])
+    assert c.tolist() == [2, 3, 4, 5, 6] and b.tolist() == [2, 3, 4]
+    f = reinterpret_cast(float32, b)
+    f.append(1.0)
+    assert len(f) == 4 and nfloat_array(f, 8, 23).tolist()[3] == 1.0
+    # Copies for other byte orders and widths
+    assert nint_array.from_buffer(data, 'big', bits=32, signed=False, offset=5).tolist() == \
+        [0x02000000, 0x03000000, 0x04000000]
+    assert nint_array.from_buffer(b'\x12\x34\x56', 'big', bits=12, signed=False).tolist() == [0x234]
+    assert uint8.from_buffer(memoryview(b'\x01\x02\x03')[1:], 'big').tolist() == [2, 3]
+    # Iteration
+    values = list(int32.iter_from_buffer(data, 'little', offset=1, count=2))
+    assert values == [5, 2] and all(type(x) is int32 for x in values)
+    values = list(nint_array.iter_from_buffer(b'\x0F\xFF', 'big', bits=12, signed=True))
+    assert values == [-1] and values[0].b == 12
+    # Packing
+    uint16.pack_into(data, 0, [0x0102, 0x0304], 'big')
+    assert data[:4] == b'\x01\x02\x03\x04'
+    nint_array([-1], bits=24, signed=True).pack_into(data, 1, 'little')
+    assert data[:5] == b'\x01\xFF\xFF\xFF\x00'
+    # Memory maps
+    m = mmap.mmap(-1, 16)
+    c = uint64.from_buffer(m, sys.byteorder)
+    c[1] = 0x1122334455667788
+    assert m[8:16] == struct.pack('=Q', 0x1122334455667788)
+    del c
+    m.close()
+
+def test_narray_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return
+    # Conversion from NumPy arrays wraps to the element type
+    a = nint_array(numpy.array([1, 255, 256, -1]), bits=8, signed=False)
+    assert a.tolist() == [1, 255, 0, 255]
+    assert nint_array(numpy.arange(4, dtype=numpy.uint16), bits=9, signed=True).tolist() == [0, 1, 2, 3]
+    assert nfloat_array(numpy.array([1.0, 1e10]), exponent=5, mantissa=10).tolist() == [1.0, float('inf')]
+    # Conversion to NumPy arrays uses the container width
+    b = numpy.asarray(nint_array([-1, 2], bits=12, signed=True))
+    assert b.dtype == numpy.int16 and b.tolist() == [-1, 2]
+    assert numpy.asarray(nint_array([1, 2], bits=32, signed=False)).dtype == numpy.uint32
+    assert numpy.asarray(nint_array([3], bits=8, signed=False), dtype=numpy.float64).tolist() == [3.0]
+    c = numpy.asarray(nfloat_array([1.5, -2.0], exponent=5, mantissa=10))
+    assert c.dtype == numpy.float16 and c.tolist() == [1.5, -2.0]
+    d = numpy.asarray(nfloat_array([1.5, -0.25, float('inf')], exponent=4, mantissa=3))
+    assert d.dtype == numpy.float64 and d.tolist() == [1.5, -0.25, float('inf')]
+    # Operators match the pure Python implementation
+    x = nint_array([7, -8, 100, -128], bits=8, signed=True)
+    y = nint_array([3, 3, -7, -1], bits=8, signed=True)
+    assert (x * y).tolist() == [21, -24, 68, -128]
+    assert (x // y).tolist() == [2, -2, -14, -128]
+    assert (x % y).tolist() == [1, -2, 2, 0]
+    assert abs(x).tolist() == [7, 8, 100, -128]
+    assert (x < y) == [False, True, False, True]
+    assert (x + numpy.array([1, 1, 1, 1])).tolist() == [8, -7, 101, -127]
+    assert (nint_array([2 ** 63], bits=64, signed=False) * 3).tolist() == [2 ** 63]
+    try:
+        x // nint_array([1, 0, 1, 1], bits=8, signed=True)
+        assert False
+    except ZeroDivisionError:
+        pass
+    # NumPy ufuncs defer to the array operators
+    assert (numpy.int64(2) * nint_array([200], bits=8, signed=False)).tolist() == [144]
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import contextlib
+import io
+
+def test_nbench_smoke():
+    # Every benchmark runs once, checking that it still works
+    import bench
+    saved = dict(bench.settings)
+    bench.settings.update(repeat=1, number=1)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            bench.bench()
+    finally:
+        bench.settings.update(saved)
+        del bench.results[:]
+    assert 'float32' in output.getvalue()
@@ -24,6 +24,55 @@ def test_nfloat_aliases():
     f8_type = nfloat_type('f', exponent=4, mantissa=3)
     f8_value = f8_type(0.0)
     assert f8_value.e == 4 and f8_value.m == 3
+    assert nfloat_type('f', exponent=4, mantissa=3) is f8_type
+    # Shorthands
+    import nativetypes
+    assert nativetypes.float32 is nfloat_class(8, 23)
+    assert nativetypes.bfloat16 is nfloat_class(8, 7) and nativetypes.bfloat16(1.5).get_bits() == 0x3FC0
+    assert type(nfloat(1.0, exponent=8, mantissa=7)) is nativetypes.bfloat16
+    assert nativetypes.float8_e4m3 is nfloat_class(4, 3) and float(nativetypes.float8_e4m3(-2.0)) == -2.0
+    assert nativetypes.float8_e5m2.e == 5 and nativetypes.float8_e5m2.m == 2
+    for name in ('float8', 'float8_e4m4', 'float16_e5m10', 'float64_e12m51'):
+        assert not hasattr(nativetypes, name)
+
+def test_nfloat_tables():
+    from nativetypes.native_float import float_decode_generic
+    # Tables agree with the generic conversions for every bit pattern
+    for exponent, mantissa in ((4, 3), (5, 2), (8, 7)):
+        v = nfloat(0.0, exponent, mantissa)
+        for bits in range(0, 1 << (1 + exponent + mantissa), 7):
+            v.set_bits(bits)
+            value = float(v)
+            expected = float_decode_generic(bits, exponent, mantissa)
+            assert value == expected or value != value and expected != expected
+            if value == value:
+                assert nfloat(value, exponent, mantissa).get_bits() == bits
+    # Ties round to even
+    e4m3 = nfloat_class(4, 3)
+    assert float(e4m3(1.0625)) == 1.0 and float(e4m3(1.1875)) == 1.25
+    assert float(e4m3(-1.0625)) == -1.0 and e4m3(-0.0).get_bits() == 0x80
+    assert float(e4m3(0.0009765625)) == 0.0 and float(e4m3(0.0029296875)) == 0.00390625
+    assert float(e4m3(0.0009765626)) == 0.001953125
+    # Overflows round to infinity, NaNs are kept
+    assert float(e4m3(247.9)) == 240.0 and float(e4m3(248.0)) == float('inf')
+    assert float(e4m3(-1e300)) == -float('inf')
+    nan = e4m3(float('nan'))
+    assert float(nan) != float(nan)
+    # Arrays
+    values = [1.0625, -1.1875, 248.0, float('nan'), -0.0, 3]
+    a = nfloat_array(values, exponent=4, mantissa=3)
+    assert a.to_bytes('little') == bytes(e4m3(float(x)).get_bits() for x in values)
+
+def test_nfloat_fields():
+    assert float32(-1.5).vs == 1
+    assert float32(-1.5).ve == 127
+    assert float32(-1.5).vm == 0x400000
+    assert float16(+1.0).get_bits() == 0x3C00
+    v = float32(0.0);  v.set_bits(0xBF800000);  assert v == -1.0
+    # Storage
+    assert not hasattr(float32(0.0), '__dict__')
+    assert type(nfloat(0.0, exponent=8, mantissa=23)) is float32
+    assert type(float16(1.0) + float32(1.0)) is float32
 
 def test_nfloat_bytes():
     # bytes to nfloat
@@ -38,6 +87,10 @@ def test_nfloat_bytes():
     assert len(nfloat(exponent=5, mantissa=11).to_bytes(byteorder='big')) == 3
     # Reinterpret cast
     assert reinterpret_cast(float32, int32(0x3F800000)) == 1.0
+    assert reinterpret_cast(float32, int32(-0x40000000)) == -2.0
+    assert type(reinterpret_cast(float16, uint16(0x3C00))) is float16
+    assert reinterpret_cast(float16, uint32(0x12343C00)) == 1.0
+    assert reinterpret_cast(float64, float32(1.0)).get_bits() == 0x3F800000
 
 def test_nfloat_ops_type():
     inf = float('inf')
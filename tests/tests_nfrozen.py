@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from nativetypes import *
+
+def test_nfrozen_hash():
+    u8 = nint_frozen_class(uint8)
+    i32 = nint_frozen_class(int32)
+    assert nint_frozen_class(uint8) is u8 and nint_frozen_class(u8) is u8
+    assert type(uint8(7).freeze()) is u8 and type(u8(7).thaw()) is uint8
+    # Hashes match equality with Python values
+    table = {u8(1): 'a', i32(-1): 'b', 0x12345678: 'c'}
+    assert table[1] == 'a' and table[-1] == 'b' and table[i32(0x12345678)] == 'c'
+    assert table[uint8(257).freeze()] == 'a'
+    assert len(set([u8(3), uint8(3).freeze(), u8(259), u8(4)])) == 2
+    # Equal values have equal hashes, across signedness and with ints
+    i8 = nint_frozen_class(int8)
+    values = [u8(255), i8(-1), i32(-1), i32(255), u8(0), i8(0), 255, -1, 0, 256]
+    for a in values:
+        for b in values:
+            assert (a == b) == (b == a) and (a == b) != (a != b)
+            if a == b:
+                assert hash(a) == hash(b)
+    assert u8(255) != i8(-1) and i8(-1) != 255 and i8(-1) == -1
+    # Ordering is consistent with equality
+    for a in values:
+        for b in values:
+            assert (a < b) == (int(a) < int(b)) and (a <= b) == (int(a) <= int(b))
+            assert (a > b) == (int(a) > int(b)) and (a >= b) == (int(a) >= int(b))
+    assert not u8(255) <= -1 and u8(255) >= -1 and -1 < u8(255) and i8(-1) < u8(0) + 1
+    assert len(set([u8(255), i8(-1)])) == 2 and {255: 'a'}[u8(255)] == 'a'
+    assert {-1: 'a'}[i8(-1)] == 'a' and 255 not in {i8(-1): 'a'}
+    # Mutable values still compare as native integers
+    assert i8(-1) == uint8(255) and uint8(255) == i8(-1) and not i8(-1) < uint8(0)
+    f32 = nfloat_frozen_class(float32)
+    assert hash(f32(1.5)) == hash(1.5) and {f32(0.0): 1}[-0.0] == 1
+    assert float32(0.1).freeze() == f32(0.1) and hash(float32(0.1).freeze()) == hash(f32(0.1))
+    # Interning
+    assert u8(5) is u8(261) is uint8(5).freeze()
+    assert i32(-128) is i32(-128) and i32(255) is i32(255)
+    assert i32(256) is not i32(256) and i32(256) == i32(256)
+    assert u8.from_bytes(b'\x07', 'little') is u8(7)
+    # Base classes construct the frozen variant of an alias
+    assert nint_frozen(5) is nint_frozen_class(int32)(5) and nint_frozen(1000) == 1000
+    assert nint_frozen(300, bits=8, signed=False) is u8(44)
+    assert type(nfloat_frozen(1.5)) is f32 and nfloat_frozen(1.5, 5, 10) == 1.5
+    assert f32.from_bytes(b'\x00\x00\xc0\x3f', 'little') == 1.5
+
+def test_nfrozen_immutable():
+    a = nint_frozen_class(uint16)(0xFFFF)
+    b = a
+    a += 1
+    assert a == 0 and b == 0xFFFF and type(a) is type(b)
+    a = nint_frozen_class(int8)(-128)
+    a <<= uint8(1)
+    assert a == 0 and a is nint_frozen_class(int8)(0)
+    assert type(nint_frozen_class(uint32)(1) + 1) is nint_frozen_class(uint32)
+    for mutate in (lambda: b.set(1), lambda: b.assign_add(uint16(1), 1),
+                   lambda: float32(1.0).freeze().set(2.0),
+                   lambda: float32(1.0).freeze().set_bits(0)):
+        try:
+            mutate()
+            assert False
+        except TypeError:
+            pass
+    f = float32(1.5).freeze()
+    g = f
+    f *= 2.0
+    assert f == 3.0 and g == 1.5 and type(f) is type(g)
+    # Mutable types are unaffected
+    v = uint16(0xFFFF)
+    w = v
+    v += 1
+    assert v is w and w == 0
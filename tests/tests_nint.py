@@ -49,6 +49,44 @@ def test_nint_aliases():
     u9_value = u9_type(0)
     assert s7_value.b == 7 and s7_value.s == True
     assert u9_value.b == 9 and u9_value.s == False
+    # Constants
+    assert s7_type.m == 0x7F and s7_type.lo == -0x40 and s7_type.hi == 0x3F
+    assert u9_type.m == 0x1FF and u9_type.lo == 0 and u9_type.hi == 0x1FF
+    # Storage
+    assert not hasattr(u9_value, '__dict__')
+    assert type(nint(0, bits=8, signed=False)) is uint8
+    assert type(nint(0, bits=9, signed=False)).__name__ == 'uint9'
+    # Registry
+    assert nint_class(8, True) is int8
+    assert nint_class(64, False) is uint64
+    assert nint_class(9, False) is nint_class(9, False)
+    assert nint_type('u9', bits=9, signed=False) is u9_type
+    assert nint_type('u9', bits=9, signed=True) is not u9_type
+    # Shorthands
+    import nativetypes
+    assert nativetypes.uint24 is nint_class(24, False) and nativetypes.uint24.__name__ == 'uint24'
+    assert nativetypes.int128.b == 128 and nativetypes.int128.s == True
+    assert nativetypes.uint256(-1) == (1 << 256) - 1
+    assert nativetypes.uint9 is type(nint(0, bits=9, signed=False))
+    for name in ('int0', 'int08', 'sint8', 'uint'):
+        assert not hasattr(nativetypes, name)
+    # Star imports
+    scope = {}
+    exec('from nativetypes import *', scope)
+    for name in ('array', 'os', 'time', 'numpy', 'allocate', 'swar_load'):
+        assert name not in scope
+    assert all(name in scope for name in nativetypes.NINT_SHORTHANDS)
+    assert scope['nint_array'] is nint_array and scope['FLAG_CF'] == FLAG_CF
+    assert scope['promote_bits'] is promote_bits and 'float_decode' in scope
+    # Result types
+    assert type(int32(1) + int32(2)) is int32
+    assert type(int8(1) + uint16(2)) is uint16
+    assert type(uint8(1) + int16(2)) is uint16
+    assert type(s7_value + s7_value) is s7_type
+    assert type(s7_value + 1) is s7_type
+    assert type(1 - u9_value) is u9_type
+    assert type(-s7_value) is s7_type
+    assert type(s7_value + int8(1)) is int8
 
 def test_nint_bytes():
     # bytes to nint
@@ -68,6 +106,11 @@ def test_nint_bytes():
     assert len(nint(bits=9, signed=False).to_bytes(byteorder='big')) == 2
     # Reinterpret cast
     assert reinterpret_cast(int32, float32(1.0)) == 0x3F800000
+    assert reinterpret_cast(int32, float32(-2.0)) == -0x40000000
+    assert type(reinterpret_cast(int32, float32(1.0))) is int32
+    assert reinterpret_cast(uint16, int8(-1)) == 0xFF
+    assert reinterpret_cast(int8, uint32(0x1FF)) == -1
+    assert reinterpret_cast(uint16, nint(-1, bits=12, signed=True)) == 0xFFF
 
 def test_nint_slicing():
     # By index
@@ -79,6 +122,50 @@ def test_nint_slicing():
     assert int8(0b00001001)[0:2] == 1
     assert int8(0b00001001)[1:4] == 4
     assert int8(0b10000000)[7:8] == 1
+    assert type(int8(-1)[1:4]) is nint_class(3, False) and int8(-1)[1:4] == 7
+    # Assignment
+    v = int8(0)
+    v[7] = True
+    assert v == -128
+    v[0:4] = 0x1F
+    assert v == -128 + 0xF
+    v[7] = 0
+    v[2:6] = uint8(0)
+    assert v == 3 and type(v) is int8
+    w = uint32(0).lazy()
+    w[4:8] = 0xA
+    assert w == 0xA0
+    try:
+        uint8(0).freeze()[0] = 1
+        assert False
+    except TypeError:
+        pass
+
+def test_nint_bitfields():
+    class pte(nint_class(64, False)):
+        __slots__ = ()
+        present = bitfield(0)
+        writable = bitfield(1)
+        pfn = bitfield(12, 52)
+        key = bitfield(59, 63, signed=True)
+    e = pte(0x8000001234567003)
+    assert e.present is True and e.writable is True and pte.pfn.stop == 52
+    assert e.pfn == 0x1234567 and type(e.pfn) is nint_class(40, False)
+    assert e.key == 0 and type(e.key) is nint_class(4, True)
+    # Assignment updates the value in place
+    e.pfn = 0x1ABCDE00000
+    e.present = False
+    e.key = -1
+    assert e == 0xF80ABCDE00000002
+    assert e.pfn == 0xABCDE00000 and e.key == -1 and not e.present
+    assert type(e + 1) is pte and (e + 1).present
+    # Fields are checked against the width of the type
+    try:
+        class reg(uint8):
+            mode = bitfield(4, 9)
+        assert False
+    except (AssertionError, RuntimeError):
+        pass
 
 def test_nint_utils():
     assert int8().min() == -0x80
@@ -177,6 +264,10 @@ def test_nint_ops_binary():
     # Size (nint + int)
     assert (nint( bits=8  ) + 0).b == 8
     assert (nint( bits=16 ) + 0).b == 16
+    # Masking (nint + int)
+    assert uint8(1) + 0x1FF == 0
+    assert int8(1) * 0x180 == -0x80
+    assert uint8(0x10) // 0x102 == 0x08
     # Arithmetic
     assert uint8(3)  + uint8(2) == uint8(5)
     assert uint8(3)  - uint8(2) == uint8(1)
@@ -261,10 +352,114 @@ def test_nint_ops_inplace():
     v = uint16(0x1234);  v >>= 20;  assert v == uint16(0x0123)
     v = uint16(0x1234);  v <<= 20;  assert v == uint16(0x2340)
 
+def test_nint_ops_assign():
+    # Results are converted to the destination type
+    v = uint8(0);  r = v.assign_add(uint8(200), uint8(100));  assert r is v and v == uint8(44)
+    v = uint16(0);  v.assign_add(uint8(200), uint8(100));  assert v == uint16(44)
+    v = uint16(0);  v.assign_add(int8(-1), 0);  assert v == uint16(0xFFFF)
+    v = int8(0);  v.assign_mul(uint16(0x1234), 0x10);  assert v == int8(0x40)
+    v = uint8(0);  v.assign_sub(2, uint8(3));  assert v == uint8(0xFF)
+    v = int8(0);  v.assign_div(int8(-7), int8(5));  assert v == int8(-1)
+    v = int8(0);  v.assign_mod(int8(-8), int8(5));  assert v == int8(-3)
+    v = uint8(0);  v.assign_pow(uint8(3), 4);  assert v == uint8(81)
+    v = uint16(0);  v.assign_and(uint16(0xF0F0), 0xFF00);  assert v == uint16(0xF000)
+    v = uint16(0);  v.assign_or(uint16(0xF0F0), 0xFF00);  assert v == uint16(0xFFF0)
+    v = uint16(0);  v.assign_xor(uint16(0xF0F0), 0xFF00);  assert v == uint16(0x0FF0)
+    v = uint16(0);  v.assign_lshift(uint16(0x1234), 20);  assert v == uint16(0x2340)
+    v = uint16(0);  v.assign_rshift(int16(-0x100), uint8(4));  assert v == uint16(0x0FF0)
+    v = int8(0);  v.assign_neg(int8(-128));  assert v == int8(-128)
+    v = uint16(0);  v.assign_invert(uint8(0));  assert v == uint16(0xFF)
+    v = int16(0);  v.assign_abs(int8(-5));  assert v == int16(5)
+    # Accumulators
+    v = uint8(250)
+    for i in range(10):
+        v.assign_add(v, 1)
+    assert v == uint8(4)
+    # Fused operations
+    a = uint32(0x12345678)
+    v = uint32(0);  v.assign_muladd(a, 1103515245, 12345);  assert v == a * 1103515245 + 12345
+    v = uint32(0);  v.assign_xormul(a, 0x61, 0x01000193);  assert v == (a ^ 0x61) * 0x01000193
+    v = uint32(0);  v.assign_xorshl(a, 13);  assert v == a ^ (a << 13)
+    v = uint32(0);  v.assign_xorshr(a, 17);  assert v == a ^ (a >> 17)
+    v = uint64(0);  v.assign_muladd(uint8(0xFF), uint8(2), uint64(1));  assert v == uint64(0xFF)
+    v = int64(0);  v.assign_muladd(int8(-128), int8(-1), int64(1));  assert v == int64(-127)
+    # Functional forms
+    v = uint8(0)
+    assert nint.add(uint8(200), uint8(100)) == uint8(44)
+    assert nint.add(uint8(200), uint8(100), out=v) is v and v == uint8(44)
+    assert nint.sub(uint8(1), 2, out=v) == uint8(0xFF)
+    assert nint.xor(uint8(0xF0), 0xFF) == uint8(0x0F)
+    assert nint.and_(uint8(0xF0), 0x3C, out=v) == uint8(0x30)
+    assert nint.or_(uint8(0xF0), 0x0F) == uint8(0xFF)
+    assert nint.lshift(uint8(1), 9, out=v) == uint8(2)
+    assert nint.neg(int8(5)) == int8(-5)
+    assert nint.invert(uint8(0), out=v) == uint8(0xFF)
+
+def test_nint_intrinsics():
+    x = uint32(0x12345678)
+    # Rotations and byte swaps keep the type
+    assert x.rotl(8) == 0x34567812 and type(x.rotl(8)) is uint32
+    assert x.rotr(8) == 0x78123456 and x.rotl(-8) == x.rotr(8) and x.rotl(32) == x
+    assert x.rotl(uint8(4)) == 0x23456781
+    assert int8(-128).rotl(1) == 1 and int8(1).rotr(1) == -128
+    assert x.bswap() == 0x78563412 and int16(0x00FF).bswap() == -256
+    assert nint(0x123456, bits=24, signed=False).bswap() == 0x563412
+    # Counts
+    assert x.popcount() == 13 and int8(-1).popcount() == 8 and uint64(0).popcount() == 0
+    assert x.parity() == 1 and uint8(3).parity() == 0
+    assert x.clz() == 3 and int16(-1).clz() == 0 and uint32(0).clz() == 32
+    assert x.ctz() == 3 and int8(-128).ctz() == 7 and uint16(0).ctz() == 16
+    # Bit extract and deposit
+    assert x.pext(0xFF00FF00) == 0x1256 and type(x.pext(0xFF)) is uint32
+    assert uint32(0x1256).pdep(0xFF00FF00) == 0x12005600
+    assert uint8(0xB5).pext(0x0F) == 0x5 and uint8(0xB5).pext(0xAA) == 0b1100
+    assert uint8(0b1100).pdep(0xAA) == 0xA0 and int8(-1).pdep(0xF0) == -16
+    assert uint64(-1).pext(uint64(0x8000000000000001)) == 3
+
+def test_nint_flags():
+    # Addition
+    r, f = uint32(0xFFFFFFFF).add_with_flags(1)
+    assert r == 0 and type(r) is uint32 and f == FLAG_CF | FLAG_ZF
+    r, f = int8(127).add_with_flags(int8(1))
+    assert r == -128 and f == FLAG_SF | FLAG_OF
+    r, f = uint8(0xFE).add_with_flags(uint8(1), carry_in=1)
+    assert r == 0 and f == FLAG_CF | FLAG_ZF
+    r, f = uint8(1).add_with_flags(int16(-1))
+    assert type(r) is uint16 and r == 0 and f == FLAG_CF | FLAG_ZF
+    # Subtraction
+    r, f = uint8(0).sub_with_flags(1)
+    assert r == 0xFF and f == FLAG_CF | FLAG_SF
+    r, f = int8(-128).sub_with_flags(1)
+    assert r == 127 and f == FLAG_OF
+    r, f = int32(5).sub_with_flags(4, borrow_in=1)
+    assert r == 0 and f == FLAG_ZF
+    # Shifts
+    r, f = uint8(0xC0).shl_with_flags(1)
+    assert r == 0x80 and f == FLAG_CF | FLAG_SF
+    r, f = uint8(0x40).shl_with_flags(1)
+    assert r == 0x80 and f == FLAG_SF | FLAG_OF
+    r, f = uint8(0x81).shr_with_flags(1)
+    assert r == 0x40 and f == FLAG_CF | FLAG_OF
+    r, f = int8(-127).shr_with_flags(1)
+    assert r == -64 and f == FLAG_CF | FLAG_SF
+    r, f = uint8(0x01).shr_with_flags(1)
+    assert r == 0 and f == FLAG_CF | FLAG_ZF
+    # Limbs
+    limbs, carry = nint.add_limbs([uint32(-1), uint32(-1)], [uint32(1), uint32(0)])
+    assert limbs == [0, 0] and carry == 1 and type(limbs[1]) is uint32
+    limbs, carry = nint.add_limbs([uint32(-1), uint32(5)], [0, 0], carry_in=1)
+    assert limbs == [0, 6] and carry == 0
+    limbs, borrow = nint.sub_limbs([uint16(0), uint16(0)], [uint16(1), uint16(0)])
+    assert limbs == [0xFFFF, 0xFFFF] and borrow == 1
+    limbs, borrow = nint.sub_limbs([uint16(0), uint16(1)], [1, 0])
+    assert limbs == [0xFFFF, 0] and borrow == 0
+
 def test_nint_ops_relational():
     # Casts
     assert int8(0x1) == 1
     assert int8(0x100) == 0
+    assert int8(0x1) > 0xFF
+    assert 0xFF < int8(0x1)
     # Signedness
     assert  int8(0x80) <  int8(0x7F)
     assert uint8(0x80) >  int8(0x7F)
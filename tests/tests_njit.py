@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import string
+
+from nativetypes import *
+
+def jit_dga(seed: uint32, day: uint32, month: uint32, year: uint32):
+    s = seed
+    t1 = day
+    t2 = month
+    t3 = year
+    name = ""
+    for i in range(12):
+        t1 = (t1 >> 15) ^ (16 * (t1 & 0x1FFF ^ 4 * (t1 ^ s)))
+        t2 = ((t2 ^ (4 * t2)) >>  8) ^ ((t2 & 0xFFFFFFFE) * 14)
+        t3 = ((t3 ^ (7 * t3)) >> 11) | ((t3 & 0xFFFFFFF0) << 17)
+        s = (s >> 6) ^ (((t1 + 8 * s) << 8) & 0x3FFFF00)
+        name += string.ascii_lowercase[int(t1 ^ t2 ^ t3) % 25]
+    return name
+
+def jit_rsqrt(number: float32):
+    i = reinterpret_cast(int32, number)
+    i = 0x5F3759DF - (i >> 1)
+    y = reinterpret_cast(float32, i)
+    y *= (1.5 - (0.5 * number * y * y))
+    return y
+
+def jit_mixed(a: int8, b: uint16, n):
+    c = a * b
+    d = int16(n)
+    d <<= 3
+    d //= a
+    e = -a
+    f = b >> a
+    total = 0
+    while total < 3:
+        total = total + 1
+    return c, d, e, f, a < b, ~a, abs(a), total
+
+def jit_unsupported(a: uint8):
+    values = [a, a]
+    return values[0] + 1
+
+def jit_aliased(a: uint8):
+    b = a
+    b += 1
+    return b
+
+def test_njit_results():
+    for seed in (0, 0xDEADBEEF, 0xFFFFFFFF):
+        args = (uint32(seed), uint32(17), uint32(3), uint32(2024))
+        assert native_jit(jit_dga)(*args) == jit_dga(*args)
+    for value in (2.0, 0.1, 1e30, 0.0, float('inf')):
+        expected = jit_rsqrt(float32(value))
+        result = native_jit(jit_rsqrt)(float32(value))
+        assert type(result) is float32 and result.v == expected.v
+    for a, b, n in ((3, 0xFFFF, 7), (-128, 1, -1000), (-1, 0x8000, 0x12345)):
+        expected = jit_mixed(int8(a), uint16(b), n)
+        result = native_jit(jit_mixed)(int8(a), uint16(b), n)
+        assert [type(x) for x in result] == [type(x) for x in expected]
+        assert [int(x) for x in result] == [int(x) for x in expected]
+
+def test_njit_fallback():
+    f = native_jit(jit_dga)
+    assert f.compiled() is not jit_dga
+    assert f.compiled() is f.compiled()
+    assert native_jit(jit_rsqrt).compiled() is not jit_rsqrt
+    assert native_jit(jit_mixed).compiled() is not jit_mixed
+    # Arguments of other types run the original function
+    assert native_jit(jit_rsqrt)(float64(2.0)) == jit_rsqrt(float64(2.0))
+    assert native_jit(jit_mixed)(int8(2), uint16(3), int8(4))[1] == 16
+    # Unsupported constructs are not compiled
+    f = native_jit(jit_unsupported)
+    assert f.compiled() is jit_unsupported and f(uint8(0xFF)) == 0
+    # In-place operators on shared values keep updating the original object
+    f = native_jit(jit_aliased)
+    assert f.compiled() is jit_aliased
+    a = uint8(1)
+    assert f(a) == 2 and a == 2
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from nativetypes import *
+
+def lazy_dga(t, rounds):
+    for i in range(rounds):
+        t = ((t ^ (4 * t)) >> 8) ^ ((t & 0xFFFFFFFE) * 14)
+        t = t * 1103515245 + 12345 - (t << 3)
+    return t
+
+def lazy_mixed(a, b, c):
+    x = (a * 0x5bd1e995 + b) ^ ~(c << 7)
+    y = -x * b - 3 + (c | 0x80)
+    return (y // 3) ^ (x % (a | 1)) + (1000 - y)
+
+def test_nlazy_results():
+    # Types and values
+    x = uint32(0xFFFFFFFF).lazy()
+    assert type(x) is nint_lazy_class(uint32) and isinstance(x, nint)
+    assert type(x.eval()) is uint32 and x.lazy() is x
+    assert x + 1 == 0 and int(x * x) == 1 and str(x + 2) == '1'
+    assert int8(100).lazy() + 100 == -56
+    # Bit-identical to eager evaluation
+    assert lazy_dga(uint32(123).lazy(), 100).eval() == lazy_dga(uint32(123), 100)
+    for a, b, c in [(uint8(200), int16(-3), 5), (int32(-7), uint64(1 << 63), int8(-128)),
+                    (int64(-1), int64(0x7FFFFFFF), uint16(0xFFFF))]:
+        eager = lazy_mixed(a, b, c)
+        for args in [(a.lazy(), b, c), (a, b.lazy(), c), (a.lazy(), b.lazy(), c)]:
+            result = lazy_mixed(*args)
+            if isinstance(result, nint_lazy):
+                result = result.eval()
+            assert result == eager and type(result) is type(eager)
+    # Raw values stay bounded
+    x = uint64(0x9E3779B97F4A7C15).lazy()
+    y = uint64(0x9E3779B97F4A7C15)
+    for i in range(1000):
+        x = x * x + 3
+        y = y * y + 3
+    assert x.eval() == y and x.r.bit_length() <= 256
+
+def test_nlazy_inplace():
+    for op in ['+=', '-=', '*=', '&=', '|=', '^=', '<<=', '>>=', '//=', '%=']:
+        for lhs in [uint8(0xF0), int16(-300), int32(0x12345678)]:
+            for rhs in [3, -(1 << 70) + 5, int8(-2), uint64(0xFFFFFFFF00000007)]:
+                if op in ['<<=', '>>=']:
+                    rhs = abs(int(rhs)) % 80
+                eager = lhs.__class__(int(lhs))
+                lazy = lhs.lazy()
+                exec('eager %s rhs' % op)
+                exec('lazy %s rhs' % op)
+                assert lazy.eval() == eager and type(lazy.eval()) is type(eager)
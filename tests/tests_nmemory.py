@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import mmap
+import struct
+
+from nativetypes import *
+
+def test_nmemory_values():
+    buf = bytearray(16)
+    mem = nmemory(buf)
+    mem.u32[4] = 0xDEADBEEF
+    assert buf[4:8] == b'\xEF\xBE\xAD\xDE'
+    assert mem.u32[4] == 0xDEADBEEF and type(mem.u32[4]) is uint32
+    assert mem.i32[4] == -0x21524111 and type(mem.i32[4]) is int32
+    assert mem.u8[7] == 0xDE and mem.i16[6] == -0x2153
+    # Wraparound on store
+    mem.i8[0] = 0x1FF
+    mem.u16[1] = int8(-2)
+    assert buf[:4] == b'\xFF\xFE\xFF\x00'
+    mem.u64[8] = -1
+    assert mem.i64[8] == -1 and mem.u64[8] == 0xFFFFFFFFFFFFFFFF
+    # Floats
+    mem.f32[0] = 1.5
+    assert mem.f32[0] == 1.5 and type(mem.f32[0]) is float32
+    assert mem.u32[0] == 0x3FC00000
+    mem.f16[4] = float32(0.1)
+    assert mem.f16[4].get_bits() == float16(0.1).get_bits()
+    mem.f64[8] = -2
+    assert mem.f64[8] == -2.0
+    # Byte order
+    buf[:4] = b'\x01\x02\x03\x04'
+    assert nmemory(buf, 'big').u32[0] == 0x01020304
+    nmemory(buf, 'big').u16[0] = 0xAABB
+    assert buf[:2] == b'\xAA\xBB'
+
+def test_nmemory_bulk():
+    buf = bytearray(16)
+    mem = nmemory(buf)
+    mem.u16[0:8] = [1, 2, 3, -1]
+    assert buf[:8] == struct.pack('<4H', 1, 2, 3, 0xFFFF)
+    assert mem.u16[0:8].tolist() == [1, 2, 3, 0xFFFF]
+    assert mem.i16.load(4, 2).tolist() == [3, -1]
+    mem.f32.store(8, [1.0, -0.5])
+    assert mem.f32[8:16].tolist() == [1.0, -0.5]
+    # Open-ended and negative slices
+    assert mem.u8[:4].tolist() == [1, 0, 2, 0] and mem.u16[:4].tolist() == [1, 2]
+    assert mem.f32[8:].tolist() == [1.0, -0.5] and mem.f32[-4:].tolist() == [-0.5]
+    assert len(mem.u8[:]) == 16 and len(mem.u8[12:4]) == 0
+    mem.u16[:2] = [9]
+    mem.u8[-1:] = [0xFF]
+    assert buf[:2] == b'\x09\x00' and buf[-1:] == b'\xFF' and mem.f32[8:12].tolist() == [1.0]
+    mem.typed(nint_type('u16', 16, False))[0] = 7
+    assert mem.u16[0] == 7
+    # Memory maps
+    m = mmap.mmap(-1, 8)
+    mem = nmemory(m, 'big')
+    mem.u32[4] = 0x11223344
+    assert m[4:8] == b'\x11\x22\x33\x44'
+    m.close()
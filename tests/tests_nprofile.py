@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from nativetypes import *
+from nativetypes import native_int
+from nativetypes import native_float
+
+def profile_work():
+    a = uint32(5)
+    b = int8(-3)
+    c = a + b * 3
+    d = float32(1.5) * 2.0
+    return c < a, -b, d
+
+def test_nprofile_counts():
+    with nprofile() as profile:
+        profile_work()
+        profile_work()
+    counts = profile.counts()
+    assert counts['mul'] == 4 and counts['add'] == 2
+    assert counts['lt'] == 2 and counts['neg'] == 2
+    assert profile.allocations['uint32'] == 4 and profile.allocations['int8'] == 6
+    assert profile.allocations['float32'] == 6
+    assert profile.times['nint.op_binary'] > 0 and not profile.calls
+    assert 'mul' in profile.report()
+    # Call sites
+    with nprofile(sites=True) as profile:
+        profile_work()
+    assert sum(profile.calls.values()) == 5 + 8
+    assert all(site.endswith(('tests_nprofile.py:12', 'tests_nprofile.py:13',
+        'tests_nprofile.py:14', 'tests_nprofile.py:15', 'tests_nprofile.py:16'))
+        for site in profile.calls)
+
+def test_nprofile_paths():
+    # In-place operators, assignments, intrinsics, flags and bitfield stores
+    class flags8(uint8):
+        __slots__ = ()
+        carry = bitfield(0)
+        mode = bitfield(4, 8)
+    with nprofile() as profile:
+        a = uint8(0x81)
+        a += 1
+        a <<= 1
+        a.assign_add(a, uint8(2))
+        a.assign_neg(a)
+        a.assign_muladd(a, 3, 1)
+        a.rotl(3)
+        a.popcount()
+        a.add_with_flags(1)
+        nint.add_limbs([uint8(1)], [uint8(2)])
+        f = float32(1.0)
+        f *= 2.0
+        nint_frozen_class(uint8)(1).__iadd__(1)
+        r = flags8(0)
+        r.carry = True
+        r.mode = 5
+    assert profile.counts() == {'add': 3, 'lshift': 1, 'neg': 1, 'muladd': 1, 'rotl': 1,
+        'popcount': 1, 'add_with_flags': 1, 'add_limbs': 1, 'mul': 1, 'bitfield': 2}
+    assert a == 0xEF and f == 2.0 and r == 0x51
+    assert profile.times['nint.intrinsic'] > 0 and profile.times['bitfield.set'] > 0
+
+def test_nprofile_restore():
+    originals = (native_int.allocate, native_int.op_binary, native_float.op_binary,
+        native_int.op_assign_binary, native_int.nint.__dict__['rotl'],
+        native_int.nint.__dict__['add_limbs'], native_int.bitfield.__set__)
+    outer = nprofile().start()
+    with nprofile() as inner:
+        uint16(1) + 1
+    uint16(1) + 1
+    outer.stop()
+    uint16(1) + 1
+    assert inner.counts() == {'add': 1} and outer.counts() == {'add': 2}
+    assert (native_int.allocate, native_int.op_binary, native_float.op_binary,
+        native_int.op_assign_binary, native_int.nint.__dict__['rotl'],
+        native_int.nint.__dict__['add_limbs'], native_int.bitfield.__set__) == originals
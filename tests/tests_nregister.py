@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+from nativetypes import *
+
+def x86_registers():
+    registers = []
+    for index, name in enumerate('abcd'):
+        offset = index * 64
+        registers += [
+            ('r%sx' % name, offset, offset + 64),
+            ('e%sx' % name, offset, offset + 32, offset + 64),
+            ('%sx' % name, offset, offset + 16),
+            ('%sh' % name, offset + 8, offset + 16),
+            ('%sl' % name, offset, offset + 8),
+        ]
+    return register_file_type('x86', registers)
+
+def test_nregister_aliases():
+    x86 = x86_registers()
+    r = x86(rax=0x1122334455667788, rbx=-1)
+    assert r.eax == 0x55667788 and type(r.eax) is uint32
+    assert r.ax == 0x7788 and r.ah == 0x77 and r.al == 0x88 and type(r.ah) is uint8
+    assert r.rbx == 0xFFFFFFFFFFFFFFFF and r.rcx == 0
+    # Partial writes are visible through every alias
+    r.ah = 0x1FF
+    assert r.rax == 0x112233445566FF88 and r.ax == 0xFF88 and r.al == 0x88
+    r.al = uint8(1)
+    assert r.eax == 0x5566FF01
+    r.bl = 0
+    assert r.rbx == 0xFFFFFFFFFFFFFF00 and r.rax == 0x112233445566FF01
+    # Writes to 32-bit aliases clear the upper half
+    r.eax = -2
+    assert r.rax == 0xFFFFFFFE and r.ax == 0xFFFE
+    # Records
+    s = r.copy()
+    s.rcx = 3
+    assert r.rcx == 0 and s != r and s.copy() == s
+    assert repr(x86(rdx=1)) == 'x86(rax=0x0, rbx=0x0, rcx=0x0, rdx=0x1)'
+    assert not hasattr(r, '__dict__') and x86.b == 256
+
+def test_nregister_layout():
+    flags = register_file_type('flags', [('value', 0, 16), ('cf', 0, 1), ('mode', 4, 8)])
+    f = flags(mode=0xF)
+    assert f.value == 0xF0 and f.cf == 0 and type(f.cf) is nint_class(1, False)
+    f.cf = 3
+    assert f.value == 0xF1 and f.mode == 0xF
+    try:
+        register_file_type('bad', [('v', 0, 8), ('v', 8, 16)])
+        assert False
+    except AssertionError:
+        pass
+    try:
+        flags(other=1)
+        assert False
+    except AssertionError:
+        pass
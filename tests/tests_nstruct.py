@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import struct
+
+from nativetypes import *
+
+def test_nstruct_layout():
+    uint24 = nint_type('uint24', 24, False)
+    t = nstruct_type('t', [('a', uint8), ('b', int32), ('c', float16), ('d', uint64), ('e', uint24)])
+    assert t._offsets == {'a': 0, 'b': 4, 'c': 8, 'd': 16, 'e': 24}
+    assert t._size == 32
+    t = nstruct_type('t', [('a', uint8), ('b', int32), ('c', uint16)], packed=True)
+    assert t._offsets == {'a': 0, 'b': 1, 'c': 5}
+    assert t._size == 7
+    t = nstruct_type('t', [('a', int64), ('b', uint8)])
+    assert t._size == 16
+
+def test_nstruct_values():
+    t = nstruct_type('t', [('a', uint8), ('b', int16), ('c', float32)])
+    r = t(0x1FF, c=0.5)
+    assert r.a == 0xFF and type(r.a) is uint8
+    assert r.b == 0 and type(r.b) is int16
+    assert r.c == 0.5 and type(r.c) is float32
+    r.b = -1
+    r.c = float16(2.0)
+    assert r.b == -1 and r.c == 2.0 and type(r.c) is float32
+    assert r == t(0xFF, -1, 2.0) and r != t()
+
+def test_nstruct_bytes():
+    int12 = nint_type('int12', 12, True)
+    t = nstruct_type('t', [('a', uint8), ('b', int32), ('c', float16), ('d', int12)])
+    data = struct.pack('<Bxxxi2sh', 1, -2, float16(1.5).to_bytes('little'), -1)
+    r = t.unpack(data)
+    assert (r.a, r.b, r.c, r.d) == (1, -2, 1.5, -1)
+    assert type(r.d) is int12 and r.d.v == -1
+    assert r.pack() == data
+    assert t.unpack(b'\x00' + data, offset=1) == r
+    # Floats narrower than their container ignore the padding bits
+    float24 = nfloat_class(7, 16)
+    t = nstruct_type('t', [('a', float24), ('b', uint8)])
+    r = t(-1.5, 7)
+    data = r.pack()
+    assert len(data) == 8 and t.unpack(data) == r
+    data = data[:3] + b'\xA5' + data[4:]
+    r = t.unpack(data)
+    assert r.a == -1.5 and r.a.v == float24(-1.5).v and r.a.v < (1 << 24) and r.b == 7
+    assert r.pack()[:4] == float24(-1.5).to_bytes('little') + b'\x00'
+    # Big-endian
+    t = nstruct_type('t', [('a', uint16), ('b', float32)], byteorder='big')
+    r = t.unpack(b'\x01\x02\x00\x00\x3f\x80\x00\x00')
+    assert r.a == 0x0102 and r.b == 1.0
+    # Arrays of records
+    records = [t(i, float(i)) for i in range(4)]
+    data = t.pack_array(records)
+    assert len(data) == 4 * t._size
+    assert t.unpack_array(data) == records
+    assert t.unpack_array(data, offset=t._size, count=2) == records[1:3]
+    buf = bytearray(t._size)
+    records[3].pack_into(buf)
+    assert bytes(buf) == records[3].pack()
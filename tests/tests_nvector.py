@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Native types.
+"""
+
+import nativetypes
+from nativetypes import *
+
+def test_nvector_lanes():
+    uint8x16 = nativetypes.uint8x16
+    int32x4 = nativetypes.int32x4
+    assert uint8x16 is nvector_class(8, 16, False) and int32x4.l is int32
+    assert type(nvector([1, 2], bits=16, count=2, signed=True)) is nativetypes.int16x2
+    # Construction
+    v = int32x4([1, -2, 3, -4])
+    assert v.tolist() == [1, -2, 3, -4] and v == [1, -2, 3, -4]
+    assert int(v) == 0xFFFFFFFC00000003FFFFFFFE00000001
+    assert int32x4(int(v)) == v and int32x4.splat(-1).tolist() == [-1] * 4
+    assert v.to_bytes('little') == bytes.fromhex('01000000feffffff03000000fcffffff')
+    assert int32x4.from_bytes(v.to_bytes('big'), 'big') == v
+    assert not hasattr(v, '__dict__')
+    # Extract and insert
+    assert type(v[1]) is int32 and v[1] == -2 and v.extract(3) == -4
+    assert v.insert(0, 0x1FF).tolist() == [0x1FF, -2, 3, -4] and v[0] == 1
+    v[2] = -1
+    assert list(v) == [1, -2, -1, -4] and len(v) == 4
+    # Shuffles
+    a = uint8x16(list(range(16)))
+    assert a.shuffle(list(range(15, -1, -1))).tolist() == list(range(15, -1, -1))
+    assert a.shuffle([0, None, -1] + [1] * 13).tolist()[:4] == [0, 0, 0, 1]
+    b = uint8x16([100 + x for x in range(16)])
+    assert a.shuffle([0, 16, 1, 17] * 4, b).tolist()[:4] == [0, 100, 1, 101]
+    # Casts
+    assert reinterpret_cast(nativetypes.uint32x4, a).tolist()[0] == 0x03020100
+    assert reinterpret_cast(nativetypes.uint128, a) == int(a)
+    assert reinterpret_cast(uint8x16, nativetypes.uint128(-1)) == uint8x16.splat(255)
+
+def test_nvector_ops():
+    uint8x4 = nativetypes.uint8x4
+    int8x4 = nativetypes.int8x4
+    a = int8x4([100, -100, 7, -128])
+    b = int8x4([100, 50, -3, 1])
+    # Wraparound
+    assert (a + b).tolist() == [-56, -50, 4, -127]
+    assert (a - b).tolist() == [0, 106, 10, 127]
+    assert (a * b).tolist() == [16, 120, -21, -128]
+    assert (a * 3).tolist() == (3 * a).tolist() == [44, -44, 21, -128]
+    assert (a // b).tolist() == [1, -2, -2, -128] and (a % b).tolist() == [0, 0, 1, 0]
+    assert (-a).tolist() == [-100, 100, -7, -128] and abs(a).tolist() == [100, 100, 7, -128]
+    assert (~a).tolist() == [-101, 99, -8, 127] and (a & 0x0F).tolist() == [4, 12, 7, 0]
+    # Shifts
+    assert (a << 1).tolist() == [-56, 56, 14, 0] and (a >> 2).tolist() == [25, -25, 1, -32]
+    assert (a >> 9).tolist() == [0, -1, 0, -1] and (a << 8).tolist() == [0] * 4
+    assert (a >> int8x4([0, 1, 2, 8])).tolist() == [100, -50, 1, -1]
+    assert (uint8x4([0x80] * 4) >> 7).tolist() == [1] * 4
+    # Saturation
+    assert a.adds(b).tolist() == [127, -50, 4, -127]
+    assert a.subs(b).tolist() == [0, -128, 10, -128]
+    u = uint8x4([250, 5, 0, 128])
+    assert u.adds(10).tolist() == [255, 15, 10, 138]
+    assert u.subs(10).tolist() == [240, 0, 0, 118]
+    # Comparisons
+    assert a.min(b).tolist() == [100, -100, -3, -128]
+    assert a.max(b).tolist() == [100, 50, 7, 1]
+    assert a.cmpeq(b).tolist() == [-1, 0, 0, 0] and a.cmpne(b).tolist() == [0, -1, -1, -1]
+    assert a.cmpgt(b).tolist() == [0, 0, -1, 0] and a.cmplt(b).tolist() == [0, -1, 0, -1]
+    assert a.cmpge(b).tolist() == [-1, 0, -1, 0] and a.cmple(b).tolist() == [-1, -1, 0, -1]
+    assert u.cmpgt(127).tolist() == [255, 0, 0, 255]
+    # Unsigned lanes are preserved by mixed operations
+    assert type(a + u) is uint8x4 and type(u + a) is uint8x4
+    # In-place operations
+    c = a
+    c += 1
+    c <<= 1
+    assert c is a and a.tolist() == [-54, 58, 16, 2]
+    try:
+        a >> -1
+        assert False
+    except ValueError:
+        pass